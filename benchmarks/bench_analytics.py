@@ -0,0 +1,85 @@
+"""
+Benchmark the columnar analytics core against a per-session dict loop.
+
+Builds synthetic session lists in memory and times per-day, per-week,
+per-month, per-quarter and per-year totals three ways: a nested-defaultdict
+loop in the style of the weekly report before the columnar core, the
+bucket_totals engine on stdlib arrays, and the same engine on NumPy (when
+installed). All three parse each distinct date once, so the comparison
+measures the grouping rather than date parsing.
+
+Usage:
+    python benchmarks/bench_analytics.py [SESSIONS ...]
+"""
+
+import datetime
+import os
+import statistics
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from botanist_pkg import columnar
+
+SESSION_COUNTS = (10000, 100000, 1000000)
+REPEATS = 5
+MONDAY = datetime.datetime(2025, 9, 1)
+WEEK_START = 6  # Sunday, so the engine's weeks differ from ISO weeks
+
+
+def make_sessions(count):
+    first = datetime.date(2022, 1, 1)
+    return [{"date": (first + datetime.timedelta(days=i * 3 // 8)).strftime("%Y-%m-%d"),
+             "duration": 1500.0 + i % 3600} for i in range(count)]
+
+
+def dict_loop(sessions):
+    """Per-session grouping in the style of the old weekly report."""
+    buckets = [defaultdict(lambda: {"seconds": 0.0, "sessions": 0}) for _ in range(5)]
+    parsed = {}
+    for s in sessions:
+        start = parsed.get(s["date"])
+        if start is None:
+            start = parsed[s["date"]] = datetime.datetime.strptime(s["date"], "%Y-%m-%d")
+        week = (start - MONDAY).days // 7
+        quarter = f"{s['date'][:4]}-Q{(start.month - 1) // 3 + 1}"
+        for unit, key in zip(buckets, (s["date"], week, s["date"][:7], quarter, s["date"][:4])):
+            unit[key]["seconds"] += s["duration"]
+            unit[key]["sessions"] += 1
+    return buckets
+
+
+def columnar_core(sessions):
+    return columnar.bucket_totals(columnar.from_sessions(sessions), week_start=WEEK_START)
+
+
+def time_ms(action, sessions):
+    """Median wall time of `action(sessions)` in milliseconds."""
+    samples = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        action(sessions)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main(argv):
+    counts = [int(arg) for arg in argv[1:]] or SESSION_COUNTS
+    installed = columnar.numpy
+    print(f"{'sessions':>8} {'dict loop ms':>12} {'array ms':>9} {'numpy ms':>9} {'speedup':>8}")
+    for count in counts:
+        sessions = make_sessions(count)
+        baseline = time_ms(dict_loop, sessions)
+        columnar.numpy = None
+        stdlib = time_ms(columnar_core, sessions)
+        columnar.numpy = installed
+        vectorized = time_ms(columnar_core, sessions) if installed is not None else None
+        best = vectorized if vectorized is not None else stdlib
+        numpy_ms = f"{vectorized:>9.1f}" if vectorized is not None else f"{'n/a':>9}"
+        print(f"{count:>8} {baseline:>12.1f} {stdlib:>9.1f} {numpy_ms} {baseline / best:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,80 @@
+"""
+Benchmark the latency cost of each durability mode.
+
+Builds throwaway gardens of several sizes in a temporary directory and
+times `add_session_safely` (what `finish` calls) under every durability
+mode and storage backend, plus the .hiddenBotanist state file write.
+
+Usage:
+    python benchmarks/bench_durability.py [SESSIONS ...]
+"""
+
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from botanist_pkg.config import DURABILITY_MODES
+from botanist_pkg.data_protection import safe_write_garden, write_json_atomically
+from botanist_pkg.garden import add_session_safely
+
+GARDEN_SIZES = (100, 1000, 10000)
+BACKENDS = ("json", "jsonl")
+REPEATS = 20
+
+
+def make_session(index):
+    day = 1 + index % 28
+    return {
+        "date": f"2025-09-{day:02d}",
+        "start_time": f"2025-09-{day:02d} 10:00:00",
+        "end_time": f"2025-09-{day:02d} 10:45:00",
+        "duration": 2700.0,
+        "description": f"Benchmark session {index}",
+        "flower": "bud",
+    }
+
+
+def time_ms(action, repeats=REPEATS):
+    """Median wall time of `action` in milliseconds."""
+    samples = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        action(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def run(size, backend, mode):
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        with open(".botanist_config.json", "w") as f:
+            json.dump({"storage_backend": backend, "durability": mode}, f)
+        with contextlib.redirect_stdout(io.StringIO()):
+            safe_write_garden({"current_streak": 0,
+                               "sessions": [make_session(i) for i in range(size)]})
+            finish = time_ms(lambda i: add_session_safely(make_session(size + i)))
+            state = time_ms(lambda i: write_json_atomically(
+                ".hiddenBotanist", {"session_start": "2025-09-01 10:00:00.000000", "pauses": []}))
+        os.chdir(os.path.dirname(directory))
+    return finish, state
+
+
+def main(argv):
+    sizes = [int(arg) for arg in argv[1:]] or GARDEN_SIZES
+    print(f"{'sessions':>8} {'backend':>7} {'durability':>10} {'finish ms':>10} {'state ms':>9}")
+    for size in sizes:
+        for backend in BACKENDS:
+            for mode in DURABILITY_MODES:
+                finish, state = run(size, backend, mode)
+                print(f"{size:>8} {backend:>7} {mode:>10} {finish:>10.2f} {state:>9.2f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
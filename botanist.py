@@ -11,16 +11,30 @@ import json
 import datetime
 
 from botanist_pkg.session import Session
-from botanist_pkg.flowers import assign_flower
+from botanist_pkg.flowers import assign_flower, assign_flower_key
 from botanist_pkg.display import print_box, print_session_started, print_session_finished
-from botanist_pkg.analytics import calculate_total_pause_time, analyze_weekly_totals
-from botanist_pkg.garden import open_or_create_garden, export_garden_to_csv, add_session_safely
-from botanist_pkg.config import get_min_session_seconds, load_config, update_time_thresholds
+from botanist_pkg.analytics import (calculate_total_pause_time, analyze_weekly_totals, analyze_period_totals,
+                                    display_heatmap)
+from botanist_pkg.stats import collect_stats, display_stats
+from botanist_pkg.garden import (export_garden_to_csv, add_session_safely, migrate_garden, rebuild_rollups, compact_garden, iter_sessions,
+                                 get_streaks, dedupe_garden, sessions_between, rebuild_time_index,
+                                 rebuild_search_index, search_sessions)
+from botanist_pkg.config import get_min_session_seconds, get_storage_backend, load_config, update_time_thresholds
 from botanist_pkg.utils import sanitize_description
+from botanist_pkg.schema import to_datetime, format_time, SCHEMA_VERSION
+from botanist_pkg.locking import state_lock
+from botanist_pkg.data_protection import write_json_atomically
 from botanist_pkg.goals import (display_daily_progress, display_weekly_progress, 
                                check_goal_achievements, set_weekly_goal)
 
 
+# Commands that read and rewrite the active session file (.hiddenBotanist)
+STATE_COMMANDS = ("start", "finish", "pause", "resume")
+
+# Commands that accept a --since/--until date window
+RANGE_COMMANDS = ("garden", "export")
+
+
 def main(argv=None):
     """
     Main entry point for Botanist CLI application.
@@ -36,24 +50,109 @@ def main(argv=None):
         pause: Temporarily pause the current session
         resume: Resume a paused session
         status: Show current session status and progress
-        garden: Display all completed sessions
-        export: Export session data to CSV
+        garden [--since DATE] [--until DATE]: Display completed sessions
+        export [--since DATE] [--until DATE]: Export session data to CSV
         weekly: Show weekly productivity analysis
+        monthly: Show focus hours per month
+        yearly: Show focus hours per year and quarter
+        stats: Show session length statistics and weekday/hour distributions
+        heatmap [YEAR]: Draw a calendar heatmap of daily focus minutes
+        search TERM... [OR TERM...] [--since DATE] [--until DATE]: Find sessions by description
         config: Display current configuration
         goals: Show daily and weekly progress toward targets
         verify: Check data integrity and list backups  
+        migrate: Upgrade an existing garden to the current schema version
+        sqlite import|export: Copy sessions between JSON and the SQLite backend
+        shards import|export: Copy sessions between JSON and the month-sharded backend
+        reindex: Rebuild the derived indexes (rollups, time index, search index) from the garden
+        compact: Fold the session log into the garden file and its snapshot
+        dedupe: Merge sessions recorded twice (same date and start time)
         test: Test flower display system
     """
     if argv is None:
         argv = sys.argv
 
-    # Validate command line arguments
-    if len(argv) < 2 or len(argv) > 3:
+    # Validate command line arguments (search takes any number of terms)
+    if len(argv) < 2 or (argv[1] != "search" and len(argv) > (6 if argv[1] in RANGE_COMMANDS else 3)):
         print("Sorry! Command invalid.")    
         return
         
     cmd = argv[1]
-    
+
+    if cmd in STATE_COMMANDS:
+        # Run these one at a time across terminals, so the same session
+        # cannot be finished (and saved) twice or lose a pause
+        try:
+            with state_lock():
+                run_command(cmd, argv)
+        except TimeoutError:
+            print("Another botanist command is still running. Try again in a moment.")
+        return
+
+    run_command(cmd, argv)
+
+
+def parse_date_range(args):
+    """
+    Parse the --since/--until options of a range command.
+
+    Args:
+        args (list): Arguments after the command name
+
+    Returns:
+        tuple: (since, until) as YYYY-MM-DD strings, None for an open bound
+
+    Raises:
+        ValueError: On an unknown option or a malformed date
+    """
+    bounds = {"--since": None, "--until": None}
+    if len(args) % 2:
+        raise ValueError("expected --since YYYY-MM-DD and/or --until YYYY-MM-DD")
+    for option, value in zip(args[::2], args[1::2]):
+        if option not in bounds:
+            raise ValueError(f"unknown option {option}")
+        try:
+            datetime.datetime.strptime(value, "%Y-%m-%d")
+        except ValueError:
+            raise ValueError(f"{value} is not a YYYY-MM-DD date")
+        bounds[option] = value
+    return bounds["--since"], bounds["--until"]
+
+
+def parse_search_args(args):
+    """
+    Split the arguments of `search` into query terms and a date window.
+
+    Args:
+        args (list): Arguments after the command name
+
+    Returns:
+        tuple: (terms, since, until), see parse_date_range for the bounds
+
+    Raises:
+        ValueError: On an unknown option or a malformed date
+    """
+    terms, options = [], []
+    i = 0
+    while i < len(args):
+        if args[i].startswith("--"):
+            options.extend(args[i:i + 2])
+            i += 2
+        else:
+            terms.append(args[i])
+            i += 1
+    since, until = parse_date_range(options)
+    return terms, since, until
+
+
+def run_command(cmd, argv):
+    """
+    Run a single command once the arguments have been validated.
+
+    Args:
+        cmd (str): Command name (argv[1])
+        argv (list): Full command line arguments
+    """
     # Command: test - Display sample flowers for different durations
     if cmd == "test":
         print("Testing all flowers:\n")
@@ -89,8 +188,7 @@ def main(argv=None):
                                 "session_start": str(session.start_time),
                                 "pauses": []  # Track any pause/resume events
                             }
-            with open(".hiddenBotanist", "w") as file:
-                json.dump(json_structure, file)
+            write_json_atomically(".hiddenBotanist", json_structure)
                 
             # Display success message with ASCII art
             print_session_started()
@@ -108,21 +206,17 @@ def main(argv=None):
                     print("You are currently paused. Cannot finish session without unpausing.")
                 else:
                     session.finish()
-                    os.remove(".hiddenBotanist")
                     # cancel session if its short(testing or accidental)
                     pauseTime = calculate_total_pause_time(currentSessionInfo["pauses"])
                     min_session_time = get_min_session_seconds()
                     if (session.finish_time - session.start_time).total_seconds() - pauseTime < min_session_time:
+                        os.remove(".hiddenBotanist")
                         print("Session will not be saved. Too short. Try harder.")
                     else:
-                        my_garden = open_or_create_garden()
                         # Sanitize description input
                         raw_description = sys.argv[2] if len(sys.argv) > 2 else ""
                         clean_description = sanitize_description(raw_description)
                         
-                        obsidian_path = os.environ.get('BOTANIST_OBSIDIAN_PATH')
-                        if obsidian_path:
-                            session.save_to_file(obsidian_path, clean_description) 
                         # Create new session data
                         session_data = {
                             "date": session.start_time.strftime("%Y-%m-%d"), 
@@ -130,24 +224,30 @@ def main(argv=None):
                             "end_time": session.finish_time.strftime("%Y-%m-%d %H:%M:%S"),
                             "duration": (session.finish_time - session.start_time).total_seconds() - pauseTime, 
                             "description": clean_description, 
-                            "flower": assign_flower((session.finish_time - session.start_time).total_seconds() - pauseTime)
+                            "flower": assign_flower_key((session.finish_time - session.start_time).total_seconds() - pauseTime)
                         }
                         
-                        # Use safe append-only operation
+                        # Use safe append-only operation. The active session
+                        # is only cleared once it is saved (still under the
+                        # state lock), so a failed finish can be retried
                         if add_session_safely(session_data):
+                            os.remove(".hiddenBotanist")
                             print("[DATA] Session saved safely with backup")
                         else:
-                            print("[ERROR] Failed to save session data!")
+                            print("[ERROR] Failed to save session data! Run finish again to retry.")
                             return
+
+                        obsidian_path = os.environ.get('BOTANIST_OBSIDIAN_PATH')
+                        if obsidian_path:
+                            session.save_to_file(obsidian_path, clean_description)
                         
                         # Show finish message with duration
                         session_duration_minutes = round(((session.finish_time - session.start_time).total_seconds() - pauseTime) / 60)
                         print_session_finished(session_duration_minutes)
                         print(f"Session saved and finished at {session.finish_time.strftime('%A %m/%d %H:%M:%S')}. Congrats on another session!")
                         
-                        # Reload garden data and check for goal achievements
-                        updated_garden = open_or_create_garden()
-                        check_goal_achievements(updated_garden["sessions"], show_celebrations=True)
+                        # Check this week's totals for goal achievements
+                        check_goal_achievements(show_celebrations=True)
         #if it doesnt exist the session has not started
         else:
             print("Session needs to be started first!")
@@ -169,9 +269,22 @@ def main(argv=None):
             print("Cannot show status of inexistent session. Create session first.")
     # Garden time!
     elif(cmd == "garden"):
-        my_garden = open_or_create_garden()
-        print("Your current streak is: " + str(my_garden["current_streak"]) + " days.")
-        for i in my_garden["sessions"]:
+        try:
+            since, until = parse_date_range(argv[2:])
+        except ValueError as e:
+            print(f"Invalid argument: {e}")
+            return
+        # Streaks come from the rollup index, not from scanning the sessions
+        streaks = get_streaks()
+        print("Your current streak is: " + str(streaks["current"]) + " days."
+              + " Longest: " + str(streaks["longest"]) + " days.")
+        if since is None and until is None:
+            # Sessions are streamed so only one segment (or chunk) is in memory at a time
+            sessions = iter_sessions()
+        else:
+            # A date window is sliced out of the sorted time index
+            sessions = sessions_between(since, until)
+        for i in sessions:
             for j in i:
                 if(j == "flower"):
                     print_box(flower=i[j])
@@ -181,7 +294,7 @@ def main(argv=None):
                     print(j + " : " + f"{minutes} minutes")
                 elif(j == "start_time" or j == "end_time"):
                     # Format times nicely for display
-                    time_obj = datetime.datetime.strptime(i[j], "%Y-%m-%d %H:%M:%S")
+                    time_obj = to_datetime(i[j])
                     print(j + " : " + time_obj.strftime("%a %m/%d %H:%M"))
                 else:
                     print(j + " : " + str(i[j]))
@@ -192,8 +305,7 @@ def main(argv=None):
                 currentSessionInfo = json.load(file)
                 pauseTime = datetime.datetime.now()
                 currentSessionInfo["pauses"].append({"start": str(pauseTime), "finish": None})
-                with open(".hiddenBotanist", "w") as file:
-                    json.dump(currentSessionInfo, file)
+                write_json_atomically(".hiddenBotanist", currentSessionInfo)
             print("You have paused your session. Come back when you feel ready. Based on your study duration, I recommend " + "-- 5 minutes break.")
         else:
             print("Session needs to be started first!")
@@ -209,8 +321,7 @@ def main(argv=None):
                         start_time = datetime.datetime.strptime(pauseTime, "%Y-%m-%d %H:%M:%S.%f")
                         pauseDuration = resumeTime - start_time
                         currentSessionInfo["pauses"][-1]["finish"] = str(resumeTime)
-                        with open(".hiddenBotanist", "w") as file:
-                            json.dump(currentSessionInfo, file)
+                        write_json_atomically(".hiddenBotanist", currentSessionInfo)
                         print(f"You successfully unpaused. You were away for {round(pauseDuration.total_seconds() // 60)} minutes. Keep working!")
                     else:
                         print("You cannot resume a session you have not paused first.")
@@ -222,8 +333,44 @@ def main(argv=None):
     elif cmd == "weekly":
         analyze_weekly_totals()
 
+    elif cmd == "monthly":
+        analyze_period_totals("month")
+
+    elif cmd == "yearly":
+        analyze_period_totals("year")
+
+    elif cmd == "heatmap":
+        if len(argv) == 3 and not (argv[2].isdigit() and 1 <= int(argv[2]) <= 9999):
+            print("Usage: heatmap [YEAR]")
+        else:
+            display_heatmap(int(argv[2]) if len(argv) == 3 else None)
+
+    elif cmd == "search":
+        try:
+            terms, since, until = parse_search_args(argv[2:])
+        except ValueError as e:
+            print(f"Invalid argument: {e}")
+            return
+        if not [term for term in terms if term not in ("AND", "OR")]:
+            print("Usage: search TERM... [OR TERM...] [--since YYYY-MM-DD] [--until YYYY-MM-DD]")
+            return
+        matches = search_sessions(terms, since, until)
+        for match in matches:
+            print(f"{match['start_time'][:16]}  {round(match['duration'] / 60):>4} min  {match['description']}")
+        total_seconds = sum(match["duration"] for match in matches)
+        print(f"{len(matches)} matching session(s), {total_seconds / 3600:.2f} h in total")
+
+    elif cmd == "stats":
+        # One streaming pass; only running totals and a sketch stay in memory
+        display_stats(collect_stats(iter_sessions()))
+
     elif(cmd == "export"):
-        export_garden_to_csv()
+        try:
+            since, until = parse_date_range(argv[2:])
+        except ValueError as e:
+            print(f"Invalid argument: {e}")
+            return
+        export_garden_to_csv(since, until)
     
     elif(cmd == "config"):
         if len(argv) == 2:
@@ -255,12 +402,9 @@ def main(argv=None):
             print("  config weekly=N  - Set weekly goal to N hours")
     
     elif(cmd == "goals"):
-        my_garden = open_or_create_garden()
-        sessions = my_garden.get("sessions", [])
-        
-        # Show today's and this week's progress
-        display_daily_progress(sessions)
-        display_weekly_progress(sessions)
+        # Show today's and this week's progress (only those dates are loaded)
+        display_daily_progress()
+        display_weekly_progress()
     
     elif(cmd == "verify"):
         from botanist_pkg.data_protection import verify_data_integrity, list_backups
@@ -271,6 +415,78 @@ def main(argv=None):
         verify_data_integrity()
         print()
         list_backups()
+
+    elif(cmd == "sqlite"):
+        from botanist_pkg.sqlite_store import import_from_json, export_to_json, DB_FILE
+        if len(argv) == 3 and argv[2] == "import":
+            count = import_from_json()
+            print(f"Imported {count} sessions into {DB_FILE}")
+        elif len(argv) == 3 and argv[2] == "export":
+            count = export_to_json()
+            if count < 0:
+                print("[ERROR] Export failed!")
+            else:
+                print(f"Exported {count} sessions from {DB_FILE} to .hiddenGarden.json")
+        else:
+            print("Usage:")
+            print("  sqlite import  - Copy .hiddenGarden.json into the SQLite database")
+            print("  sqlite export  - Write the SQLite database back to .hiddenGarden.json")
+
+    elif(cmd == "shards"):
+        from botanist_pkg.sharded_store import import_from_json, export_to_json, SEGMENT_DIR
+        if len(argv) == 3 and argv[2] == "import":
+            count = import_from_json()
+            if count < 0:
+                print("[ERROR] Import failed!")
+            else:
+                print(f"Imported {count} sessions into {SEGMENT_DIR}")
+        elif len(argv) == 3 and argv[2] == "export":
+            count = export_to_json()
+            if count < 0:
+                print("[ERROR] Export failed!")
+            else:
+                print(f"Exported {count} sessions from {SEGMENT_DIR} to .hiddenGarden.json")
+        else:
+            print("Usage:")
+            print("  shards import  - Split .hiddenGarden.json into month segments")
+            print("  shards export  - Write the month segments back to .hiddenGarden.json")
+
+    elif(cmd == "reindex"):
+        rollups = rebuild_rollups()
+        print(f"Rebuilt rollups for {len(rollups['days'])} day(s)"
+              f" (longest streak {rollups['streak']['longest']} day(s)).")
+        if get_storage_backend() != "sqlite":
+            print(f"Rebuilt the time index of {rebuild_time_index()} session(s).")
+        print(f"Rebuilt the search index of {rebuild_search_index()} session(s).")
+
+    elif(cmd == "compact"):
+        folded = compact_garden()
+        if folded < 0:
+            print("[ERROR] Compaction failed, your garden was left unchanged.")
+        else:
+            print(f"Compacted {folded} logged session(s) into a new garden snapshot.")
+
+    elif(cmd == "dedupe"):
+        merges = dedupe_garden()
+        if merges is None:
+            print("[ERROR] Deduplication failed, your garden was left unchanged.")
+        elif not merges:
+            print("No duplicate sessions found.")
+        else:
+            for merged, copies in merges:
+                print(f"Merged {len(copies)} copies of {format_time(merged['start_time'])}"
+                      f" -> {merged['description'] or '(no description)'}")
+            removed = sum(len(copies) - 1 for _, copies in merges)
+            print(f"Removed {removed} duplicate session(s).")
+
+    elif(cmd == "migrate"):
+        converted = migrate_garden()
+        if converted < 0:
+            print("[ERROR] Migration failed, your garden was left unchanged.")
+        elif converted == 0:
+            print("Your garden is already up to date.")
+        else:
+            print(f"Migrated {converted} session(s) to flower IDs and schema v{SCHEMA_VERSION}.")
     
     else:
         print("Invalid argument.")
@@ -2,10 +2,12 @@
 Analytics and reporting functionality for Botanist.
 """
 
-import os
-import json
 import datetime
-from collections import defaultdict
+import math
+from . import columnar
+from .config import get_week_epoch, get_week_start
+from .garden import daily_totals, store_stamp
+from .result_cache import cached
 
 
 def calculate_total_pause_time(pauses):
@@ -22,84 +24,191 @@ def calculate_total_pause_time(pauses):
     return duration
 
 
-def analyze_weekly_totals():
-    """Analyze and display weekly productivity statistics"""
-    path = ".hiddenGarden.json"
-    if not os.path.exists(path):
-        print(f"{path} not found.")
-        return
+WEEKDAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def weekly_totals(week_start=0):
+    """
+    Compute the totals shown by the weekly report.
+
+    Args:
+        week_start (int): Weekday weeks start on, 0 (Monday) to 6 (Sunday)
 
-    with open(path, "r") as f:
-        raw = json.load(f)
+    Returns:
+        dict: {"weeks": [[first day "YYYY-MM-DD", seconds, sessions]], "days":
+              {"YYYY-MM-DD": [seconds, sessions]}, "skipped": [bad dates]}
+    """
+    # Per-day totals are aggregated by the garden store (in SQL for sqlite),
+    # so only one row per active day is loaded into the columns
+    columns, skipped = columnar.from_daily_totals(daily_totals())
+    buckets = columnar.bucket_totals(columns, ("day", "week"), week_start)
+    return {"weeks": [[first, week["seconds"], week["sessions"]] for first, week in buckets["week"].items()],
+            "days": {date_str: [day["seconds"], day["sessions"]] for date_str, day in buckets["day"].items()},
+            "skipped": skipped}
 
-    sessions = raw.get("sessions", [])
-    if not sessions:
-        print("No valid sessions found in .hiddenGarden.json")
+
+def analyze_weekly_totals():
+    """
+    Analyze and display weekly productivity statistics.
+
+    Weeks start on the configured `week_start` and are numbered from the
+    week holding `week_epoch` (by default the week of the first session).
+    """
+    week_start = get_week_start()
+    epoch = get_week_epoch()
+    # Cached until the store changes, so repeated reports skip the garden
+    report, _ = cached("weekly", [store_stamp(), week_start], lambda: weekly_totals(week_start))
+    for date_str in report["skipped"]:
+        print("Skipping entry:", date_str)
+        print("Reason: not a YYYY-MM-DD date")
+    if not report["days"]:
+        print("No valid sessions found in your garden")
         return
 
-    # Historical Friday-based weeks (1-10)
-    FRIDAY_START_DATE = datetime.datetime(2025, 6, 20)
-    friday_days = ["Friday", "Saturday", "Sunday", "Monday", "Tuesday", "Wednesday", "Thursday"]
-    
-    # New Monday-based weeks (11+)
-    MONDAY_START_DATE = datetime.datetime(2025, 9, 1)  # Monday Sep 1st
-    monday_days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-    
-    weekly = defaultdict(lambda: defaultdict(lambda: {"hours": 0.0, "count": 0}))
-
-    for s in sessions:
-        try:
-            start = datetime.datetime.strptime(s["start_time"], "%Y-%m-%d %H:%M:%S")
-            duration = s["duration"] / 3600  # seconds to hours
-            
-            if start < MONDAY_START_DATE:
-                # Historical Friday-based weeks (1-10)
-                delta_days = (start - FRIDAY_START_DATE).days
-                if delta_days < 0:
-                    continue
-                week_num = delta_days // 7 + 1
-                day_index = delta_days % 7
-                day_name = friday_days[day_index]
-                weekly[week_num][day_name]["hours"] += duration
-                weekly[week_num][day_name]["count"] += 1
-            else:
-                # New Monday-based weeks (11+)
-                delta_days = (start - MONDAY_START_DATE).days
-                week_num = delta_days // 7 + 11  # Start numbering from Week 11
-                day_index = delta_days % 7
-                day_name = monday_days[day_index]
-                weekly[week_num][day_name]["hours"] += duration
-                weekly[week_num][day_name]["count"] += 1
-                
-        except Exception as e:
-            print("Skipping entry:", s)
-            print("Reason:", e)
-
-    total_hours = sum(sum(day["hours"] for day in week.values()) for week in weekly.values())
+    days = report["days"]
+    if epoch is None:
+        epoch = datetime.date.fromisoformat(report["weeks"][0][0])
+    first_week = columnar.week_start_date(epoch, week_start)
+    day_names = WEEKDAY_NAMES[week_start:] + WEEKDAY_NAMES[:week_start]
+    span = f"{day_names[0][:3]}-{day_names[-1][:3]}"
+
+    total_hours = sum(seconds for _, seconds, _ in report["weeks"]) / 3600
     print(f"\nTotal hours across all weeks: {total_hours:.2f} h")
 
-    for week_num in sorted(weekly.keys()):
-        week = weekly[week_num]
-        week_total_hours = sum(day["hours"] for day in week.values())
-        week_total_sessions = sum(day["count"] for day in week.values())
-        
-        if week_num <= 10:
-            # Historical Friday-based weeks
-            print(f"\nWeek {week_num} (Fri-Thu):  {week_total_hours:.2f} h  across {week_total_sessions} session(s)")
-            base_date = FRIDAY_START_DATE + datetime.timedelta(days=(week_num - 1) * 7)
-            days_to_use = friday_days
-        else:
-            # New Monday-based weeks  
-            print(f"\nWeek {week_num} (Mon-Sun):  {week_total_hours:.2f} h  across {week_total_sessions} session(s)")
-            base_date = MONDAY_START_DATE + datetime.timedelta(days=(week_num - 11) * 7)
-            days_to_use = monday_days
+    for week_first, week_seconds, week_total_sessions in report["weeks"]:
+        base_date = datetime.date.fromisoformat(week_first)
+        week_num = (base_date - first_week).days // 7 + 1
+        week_total_hours = week_seconds / 3600
+        print(f"\nWeek {week_num} ({span}):  {week_total_hours:.2f} h  across {week_total_sessions} session(s)")
 
-        for i, day in enumerate(days_to_use):
+        for i, day in enumerate(day_names):
             this_date = base_date + datetime.timedelta(days=i)
             label = f"{day:<10} ({this_date.strftime('%b %d')})"
-            hours = week[day]["hours"]
-            count = week[day]["count"]
+            seconds, count = days.get(this_date.strftime("%Y-%m-%d"), [0.0, 0])
+            hours = seconds / 3600
             bar = "█" * int(hours * 2) if hours > 0 else ""
             print(f"  {label}  {hours:>5.2f} h  {count}x  {bar}")
 
-    print(f"\nTotal hours across all weeks: {total_hours:.2f} h")
\ No newline at end of file
+    print(f"\nTotal hours across all weeks: {total_hours:.2f} h")
+
+
+def period_totals():
+    """
+    Compute the totals shown by the monthly and yearly reports.
+
+    Returns:
+        dict: {"month"|"quarter"|"year": [[label, seconds, sessions]]}, oldest first
+    """
+    columns, _ = columnar.from_daily_totals(daily_totals())
+    buckets = columnar.bucket_totals(columns, ("month", "quarter", "year"))
+    return {unit: [[label, bucket["seconds"], bucket["sessions"]] for label, bucket in unit_buckets.items()]
+            for unit, unit_buckets in buckets.items()}
+
+
+def _period_line(label, seconds, sessions, most):
+    """Format one bucket of the monthly or yearly report with a bar scaled to the busiest bucket."""
+    bar = "█" * round(30 * seconds / most) if seconds > 0 else ""
+    return f"  {label:<8} {seconds / 3600:>7.2f} h  {sessions:>4}x  {bar}"
+
+
+def analyze_period_totals(unit):
+    """
+    Display focus hours per month ("month") or per year with its quarters ("year").
+
+    Args:
+        unit (str): "month" or "year"
+    """
+    report, _ = cached("periods", store_stamp(), period_totals)
+    if not report["year"]:
+        print("No valid sessions found in your garden")
+        return
+
+    total_hours = sum(seconds for _, seconds, _ in report["year"]) / 3600
+    if unit == "month":
+        most = max(seconds for _, seconds, _ in report["month"]) or 1
+        year = None
+        for label, seconds, sessions in report["month"]:
+            if label[:4] != year:
+                year = label[:4]
+                print(f"\n{year}")
+            month = datetime.date(int(year), int(label[5:]), 1).strftime("%b")
+            print(_period_line(month, seconds, sessions, most))
+    else:
+        most = max(seconds for _, seconds, _ in report["quarter"]) or 1
+        for year, seconds, sessions in report["year"]:
+            print(f"\n{year}:  {seconds / 3600:.2f} h  across {sessions} session(s)")
+            for label, quarter_seconds, quarter_sessions in report["quarter"]:
+                if label.startswith(year):
+                    print(_period_line(label[5:], quarter_seconds, quarter_sessions, most))
+
+    print(f"\nTotal hours: {total_hours:.2f} h")
+
+
+HEATMAP_LEVELS = "·░▒▓█"  # No focus, then quarters of the busiest day
+
+
+def heatmap_grid(totals, year):
+    """
+    Lay out a year of daily focus minutes as a GitHub-style calendar.
+
+    Args:
+        totals (dict): {"YYYY-MM-DD": {"seconds": float, ...}} daily buckets
+        year (int): Calendar year to draw
+
+    Returns:
+        tuple: (7 rows of cells, one per weekday starting Monday, where a
+               cell is a level 0-4 or None outside the year; list of
+               (column, month abbreviation) labels)
+    """
+    first = datetime.date(year, 1, 1)
+    origin = first.toordinal() - first.weekday()  # Monday of the first column
+    last = datetime.date(year, 12, 31)
+    columns = (last.toordinal() - origin) // 7 + 1
+    rows = [[None] * columns for _ in range(7)]
+
+    minutes = {}
+    for date_str, day in totals.items():
+        if date_str.startswith(f"{year:04d}-"):
+            minutes[date_str] = day["seconds"] / 60
+    busiest = max(minutes.values(), default=0) or 1
+
+    labels = []
+    day = first
+    while day <= last:
+        column = (day.toordinal() - origin) // 7
+        value = minutes.get(day.strftime("%Y-%m-%d"), 0)
+        rows[day.weekday()][column] = 0 if value <= 0 else max(1, math.ceil(4 * value / busiest))
+        if day.day == 1:
+            labels.append((column, day.strftime("%b")))
+        day += datetime.timedelta(days=1)
+    return rows, labels
+
+
+def display_heatmap(year=None):
+    """Draw a year-at-a-glance heatmap of daily focus minutes from the daily rollups."""
+    if year is None:
+        year = datetime.date.today().year
+    # 365 rollup lookups, independent of how many sessions the garden holds
+    totals = daily_totals(f"{year:04d}-01-01", f"{year:04d}-12-31")
+    rows, labels = heatmap_grid(totals, year)
+
+    header = [" "] * len(rows[0])
+    for column, month in labels:
+        for offset, letter in enumerate(month):
+            if column + offset < len(header):
+                header[column + offset] = letter
+    print(f"\nFocus heatmap for {year}")
+    print("     " + "".join(header))
+    weekdays = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+    for name, cells in zip(weekdays, rows):
+        line = "".join(" " if level is None else HEATMAP_LEVELS[level] for level in cells)
+        print(f" {name} {line}")
+
+    total_minutes = sum(day["seconds"] for day in totals.values()) / 60
+    print(f"\n     Less {HEATMAP_LEVELS} More")
+    if totals:
+        best = max(totals, key=lambda date_str: totals[date_str]["seconds"])
+        print(f"     {len(totals)} active day(s), {total_minutes / 60:.2f} h in total,"
+              f" best day {best} ({totals[best]['seconds'] / 60:.0f} min)")
+    else:
+        print(f"     No sessions in {year}")
@@ -0,0 +1,252 @@
+"""
+Columnar analytics core for Botanist.
+
+Reports load the sessions (or the per-day rollups) they need into three
+parallel typed arrays: day ordinal, focus seconds and session count.
+Per-day, per-week and per-month totals are then computed with bulk
+operations over whole columns. With NumPy installed these are vectorized
+(np.unique + np.bincount); without it the same functions run over the
+stdlib `array`s, so NumPy stays optional.
+
+bucket_totals() is the one bucketing engine every report uses: it sums
+the columns per day, week (starting on any weekday), month, quarter and
+year from a single load, computing each row's calendar month only once
+for all the month-based units.
+"""
+
+import datetime
+from array import array
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional
+    numpy = None
+
+
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+
+def empty_columns():
+    """Create an empty set of columns."""
+    return {"day": array("l"), "seconds": array("d"), "count": array("l")}
+
+
+def _day_ordinal(date_str, cache):
+    """Parse a YYYY-MM-DD date to its proleptic ordinal, once per distinct date."""
+    ordinal = cache.get(date_str)
+    if ordinal is None:
+        ordinal = datetime.date.fromisoformat(date_str).toordinal()
+        cache[date_str] = ordinal
+    return ordinal
+
+
+def from_sessions(sessions):
+    """
+    Load sessions into columns, one row per session.
+
+    Rows are keyed on the session's "date" (the local day every report
+    groups on). Sessions with a missing or malformed date are skipped.
+
+    Args:
+        sessions (iterable): Session dictionaries
+
+    Returns:
+        dict: Columns {"day": array, "seconds": array, "count": array}
+    """
+    columns = empty_columns()
+    days, seconds = columns["day"], columns["seconds"]
+    cache = {}
+    for s in sessions:
+        try:
+            days.append(_day_ordinal(s.get("date", ""), cache))
+        except (TypeError, ValueError):
+            continue
+        seconds.append(s.get("duration", 0))
+    columns["count"] = array("l", [1]) * len(days)
+    return columns
+
+
+def from_daily_totals(totals):
+    """
+    Load per-day totals (as returned by garden.daily_totals) into columns.
+
+    Returns:
+        tuple: (columns, list of date strings that could not be parsed)
+    """
+    columns = empty_columns()
+    skipped = []
+    for date_str, day in totals.items():
+        try:
+            columns["day"].append(datetime.date.fromisoformat(date_str).toordinal())
+        except ValueError:
+            skipped.append(date_str)
+            continue
+        columns["seconds"].append(day["seconds"])
+        columns["count"].append(day["sessions"])
+    return columns, skipped
+
+
+def _as_numpy(column):
+    """View a typed array as a NumPy array without copying."""
+    return numpy.frombuffer(column, dtype=numpy.dtype(column.typecode))
+
+
+def between(columns, first=None, last=None):
+    """
+    Select the rows whose day ordinal falls in [first, last].
+
+    Args:
+        columns (dict): Columns to filter
+        first (int): First day ordinal to keep, None for no lower bound
+        last (int): Last day ordinal to keep, None for no upper bound
+
+    Returns:
+        dict: Filtered columns
+    """
+    if first is None and last is None:
+        return columns
+    low = first if first is not None else -1
+    high = last if last is not None else datetime.date.max.toordinal()
+    if numpy is not None:
+        days = _as_numpy(columns["day"])
+        mask = (days >= low) & (days <= high)
+        return {name: array(column.typecode, _as_numpy(column)[mask].tobytes())
+                for name, column in columns.items()}
+    keep = [i for i, day in enumerate(columns["day"]) if low <= day <= high]
+    return {name: array(column.typecode, [column[i] for i in keep])
+            for name, column in columns.items()}
+
+
+def sum_by(keys, columns):
+    """
+    Sum the seconds and count columns per distinct key.
+
+    Args:
+        keys: Sequence of integer keys, one per row
+        columns (dict): Columns whose rows the keys belong to
+
+    Returns:
+        dict: {key: (seconds, sessions)} for every key present, in key order
+    """
+    if numpy is not None:
+        unique, inverse = numpy.unique(numpy.asarray(keys), return_inverse=True)
+        seconds = numpy.bincount(inverse, weights=_as_numpy(columns["seconds"]), minlength=len(unique))
+        counts = numpy.bincount(inverse, weights=_as_numpy(columns["count"]), minlength=len(unique))
+        return {int(key): (float(total), int(count))
+                for key, total, count in zip(unique, seconds, counts)}
+    sums = {}
+    for key, seconds, count in zip(keys, columns["seconds"], columns["count"]):
+        total = sums.get(key)
+        sums[key] = (seconds, count) if total is None else (total[0] + seconds, total[1] + count)
+    return dict(sorted(sums.items()))
+
+
+BUCKET_UNITS = ("day", "week", "month", "quarter", "year")
+MONTHS_PER_BUCKET = {"month": 1, "quarter": 3, "year": 12}
+
+
+def week_start_date(date, week_start=0):
+    """Get the first day of the week holding `date`, for weeks starting on weekday `week_start` (0 = Monday)."""
+    return date - datetime.timedelta(days=(date.weekday() - week_start) % 7)
+
+
+def week_indexes(columns, week_start=0):
+    """Number each row's week by the day ordinal of its first day (weekday `week_start`)."""
+    # Ordinal 1 (Jan 1 of year 1) is a Monday, so (ordinal - 1) % 7 is the weekday
+    if numpy is not None:
+        days = _as_numpy(columns["day"])
+        return days - (days - 1 - week_start) % 7
+    return array("l", [day - (day - 1 - week_start) % 7 for day in columns["day"]])
+
+
+def month_indexes(columns):
+    """Number each row's calendar month as months since January 1970."""
+    if numpy is not None:
+        days = (_as_numpy(columns["day"]) - EPOCH_ORDINAL).astype("datetime64[D]")
+        return days.astype("datetime64[M]").astype(numpy.int64)
+    months = {}
+    for day in set(columns["day"]):
+        date = datetime.date.fromordinal(day)
+        months[day] = (date.year - 1970) * 12 + date.month - 1
+    return array("l", [months[day] for day in columns["day"]])
+
+
+def _divide(indexes, divisor):
+    """Floor-divide every bucket index (months into quarters or years)."""
+    if numpy is not None:
+        return indexes // divisor
+    return array("l", [index // divisor for index in indexes])
+
+
+def bucket_label(unit, index):
+    """
+    Name a bucket computed by bucket_totals.
+
+    Returns:
+        str: "YYYY-MM-DD" (first day) for days and weeks, "YYYY-MM",
+             "YYYY-Qn" or "YYYY"
+    """
+    if unit in ("day", "week"):
+        return datetime.date.fromordinal(index).isoformat()
+    if unit == "month":
+        return f"{1970 + index // 12:04d}-{index % 12 + 1:02d}"
+    if unit == "quarter":
+        return f"{1970 + index // 4:04d}-Q{index % 4 + 1}"
+    return f"{1970 + index:04d}"
+
+
+def bucket_totals(columns, units=BUCKET_UNITS, week_start=0):
+    """
+    Sum focus seconds and sessions per bucket for each requested unit.
+
+    Args:
+        columns (dict): Columns to bucket
+        units (iterable): Any of "day", "week", "month", "quarter", "year"
+        week_start (int): Weekday weeks start on, 0 (Monday) to 6 (Sunday)
+
+    Returns:
+        dict: {unit: {bucket label: {"seconds": float, "sessions": int}}},
+              each unit's buckets oldest first (see bucket_label)
+
+    Raises:
+        ValueError: If a unit is not one of BUCKET_UNITS
+    """
+    buckets = {}
+    months = None
+    for unit in units:
+        if unit == "day":
+            indexes = columns["day"]
+        elif unit == "week":
+            indexes = week_indexes(columns, week_start)
+        elif unit in MONTHS_PER_BUCKET:
+            if months is None:
+                months = month_indexes(columns)
+            indexes = months if unit == "month" else _divide(months, MONTHS_PER_BUCKET[unit])
+        else:
+            raise ValueError(f"Unknown bucket unit '{unit}'")
+        buckets[unit] = {bucket_label(unit, index): {"seconds": seconds, "sessions": count}
+                         for index, (seconds, count) in sum_by(indexes, columns).items()}
+    return buckets
+
+
+def totals(columns):
+    """
+    Sum a whole set of columns.
+
+    Returns:
+        dict: {"seconds": float, "sessions": int}
+    """
+    if numpy is not None:
+        return {"seconds": float(_as_numpy(columns["seconds"]).sum()),
+                "sessions": int(_as_numpy(columns["count"]).sum())}
+    return {"seconds": float(sum(columns["seconds"])), "sessions": sum(columns["count"])}
+
+
+def day_totals(columns):
+    """
+    Sum focus seconds and sessions per day.
+
+    Returns:
+        dict: {"YYYY-MM-DD": {"seconds": float, "sessions": int}}, oldest first
+    """
+    return bucket_totals(columns, ("day",))["day"]
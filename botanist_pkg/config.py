@@ -2,6 +2,7 @@
 Configuration management for Botanist.
 """
 
+import datetime
 import json
 import os
 
@@ -14,11 +15,47 @@ DEFAULT_CONFIG = {
         "queen_minutes": 120
     },
     "min_session_seconds": 30,
-    "default_break_minutes": 5
+    "default_break_minutes": 5,
+    "storage_backend": "json",
+    "backup_engine": "dedup",
+    "backup_compression": "none",
+    "durability": "file",
+    "compaction_tail_records": 500,
+    "compaction_tail_bytes": 262144,
+    "backup_retention": {
+        "recent": 10,
+        "hourly": 24,
+        "daily": 14,
+        "weekly": 8,
+        "monthly": 12
+    },
+    "week_start": "monday",
+    "week_epoch": None
 }
 
 CONFIG_FILE = ".botanist_config.json"
 
+# "json" rewrites .hiddenGarden.json on every finish,
+# "jsonl" appends each finished session to a log instead,
+# "sqlite" keeps sessions in an indexed .hiddenGarden.db,
+# "sharded" splits sessions into one file per month under .hiddenGarden.d
+STORAGE_BACKENDS = ("json", "jsonl", "sqlite", "sharded")
+
+# "dedup" stores content-addressed chunks so a backup only costs the bytes
+# that changed, "full" copies the whole garden file
+BACKUP_ENGINES = ("dedup", "full")
+
+# Stdlib codecs available for compressing backups
+BACKUP_COMPRESSIONS = ("none", "gzip", "bz2", "lzma")
+
+# "none" leaves flushing to the OS, "file" fsyncs every file before it is
+# renamed into place, "file+dir" also fsyncs the directory so the rename
+# itself survives a power cut
+DURABILITY_MODES = ("none", "file", "file+dir")
+
+# Days a week can start on, in datetime.date.weekday() order
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
 
 def load_config():
     """Load configuration from file or return defaults"""
@@ -65,6 +102,122 @@ def get_min_session_seconds():
     return config["min_session_seconds"]
 
 
+def get_storage_backend():
+    """Get the configured storage backend, falling back to plain JSON"""
+    config = load_config()
+    backend = config.get("storage_backend", "json")
+    if backend not in STORAGE_BACKENDS:
+        print(f"Warning: Unknown storage backend '{backend}', using json")
+        return "json"
+    return backend
+
+
+def get_backup_engine():
+    """Get the configured backup engine, falling back to deduplicated chunks"""
+    config = load_config()
+    engine = config.get("backup_engine", "dedup")
+    if engine not in BACKUP_ENGINES:
+        print(f"Warning: Unknown backup engine '{engine}', using dedup")
+        return "dedup"
+    return engine
+
+
+def get_backup_compression():
+    """Get the configured backup compression codec"""
+    config = load_config()
+    codec = config.get("backup_compression", "none")
+    if codec not in BACKUP_COMPRESSIONS:
+        print(f"Warning: Unknown backup compression '{codec}', storing backups uncompressed")
+        return "none"
+    return codec
+
+
+def get_durability():
+    """Get the configured durability mode for garden, backup and state writes"""
+    config = load_config()
+    mode = config.get("durability", "file")
+    if mode not in DURABILITY_MODES:
+        print(f"Warning: Unknown durability mode '{mode}', using file")
+        return "file"
+    return mode
+
+
+def get_compaction_thresholds():
+    """
+    Get when the session log tail is compacted into a new snapshot.
+
+    Returns:
+        tuple: (max_records, max_bytes); 0 disables that threshold
+    """
+    config = load_config()
+    thresholds = []
+    for key in ("compaction_tail_records", "compaction_tail_bytes"):
+        value = config.get(key, DEFAULT_CONFIG[key])
+        if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+            print(f"Warning: Invalid {key} '{value}', using {DEFAULT_CONFIG[key]}")
+            value = DEFAULT_CONFIG[key]
+        thresholds.append(value)
+    return tuple(thresholds)
+
+
+def get_backup_retention():
+    """
+    Get how many backups of each generation to keep.
+
+    Returns:
+        dict: Counts for "recent" (newest backups) and the newest backup in
+              each of the latest N "hourly", "daily", "weekly" and "monthly"
+              periods; missing or invalid entries use the defaults
+    """
+    config = load_config()
+    defaults = DEFAULT_CONFIG["backup_retention"]
+    configured = config.get("backup_retention", defaults)
+    if not isinstance(configured, dict):
+        print("Warning: backup_retention must be an object, using defaults")
+        configured = {}
+    retention = {}
+    for generation, default in defaults.items():
+        value = configured.get(generation, default)
+        if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+            print(f"Warning: Invalid backup_retention.{generation} '{value}', using {default}")
+            value = default
+        retention[generation] = value
+    return retention
+
+
+def get_week_start():
+    """
+    Get the weekday weeks start on for weekly reports and goals.
+
+    Returns:
+        int: 0 for Monday through 6 for Sunday
+    """
+    config = load_config()
+    day = config.get("week_start", "monday")
+    if not isinstance(day, str) or day.lower() not in WEEKDAYS:
+        print(f"Warning: Unknown week_start '{day}', using monday")
+        return 0
+    return WEEKDAYS.index(day.lower())
+
+
+def get_week_epoch():
+    """
+    Get the date whose week is Week 1 in the weekly report.
+
+    Returns:
+        datetime.date: Configured epoch, or None to count from the first session
+    """
+    config = load_config()
+    epoch = config.get("week_epoch")
+    if epoch is None:
+        return None
+    try:
+        return datetime.date.fromisoformat(epoch)
+    except (TypeError, ValueError):
+        print(f"Warning: Invalid week_epoch '{epoch}', counting weeks from the first session")
+        return None
+
+
 def update_time_thresholds(seedling_min=None, bud_min=None, bloom_min=None, queen_min=None):
     """Update time thresholds and save configuration"""
     config = load_config()
@@ -5,77 +5,555 @@ Ensures session data integrity and prevents accidental loss.
 
 import json
 import os
-import shutil
 import datetime
-from typing import Dict, List, Any
+import hashlib
+import marshal
+import re
+import sqlite3
+import uuid
+import zlib
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import gzip
+import bz2
+import lzma
+from typing import Dict, List, Any, Optional
+
+from .config import (get_backup_engine, get_backup_compression, get_durability,
+                     get_compaction_thresholds, get_backup_retention)
+from .schema import is_epoch, session_key, TIME_FORMAT
+from .locking import garden_lock, holds_lock, GARDEN_LOCK_FILE
+from .result_cache import invalidate_results
 
 
 GARDEN_FILE = ".hiddenGarden.json"
+SESSION_LOG_FILE = ".hiddenGarden.log"  # Append-only JSONL tail of new sessions
+VALIDATION_FILE = ".hiddenGarden.validated"  # Watermark of already-validated data
+SNAPSHOT_FILE = ".hiddenGarden.snapshot"  # Binary (marshal) copy of the garden file
+SNAPSHOT_MAGIC = b"BOTANIST-SNAPSHOT-1\n"
+# A record line ends with its checksum, which salvage can read even when
+# another part of the line is damaged
+RECORD_CRC = re.compile(rb'"crc":(\d+)\}$')
+# With the checksum, the date and start time identify a damaged record
+RECORD_DATE = re.compile(rb'"date":("[^"\\]*")')
+RECORD_START = re.compile(rb'"start_time":("[^"\\]*"|[0-9.]+)')
 BACKUP_DIR = ".botanist_backups"
-MAX_BACKUPS = 30  # Keep 30 backup files
+CHUNK_DIR = os.path.join(BACKUP_DIR, "chunks")  # Content-addressed backup chunks
+MANIFEST_FILE = os.path.join(BACKUP_DIR, "manifest.json")  # Checksum and status of each backup
+MANIFEST_VERSION = 1
+# File suffix and module for each backup compression codec
+COMPRESSION_SUFFIXES = {"none": "", "gzip": ".gz", "bz2": ".bz2", "lzma": ".xz"}
+COMPRESSION_MODULES = {".gz": gzip, ".bz2": bz2, ".xz": lzma}
+# Copies of the SQLite backend's database, kept apart from the garden backups
+DATABASE_BACKUP_PREFIX = "database_backup_"
+BACKUP_EXTENSIONS = (".chunks", ".json") + tuple(
+    ".json" + suffix for suffix in COMPRESSION_MODULES
+)
+# Generations kept by the backup retention policy and the period each one buckets by
+RETENTION_GENERATIONS = (
+    ("hourly", "%Y-%m-%d %H"),
+    ("daily", "%Y-%m-%d"),
+    ("weekly", "%G-W%V"),
+    ("monthly", "%Y-%m"),
+)
+STREAM_READ_SIZE = 65536  # Bytes read at a time when streaming the garden
+
+# Content-defined chunking: cut after a line whose CRC is divisible by
+# CHUNK_BOUNDARY once a chunk holds at least CHUNK_MIN_BYTES
+CHUNK_MIN_BYTES = 2048
+CHUNK_MAX_BYTES = 65536
+CHUNK_BOUNDARY = 32
 
 
-def create_backup():
+def create_backup(source: str = GARDEN_FILE):
     """
-    Create a timestamped backup of the garden file.
+    Create a timestamped backup of the garden file (or another store file,
+    such as a month segment of the sharded backend).
     Called before any write operation to ensure data safety.
+
+    With the "dedup" backup engine the file is split into content-defined
+    chunks stored once under their SHA-256, and the backup itself is a small
+    recipe listing those chunks, so each backup only writes the bytes that
+    changed since the previous one. The "full" engine copies the whole file.
+    Full copies and chunks are compressed with the configured
+    backup_compression codec. Each source file has its own backup name
+    prefix and is rotated separately.
+
+    Args:
+        source: File to back up
     """
-    if not os.path.exists(GARDEN_FILE):
+    if not os.path.exists(source):
         return  # Nothing to backup
     
     # Create backup directory if it doesn't exist
     if not os.path.exists(BACKUP_DIR):
         os.makedirs(BACKUP_DIR)
     
-    # Create timestamped backup filename
-    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_filename = f"garden_backup_{timestamp}.json"
+    # Create timestamped backup filename (microseconds keep names unique)
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    engine = get_backup_engine()
+    suffix = COMPRESSION_SUFFIXES[get_backup_compression()]
+    durability = get_durability()
+    extension = ".chunks" if engine == "dedup" else ".json" + suffix
+    prefix = backup_prefix(source)
+    backup_filename = f"{prefix}{timestamp}{extension}"
     backup_path = os.path.join(BACKUP_DIR, backup_filename)
     
     # Copy the current file to backup
     try:
-        shutil.copy2(GARDEN_FILE, backup_path)
-        print(f"[BACKUP] Created: {backup_filename}")
+        with open(source, "rb") as f:
+            content = f.read()
+        checksum = hashlib.sha256(content).hexdigest()
+        manifest = _load_manifest()
+        previous = _unchanged_backup(manifest, prefix, extension, checksum)
+        if previous is not None and _link_backup(previous, backup_path, durability):
+            entry = dict(manifest[previous], stored_bytes=0, linked=True)
+            print(f"[BACKUP] Created: {backup_filename} (unchanged, linked)")
+        else:
+            if engine == "dedup":
+                stored = _write_chunked_backup(content, backup_path, suffix, durability)
+            else:
+                compressed = _compress(content, suffix)
+                _write_file_atomically(backup_path, compressed, durability)
+                stored = len(compressed)
+            entry = _describe_backup_content(content, checksum)
+            entry["stored_bytes"] = stored
+            print(f"[BACKUP] Created: {backup_filename}")
+        entry.update(source=prefix, created=timestamp)
+        manifest[backup_filename] = entry
+        _save_manifest(manifest)
     except IOError as e:
         print(f"[WARNING] Failed to create backup: {e}")
     
     # Clean up old backups
-    cleanup_old_backups()
+    cleanup_old_backups(prefix)
+
+
+def create_database_backup(conn: sqlite3.Connection):
+    """
+    Back up the SQLite backend's database before it is rewritten.
 
+    The copy is taken with sqlite3's online backup API, so it is a
+    consistent snapshot of the database `conn` is open on. Database backups
+    are plain .db files (restore one by copying it over .hiddenGarden.db)
+    rotated with the same retention policy as the garden backups.
 
-def cleanup_old_backups():
-    """Remove old backup files, keeping only the most recent MAX_BACKUPS."""
+    Args:
+        conn: Open connection to the database to back up
+    """
+    if not os.path.exists(BACKUP_DIR):
+        os.makedirs(BACKUP_DIR)
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    backup_filename = f"{DATABASE_BACKUP_PREFIX}{timestamp}.db"
+    backup_path = os.path.join(BACKUP_DIR, backup_filename)
+    temp_path = backup_path + ".tmp"
+    durability = get_durability()
+    try:
+        target = sqlite3.connect(temp_path)
+        try:
+            conn.backup(target)
+        finally:
+            target.close()
+        with open(temp_path, "rb+") as f:
+            _sync_file(f, durability)
+        os.replace(temp_path, backup_path)
+        _sync_directory(backup_path, durability)
+        print(f"[BACKUP] Created: {backup_filename}")
+    except (sqlite3.Error, OSError) as e:
+        print(f"[WARNING] Failed to create backup: {e}")
+
+    try:
+        backups = sorted(
+            ((_backup_time(name, os.path.join(BACKUP_DIR, name)), os.path.join(BACKUP_DIR, name), name)
+             for name in os.listdir(BACKUP_DIR)
+             if name.startswith(DATABASE_BACKUP_PREFIX) and name.endswith(".db")),
+            reverse=True
+        )
+        kept = _retention_plan(backups, get_backup_retention())
+        for created, filepath, filename in backups:
+            if filepath not in kept:
+                os.remove(filepath)
+                print(f"[CLEANUP] Removed old backup: {filename}")
+    except OSError as e:
+        print(f"[WARNING] Cleanup failed: {e}")
+
+
+def backup_prefix(source: str) -> str:
+    """Name prefix of the backups of a store file ("garden_backup_" for the garden)."""
+    if source == GARDEN_FILE:
+        return "garden_backup_"
+    return "segment_" + os.path.splitext(os.path.basename(source))[0] + "_backup_"
+
+
+def _split_chunks(data: bytes) -> List[bytes]:
+    """
+    Split file contents into content-defined chunks.
+
+    Boundaries fall after lines whose CRC hits CHUNK_BOUNDARY, so inserting
+    or appending records only changes the chunks around the edit rather
+    than shifting every chunk after it.
+    """
+    chunks = []
+    current = bytearray()
+    for line in data.splitlines(keepends=True):
+        # Very long lines (e.g. minified JSON) are cut at CHUNK_MAX_BYTES
+        for start in range(0, len(line), CHUNK_MAX_BYTES):
+            piece = line[start:start + CHUNK_MAX_BYTES]
+            current += piece
+            if len(current) >= CHUNK_MAX_BYTES or (
+                    len(current) >= CHUNK_MIN_BYTES and zlib.crc32(piece) % CHUNK_BOUNDARY == 0):
+                chunks.append(bytes(current))
+                current = bytearray()
+    if current:
+        chunks.append(bytes(current))
+    return chunks
+
+
+def _compress(content: bytes, suffix: str) -> bytes:
+    """Compress bytes with the codec for a file suffix ("" stores them as-is)."""
+    if not suffix:
+        return content
+    return COMPRESSION_MODULES[suffix].compress(content)
+
+
+def _read_compressed(path: str) -> bytes:
+    """Read a file, decompressing it according to its suffix."""
+    with open(path, "rb") as f:
+        content = f.read()
+    for suffix, module in COMPRESSION_MODULES.items():
+        if path.endswith(suffix):
+            try:
+                return module.decompress(content)
+            except (OSError, EOFError, ValueError, lzma.LZMAError) as e:
+                raise IOError(f"cannot decompress {path}: {e}")
+    return content
+
+
+def _find_chunk(chunk_id: str) -> Optional[str]:
+    """Locate a stored chunk whichever codec it was written with."""
+    for suffix in COMPRESSION_SUFFIXES.values():
+        chunk_path = os.path.join(CHUNK_DIR, chunk_id + suffix)
+        if os.path.exists(chunk_path):
+            return chunk_path
+    return None
+
+
+def _unchanged_backup(manifest: Dict[str, Any], prefix: str, extension: str,
+                      checksum: str) -> Optional[str]:
+    """
+    Find the newest backup of a source if it already holds content with `checksum`.
+
+    Returns:
+        str: File name of that backup, or None if the content changed since
+    """
+    candidates = [(entry.get("created", ""), filename) for filename, entry in manifest.items()
+                  if entry.get("source") == prefix]
+    if not candidates:
+        return None
+    filename = max(candidates)[1]
+    if (filename.endswith(extension) and manifest[filename].get("sha256") == checksum
+            and os.path.exists(os.path.join(BACKUP_DIR, filename))):
+        return filename
+    return None
+
+
+def _link_backup(existing: str, backup_path: str, durability: str) -> bool:
+    """Hard-link an unchanged backup (by file name) under a new path; False if unsupported."""
+    try:
+        os.link(os.path.join(BACKUP_DIR, existing), backup_path)
+    except OSError:
+        return False
+    _sync_directory(backup_path, durability)
+    return True
+
+
+def _write_chunked_backup(content: bytes, backup_path: str, suffix: str, durability: str = "file") -> int:
+    """
+    Store new chunks of a store file's contents and write the backup recipe.
+
+    Returns:
+        int: Bytes of new chunks written
+    """
+    if not os.path.exists(CHUNK_DIR):
+        os.makedirs(CHUNK_DIR)
+
+    chunk_ids = []
+    stored = 0
+    for chunk in _split_chunks(content):
+        chunk_id = hashlib.sha256(chunk).hexdigest()
+        chunk_ids.append(chunk_id)
+        if _find_chunk(chunk_id) is None:
+            compressed = _compress(chunk, suffix)
+            _write_file_atomically(os.path.join(CHUNK_DIR, chunk_id + suffix), compressed,
+                                   durability, sync_dir=False)
+            stored += len(compressed)
+    # One directory sync covers every chunk written above
+    if stored:
+        _sync_directory(os.path.join(CHUNK_DIR, chunk_ids[0]), durability)
+
+    recipe = {
+        "size": len(content),
+        "sha256": hashlib.sha256(content).hexdigest(),
+        "stored_bytes": stored,
+        "chunks": chunk_ids
+    }
+    _write_file_atomically(backup_path, json.dumps(recipe).encode("utf-8"), durability)
+    return stored
+
+
+def _describe_backup_content(content: bytes, checksum: Optional[str] = None) -> Dict[str, Any]:
+    """Build a manifest entry: checksum, size, session count and whether it can be restored."""
+    try:
+        data = json.loads(content)
+        valid = validate_garden_data(data, validate_sessions=False)
+    except ValueError:
+        valid = False
+    return {
+        "sha256": checksum or hashlib.sha256(content).hexdigest(),
+        "size": len(content),
+        "sessions": len(data["sessions"]) if valid else 0,
+        "valid": valid,
+    }
+
+
+def _load_manifest() -> Dict[str, Any]:
+    """Load the backup manifest as {backup file name: entry}; empty if missing or unreadable."""
+    try:
+        with open(MANIFEST_FILE, "r") as f:
+            manifest = json.load(f)
+    except (IOError, ValueError):
+        return {}
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest.get("backups", {})
+
+
+def _save_manifest(backups: Dict[str, Any]):
+    """Write the backup manifest; the caller holds the garden lock."""
+    content = json.dumps({"version": MANIFEST_VERSION, "backups": backups}, indent=1)
+    try:
+        # Rebuilt by verify if lost, so it is not fsynced
+        _write_file_atomically(MANIFEST_FILE, content.encode("utf-8"), "none")
+    except (IOError, OSError) as e:
+        print(f"[WARNING] Failed to save backup manifest: {e}")
+
+
+def _write_file_atomically(path: str, content: bytes, durability: str = "file",
+                           sync_dir: bool = True):
+    """
+    Write bytes to a temporary file and rename it into place.
+
+    Args:
+        path: File to replace
+        content: New file contents
+        durability: "none", "file" or "file+dir" (see config.DURABILITY_MODES)
+        sync_dir: Whether to sync the directory here (callers writing many
+            files into one directory can sync it once themselves)
+    """
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(content)
+        _sync_file(f, durability)
+    os.replace(temp_path, path)
+    if sync_dir:
+        _sync_directory(path, durability)
+
+
+def _sync_file(f, durability: str):
+    """Flush an open file and, unless durability is "none", fsync it to disk."""
+    f.flush()
+    if durability != "none":
+        os.fsync(f.fileno())
+
+
+def _sync_directory(path: str, durability: str):
+    """Fsync the directory holding `path` so renames into it survive a crash."""
+    if durability != "file+dir":
+        return
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return  # Directories cannot be opened for syncing on Windows
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_json_atomically(path: str, data: Any):
+    """
+    Replace a small JSON file (such as .hiddenBotanist) in one step.
+
+    The configured durability mode decides whether the file and its
+    directory are fsynced.
+
+    Raises:
+        IOError: If the file cannot be written
+    """
+    _write_file_atomically(path, json.dumps(data).encode("utf-8"), get_durability())
+
+
+def read_backup_bytes(filepath: str) -> bytes:
+    """
+    Read the original garden file contents stored in a backup.
+
+    Compressed backups are decompressed transparently, and chunked backups
+    are reassembled and checked against their SHA-256.
+
+    Raises:
+        IOError: If the backup or one of its chunks is missing or corrupt
+    """
+    content = _read_compressed(filepath)
+    if not filepath.endswith(".chunks"):
+        return content
+
+    try:
+        recipe = json.loads(content)
+        parts = []
+        for chunk_id in recipe["chunks"]:
+            chunk_path = _find_chunk(chunk_id)
+            if chunk_path is None:
+                raise IOError(f"missing chunk {chunk_id} for {filepath}")
+            parts.append(_read_compressed(chunk_path))
+    except (ValueError, KeyError, TypeError) as e:
+        raise IOError(f"unreadable backup recipe {filepath}: {e}")
+
+    content = b"".join(parts)
+    if hashlib.sha256(content).hexdigest() != recipe.get("sha256"):
+        raise IOError(f"checksum mismatch in {filepath}")
+    return content
+
+
+def _backup_time(filename: str, filepath: str) -> datetime.datetime:
+    """Parse a backup's creation time from its name, falling back to mtime."""
+    stamp = filename.split("_backup_", 1)[-1].split(".")[0]
+    for fmt in ("%Y%m%d_%H%M%S_%f", "%Y%m%d_%H%M%S"):
+        try:
+            return datetime.datetime.strptime(stamp, fmt)
+        except ValueError:
+            continue
+    return datetime.datetime.fromtimestamp(os.path.getmtime(filepath))
+
+
+def _backup_entries(prefix: Optional[str] = "garden_backup_") -> List[tuple]:
+    """
+    List backup files as (created, filepath, filename), newest first.
+
+    Args:
+        prefix: Only list backups of one source (see backup_prefix);
+                None lists the backups of every source
+
+    Raises:
+        OSError: If the backup directory cannot be listed
+    """
+    backup_files = []
+    for filename in os.listdir(BACKUP_DIR):
+        if prefix is None:
+            matches = "_backup_" in filename
+        else:
+            matches = filename.startswith(prefix)
+        if matches and filename.endswith(BACKUP_EXTENSIONS):
+            filepath = os.path.join(BACKUP_DIR, filename)
+            backup_files.append((_backup_time(filename, filepath), filepath, filename))
+
+    # Sort by creation time (newest first)
+    backup_files.sort(reverse=True)
+    return backup_files
+
+
+def cleanup_old_backups(prefix: str = "garden_backup_"):
+    """
+    Remove the backups of one source that the retention policy no longer keeps.
+
+    See _retention_plan for the grandfather-father-son policy; the counts
+    come from backup_retention in .botanist_config.json.
+    """
     if not os.path.exists(BACKUP_DIR):
         return
     
     try:
-        # Get all backup files
-        backup_files = []
-        for filename in os.listdir(BACKUP_DIR):
-            if filename.startswith("garden_backup_") and filename.endswith(".json"):
-                filepath = os.path.join(BACKUP_DIR, filename)
-                mtime = os.path.getmtime(filepath)
-                backup_files.append((mtime, filepath, filename))
-        
-        # Sort by modification time (newest first)
-        backup_files.sort(reverse=True)
-        
-        # Remove old backups beyond MAX_BACKUPS
-        for i, (mtime, filepath, filename) in enumerate(backup_files):
-            if i >= MAX_BACKUPS:
+        backup_files = _backup_entries(prefix)
+        kept = _retention_plan(backup_files, get_backup_retention())
+
+        manifest = _load_manifest()
+        removed = False
+        for created, filepath, filename in backup_files:
+            if filepath not in kept:
                 os.remove(filepath)
+                removed = manifest.pop(filename, None) is not None or removed
                 print(f"[CLEANUP] Removed old backup: {filename}")
+        if removed:
+            _save_manifest(manifest)
+
+        _remove_unused_chunks()
                 
     except OSError as e:
         print(f"[WARNING] Cleanup failed: {e}")
 
 
-def validate_garden_data(data: Dict[str, Any]) -> bool:
+def _retention_plan(backup_files: List[tuple], retention: Dict[str, int]) -> Dict[str, List[str]]:
+    """
+    Decide which backups of one source to keep.
+
+    The newest `recent` backups are kept, plus the newest backup of each of
+    the latest N hours, days, ISO weeks and months (N per generation), so
+    a busy day cannot push every older backup out.
+
+    Args:
+        backup_files: Entries from _backup_entries, newest first
+        retention: Counts per generation (see config.get_backup_retention)
+
+    Returns:
+        dict: Path of each kept backup -> generations keeping it
+    """
+    kept = {}
+    for created, filepath, filename in backup_files[:retention["recent"]]:
+        kept.setdefault(filepath, []).append("recent")
+
+    for generation, period_format in RETENTION_GENERATIONS:
+        periods = set()
+        for created, filepath, filename in backup_files:
+            period = created.strftime(period_format)
+            if period in periods:
+                continue
+            if len(periods) >= retention[generation]:
+                break
+            periods.add(period)
+            kept.setdefault(filepath, []).append(generation)
+    return kept
+
+
+def _remove_unused_chunks():
+    """Delete stored chunks that no remaining backup recipe refers to."""
+    if not os.path.exists(CHUNK_DIR):
+        return
+
+    # Chunks are shared between sources, so every source's recipes count
+    referenced = set()
+    for created, filepath, filename in _backup_entries(None):
+        if filename.endswith(".chunks"):
+            try:
+                with open(filepath, "r") as f:
+                    referenced.update(json.load(f)["chunks"])
+            except (IOError, ValueError, KeyError):
+                # Keep everything rather than risk deleting live chunks
+                return
+
+    for chunk_file in os.listdir(CHUNK_DIR):
+        if chunk_file.split(".")[0] not in referenced:
+            os.remove(os.path.join(CHUNK_DIR, chunk_file))
+
+
+def validate_garden_data(data: Dict[str, Any], validate_sessions: bool = True) -> bool:
     """
     Validate garden data structure to prevent corruption.
     
     Args:
         data: Garden data dictionary
+        validate_sessions: Check every session record as well. Callers pass
+                           False for data the validation watermark already
+                           vouches for.
         
     Returns:
         bool: True if data is valid, False otherwise
@@ -97,6 +575,9 @@ def validate_garden_data(data: Dict[str, Any]) -> bool:
     if not isinstance(data["current_streak"], (int, float)):
         data["current_streak"] = 0  # Fix invalid streak
     
+    if not validate_sessions:
+        return True
+
     # Validate each session
     valid_sessions = []
     for session in data["sessions"]:
@@ -134,12 +615,22 @@ def validate_session(session: Dict[str, Any]) -> bool:
     except ValueError:
         return False
     
-    # Validate start_time and end_time format
-    try:
-        datetime.datetime.strptime(session["start_time"], "%Y-%m-%d %H:%M:%S")
-        datetime.datetime.strptime(session["end_time"], "%Y-%m-%d %H:%M:%S") 
-    except ValueError:
+    # Records written with a checksum must still match it
+    if "crc" in session and session["crc"] != record_checksum(session):
         return False
+
+    # Validate start_time and end_time: epoch seconds (schema v2) or
+    # formatted strings (schema v1)
+    for field in ("start_time", "end_time"):
+        value = session[field]
+        if is_epoch(value):
+            if value < 0:
+                return False
+            continue
+        try:
+            datetime.datetime.strptime(value, TIME_FORMAT)
+        except (TypeError, ValueError):
+            return False
     
     # Validate duration is a number and positive
     if not isinstance(session["duration"], (int, float)) or session["duration"] < 0:
@@ -156,12 +647,125 @@ def validate_session(session: Dict[str, Any]) -> bool:
     return True
 
 
-def safe_write_garden(data: Dict[str, Any]) -> bool:
+def _file_signature(path: str) -> Optional[List[int]]:
+    """Identify a file's current contents by size, mtime and inode."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+
+
+def _load_watermark() -> Dict[str, Any]:
+    """
+    Load the validation watermark.
+
+    "garden" holds the signature of the last fully validated garden file and
+    "log" the id of the session log plus the byte offset up to which its
+    records have been validated. Anything unreadable means nothing is trusted.
+    """
+    try:
+        with open(VALIDATION_FILE, "r") as f:
+            watermark = json.load(f)
+        return watermark if isinstance(watermark, dict) else {}
+    except (IOError, ValueError):
+        return {}
+
+
+def _update_watermark(**entries):
+    """Record newly validated data in the watermark file."""
+    watermark = _load_watermark()
+    watermark.update(entries)
+    try:
+        # Only a cache: losing it after a crash just means revalidating
+        _write_file_atomically(VALIDATION_FILE, json.dumps(watermark).encode("utf-8"), "none")
+    except (IOError, OSError) as e:
+        print(f"[WARNING] Failed to save validation watermark: {e}")
+
+
+def reset_validation_watermark():
+    """Forget what has been validated so the next read checks every record."""
+    # The snapshot holds validated records too, so it is dropped with the watermark
+    for path in (VALIDATION_FILE, SNAPSHOT_FILE):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def record_checksum(session: Dict[str, Any]) -> int:
+    """CRC-32 of a session's compact JSON form, leaving out its own "crc" field."""
+    return zlib.crc32(_record_json(session).encode("utf-8"))
+
+
+def _record_json(session: Dict[str, Any]) -> str:
+    """Serialize a session without its "crc" field, keeping its key order."""
+    return json.dumps({key: value for key, value in session.items() if key != "crc"},
+                      separators=(",", ":"))
+
+
+def record_line(session: Dict[str, Any]) -> str:
+    """Serialize a session on one line with a freshly computed "crc" as its last field."""
+    text = _record_json(session)
+    return f'{text[:-1]},"crc":{record_checksum(session)}}}'
+
+
+def record_identity(session: Dict[str, Any]) -> tuple:
+    """
+    Identify a record by its session key and checksum.
+
+    A 32-bit checksum alone can collide between unrelated records, so
+    recovery never treats two records as the same without both matching.
+    """
+    return (session_key(session), record_checksum(session))
+
+
+def _damaged_line_identity(line: bytes) -> Optional[tuple]:
+    """
+    Read the identity of a record line that no longer parses.
+
+    Returns:
+        tuple: (session key, stored checksum), or None if the damage hit
+               the checksum, the date or the start time
+    """
+    crc = RECORD_CRC.search(line)
+    date = RECORD_DATE.search(line)
+    start = RECORD_START.search(line)
+    if not (crc and date and start):
+        return None
+    try:
+        key = session_key({"date": json.loads(date.group(1)), "start_time": json.loads(start.group(1))})
+    except (TypeError, ValueError):
+        return None
+    return (key, int(crc.group(1)))
+
+
+def _dump_store(data: Dict[str, Any]) -> bytes:
+    """
+    Serialize garden data with one session record per line.
+
+    Top-level fields come first (so read_garden_header stays cheap) and every
+    record carries its checksum, so a damaged byte only costs the one line
+    it falls on; see _salvage_store_file.
+    """
+    lines = ["{"]
+    for key, value in data.items():
+        if key != "sessions":
+            lines.append(f"  {json.dumps(key)}: {json.dumps(value)},")
+    lines.append('  "sessions": [')
+    records = ["    " + record_line(session) for session in data["sessions"]]
+    if records:
+        lines.append(",\n".join(records))
+    lines.append("  ]")
+    lines.append("}")
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def safe_write_garden(data: Dict[str, Any], snapshot: bool = False) -> bool:
     """
     Safely write garden data with backup and validation.
     
     Args:
         data: Garden data to write
+        snapshot: Also save the binary snapshot of the new file (compaction)
         
     Returns:
         bool: True if write was successful, False otherwise
@@ -171,20 +775,51 @@ def safe_write_garden(data: Dict[str, Any]) -> bool:
         print("[ERROR] Invalid garden data, write aborted!")
         return False
     
+    try:
+        # Hold the lock from backup to log removal so no append can slip
+        # between the fold and the removal of the log it folded
+        with garden_lock():
+            return _write_garden_locked(data, snapshot)
+    except TimeoutError as e:
+        print(f"[ERROR] {e}")
+        return False
+
+
+def _write_garden_locked(data: Dict[str, Any], snapshot: bool = False) -> bool:
+    """Back up and replace the garden file; the caller holds the garden lock."""
     # Create backup before writing
     create_backup()
-    
+
+    # Sessions still sitting in the log are part of `data` (it was read through
+    # safe_read_garden), so record how much of the log this write folds in.
+    payload = dict(data)
+    log_state = session_log_state()
+    if log_state is not None:
+        payload["folded_log"] = log_state
+
     # Write to temporary file first
+    durability = get_durability()
     temp_file = GARDEN_FILE + ".tmp"
     try:
-        with open(temp_file, "w") as f:
-            json.dump(data, f, indent=2)
-        
+        with open(temp_file, "wb") as f:
+            f.write(_dump_store(payload))
+            _sync_file(f, durability)
+
         # Atomically replace the original file
         if os.path.exists(temp_file):
-            shutil.move(temp_file, GARDEN_FILE)
+            os.replace(temp_file, GARDEN_FILE)
+            invalidate_results()
+            if log_state is not None:
+                # The garden file now holds every logged session
+                os.remove(SESSION_LOG_FILE)
+            _sync_directory(GARDEN_FILE, durability)
+            # Everything just written was validated above
+            signature = _file_signature(GARDEN_FILE)
+            _update_watermark(garden=signature)
+            if snapshot:
+                _write_snapshot(payload, signature)
             return True
-    except (IOError, json.JSONEncodeError) as e:
+    except (IOError, TypeError, ValueError) as e:
         print(f"[ERROR] Failed to write garden data: {e}")
         # Clean up temp file
         if os.path.exists(temp_file):
@@ -194,40 +829,402 @@ def safe_write_garden(data: Dict[str, Any]) -> bool:
     return False
 
 
+def safe_write_store_file(path: str, data: Dict[str, Any]) -> bool:
+    """
+    Back up and atomically replace a store file other than the garden file
+    (such as a month segment), honouring the durability setting.
+
+    The caller validates `data`.
+
+    Returns:
+        bool: True if write was successful, False otherwise
+    """
+    try:
+        with garden_lock():
+            create_backup(path)
+            _write_file_atomically(path, _dump_store(data), get_durability())
+            invalidate_results()
+            return True
+    except TimeoutError as e:
+        print(f"[ERROR] {e}")
+        return False
+    except (IOError, OSError, TypeError, ValueError) as e:
+        print(f"[ERROR] Failed to write {path}: {e}")
+        return False
+
+
 def safe_read_garden() -> Dict[str, Any]:
     """
     Safely read garden data with corruption recovery.
     
+    Sessions appended to the session log since the garden file was last
+    written are merged in, so callers always see the same dict view no
+    matter which storage backend recorded them.
+
     Returns:
         dict: Garden data or default structure if file is corrupted
     """
+    data = _read_garden_base()
+    folded_log = data.pop("folded_log", None)
+    data["sessions"].extend(read_session_log(folded_log))
+    return data
+
+
+def _read_garden_base() -> Dict[str, Any]:
+    """
+    Load the garden file contents, from its binary snapshot when it is current.
+
+    Parsing the garden file is only needed when it changed since the
+    snapshot was taken; the result is then snapshotted so the following
+    commands can skip it again. A read made under the garden lock is the
+    first half of a rewrite, so its result is not snapshotted.
+    """
+    signature = _file_signature(GARDEN_FILE)
+    if signature is None:
+        return _read_garden_file()
+
+    data = _load_snapshot(signature)
+    if data is not None:
+        return data
+
+    data = _read_garden_file()
+    # Only snapshot what was actually read: not a restored backup, and not
+    # a file another process replaced while we were parsing it
+    if not holds_lock(GARDEN_LOCK_FILE) and _file_signature(GARDEN_FILE) == signature:
+        _write_snapshot(data, signature)
+    return data
+
+
+def _write_snapshot(data: Dict[str, Any], signature: Optional[List[int]]):
+    """Save validated garden file contents as a snapshot tied to the file's signature."""
+    if signature is None:
+        return
+    body = marshal.dumps({"garden": signature, "data": data})
+    checksum = zlib.crc32(body).to_bytes(4, "big")
+    try:
+        # Only a cache of the garden file, so it is never fsynced
+        _write_file_atomically(SNAPSHOT_FILE, SNAPSHOT_MAGIC + checksum + body, "none")
+    except (IOError, OSError) as e:
+        print(f"[WARNING] Failed to save garden snapshot: {e}")
+
+
+def _load_snapshot(signature: Optional[List[int]]) -> Optional[Dict[str, Any]]:
+    """Load the snapshot if it is intact and was taken of the file with `signature`."""
+    try:
+        with open(SNAPSHOT_FILE, "rb") as f:
+            content = f.read()
+    except (IOError, OSError):
+        return None
+
+    header = len(SNAPSHOT_MAGIC)
+    body = content[header + 4:]
+    if (not content.startswith(SNAPSHOT_MAGIC)
+            or zlib.crc32(body).to_bytes(4, "big") != content[header:header + 4]):
+        return None
+    try:
+        snapshot = marshal.loads(body)
+    except (EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get("garden") != signature:
+        return None
+    return snapshot.get("data")
+
+
+def compact_session_log() -> int:
+    """
+    Fold the session log tail into the garden file and a fresh snapshot.
+
+    The fold goes through safe_write_garden, so it is crash-safe (see the
+    folded_log marker) and the previous garden file is backed up and
+    rotated like before any other write.
+
+    Returns:
+        int: Number of log records folded in, or -1 if the write failed
+    """
+    try:
+        with garden_lock():
+            log_state = session_log_state()
+            if log_state is None and (not os.path.exists(GARDEN_FILE) or
+                                      _load_snapshot(_file_signature(GARDEN_FILE)) is not None):
+                return 0  # No tail, and the snapshot is already current
+            if not safe_write_garden(safe_read_garden(), snapshot=True):
+                return -1
+            return log_state["records"] if log_state else 0
+    except TimeoutError as e:
+        print(f"[ERROR] {e}")
+        return -1
+
+
+def compaction_due() -> bool:
+    """Check whether the session log tail has passed a compaction threshold."""
+    max_records, max_bytes = get_compaction_thresholds()
+    try:
+        size = os.path.getsize(SESSION_LOG_FILE)
+    except OSError:
+        return False
+    if max_bytes and size >= max_bytes:
+        return True
+    # The tail is kept short by the thresholds, so counting it stays cheap
+    return bool(max_records) and session_log_state()["records"] >= max_records
+
+
+def _read_garden_file() -> Dict[str, Any]:
+    """
+    Read and validate the garden file itself, restoring from backup if needed.
+
+    Session records are only validated if the file changed since it was last
+    validated; a clean full validation moves the watermark forward.
+    """
     if not os.path.exists(GARDEN_FILE):
         # Return default structure
         return {
             "current_streak": 0,
             "sessions": []
         }
-    
+
     try:
+        signature = _file_signature(GARDEN_FILE)
+        trusted = _load_watermark().get("garden") == signature
         with open(GARDEN_FILE, "r") as f:
             data = json.load(f)
         
         # Validate the loaded data
-        if validate_garden_data(data):
+        stored = list(data.get("sessions", [])) if isinstance(data, dict) else []
+        if validate_garden_data(data, validate_sessions=not trusted):
+            if not trusted and len(data["sessions"]) < len(stored):
+                data = _repair_dropped_records(GARDEN_FILE, data, stored)
+            elif not trusted:
+                _update_watermark(garden=signature)
+            _strip_checksums(data["sessions"])
             return data
         else:
             print("[WARNING] Garden data validation failed!")
-            return try_restore_from_backup()
+            return recover_store_file(GARDEN_FILE)
             
     except (IOError, json.JSONDecodeError) as e:
         print(f"[ERROR] Failed to read garden data: {e}")
-        return try_restore_from_backup()
+        return recover_store_file(GARDEN_FILE)
+
+
+def _is_damaged(session: Any) -> bool:
+    """Check whether a parsed record no longer matches its own checksum."""
+    return isinstance(session, dict) and "crc" in session and session["crc"] != record_checksum(session)
+
+
+def _repair_dropped_records(source: str, data: Dict[str, Any],
+                            stored: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Put intact copies of checksum-damaged records back in place after validation.
+
+    Records dropped for failing their checksum are looked up in the backups;
+    records that were simply invalid stay dropped as before. If anything
+    was repaired the fixed data is written back to `source`.
+    """
+    kept = {id(session) for session in data["sessions"]}
+    entries = []
+    for session in stored:
+        if id(session) in kept:
+            entries.append(session)
+        elif _is_damaged(session):
+            entries.append((session_key(session), session["crc"]))
+    repaired = _fill_damaged_records(source, entries)
+    if len(repaired) > len(data["sessions"]):
+        data["sessions"] = repaired
+        _rewrite_store_file(source, data)
+    return data
+
+
+def _fill_damaged_records(source: str, entries: List[Any]) -> List[Dict[str, Any]]:
+    """
+    Replace checksum placeholders in `entries` with intact records from backups.
+
+    Args:
+        source: Store file the records belong to (selects its backups)
+        entries: Session dicts, plus the identity (session key, stored
+                 checksum) or None in place of each damaged record
+
+    Returns:
+        list: Sessions with damaged records repaired, or skipped if no
+              backup holds an intact copy with the same identity
+    """
+    wanted = {entry for entry in entries if isinstance(entry, tuple)}
+    damaged = sum(1 for entry in entries if not isinstance(entry, dict))
+    if not damaged:
+        return entries
+    found = _find_records_in_backups(source, wanted) if wanted else {}
+    sessions = []
+    for entry in entries:
+        if isinstance(entry, dict):
+            sessions.append(entry)
+        elif entry in found:
+            sessions.append(found[entry])
+    repaired = sum(1 for entry in entries if isinstance(entry, tuple) and entry in found)
+    print(f"[RECOVERY] {damaged} damaged session record(s) in {source}: "
+          f"{repaired} repaired from backups, {damaged - repaired} skipped")
+    return sessions
+
+
+def _find_records_in_backups(source: str, identities: set) -> Dict[tuple, Dict[str, Any]]:
+    """
+    Look up intact records by identity in a source's backups, newest known-good first.
+
+    Backups are searched as raw bytes for each record's checksum; only the
+    matching lines are parsed, never the whole backup. A line is only used
+    if it still matches its checksum and has the same session key, so a
+    checksum collision cannot substitute an unrelated record.
+    """
+    found = {}
+    if not os.path.exists(BACKUP_DIR):
+        return found
+    for filepath, filename, checksum in _restore_candidates(backup_prefix(source)):
+        try:
+            content = read_backup_bytes(filepath)
+        except IOError:
+            continue
+        for identity in identities - set(found):
+            token = b'"crc":%d}' % identity[1]
+            at = content.find(token)
+            while at >= 0:
+                start = content.rfind(b"\n", 0, at) + 1
+                try:
+                    session = json.loads(content[start:at + len(token)])
+                    if (isinstance(session, dict) and validate_session(session)
+                            and not _is_damaged(session) and record_identity(session) == identity):
+                        session.pop("crc")
+                        found[identity] = session
+                        break
+                except ValueError:
+                    pass
+                at = content.find(token, at + 1)
+        if len(found) == len(identities):
+            break
+    return found
 
 
-def try_restore_from_backup() -> Dict[str, Any]:
+def _salvage_store_file(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Recover what can be recovered from a store file that no longer parses.
+
+    Every intact record line is kept; damaged lines are repaired from backups
+    by their checksum where possible. Files in the older pretty-printed
+    layout (one field per line) cannot be salvaged line by line.
+
+    Returns:
+        dict: Salvaged garden data, or None if the layout is not salvageable
+    """
+    try:
+        with open(path, "rb") as f:
+            lines = f.read().split(b"\n")
+    except IOError:
+        return None
+
+    fields = {}
+    entries = []
+    in_sessions = False
+    found_sessions = False
+    closed = False
+    for raw_line in lines:
+        line = raw_line.strip().rstrip(b",")
+        if not in_sessions:
+            if line.startswith(b'"sessions"'):
+                in_sessions = found_sessions = True
+            elif line.startswith(b'"'):
+                try:
+                    fields.update(json.loads(b"{" + line + b"}"))
+                except ValueError:
+                    pass  # A damaged top-level field falls back to its default
+            continue
+        if line == b"]":
+            in_sessions = False
+            closed = True
+            continue
+        if line in (b"", b"}"):
+            continue
+        if line == b"{":
+            return None  # Pretty-printed records span several lines
+        try:
+            session = json.loads(line)
+        except ValueError:
+            session = None
+        if isinstance(session, dict) and validate_session(session):
+            entries.append(session)
+        else:
+            entries.append(_damaged_line_identity(line))
+
+    if not found_sessions:
+        return None
+    data = dict(fields)
+    sessions = _strip_checksums(_fill_damaged_records(path, entries))
+    if not closed:
+        # The file was cut short, so later records only survive in backups
+        sessions = _merge_with_backup(path, sessions)
+    data["sessions"] = sessions
+    validate_garden_data(data, validate_sessions=False)
+    return data
+
+
+def _merge_with_backup(path: str, sessions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Combine the newest good backup's records with salvaged records it does not have."""
+    try:
+        restored = _newest_good_backup(path) if os.path.exists(BACKUP_DIR) else None
+    except OSError:
+        restored = None
+    if restored is None:
+        return sessions
+    backup_sessions = restored[0]["sessions"]
+    known = {record_identity(session) for session in backup_sessions}
+    print(f"[RECOVERY] {path} was cut short; merging with backup {restored[1]}")
+    return backup_sessions + [session for session in sessions if record_identity(session) not in known]
+
+
+def recover_store_file(path: str = GARDEN_FILE) -> Dict[str, Any]:
+    """
+    Recover a store file that failed to parse or validate.
+
+    Intact records are salvaged in place, with damaged ones repaired from
+    backups, so sessions newer than the last backup survive. Whole-backup
+    restore is the fallback for files that cannot be salvaged.
+
+    Returns:
+        dict: Recovered data (default structure if nothing could be recovered)
+    """
+    data = _salvage_store_file(path)
+    if data is None or not data["sessions"]:
+        return try_restore_from_backup(path)
+    print(f"[RECOVERY] Salvaged {len(data['sessions'])} session(s) from {path}")
+    _rewrite_store_file(path, data)
+    return data
+
+
+def _rewrite_store_file(path: str, data: Dict[str, Any], backup: bool = True):
+    """
+    Replace a store file's contents as they are, without folding the log.
+
+    Used by recovery, which only ever rewrites the file it read.
+    """
+    try:
+        with garden_lock():
+            if backup:
+                create_backup(path)
+            _write_file_atomically(path, _dump_store(data), get_durability())
+            invalidate_results()
+            if path == GARDEN_FILE:
+                _update_watermark(garden=_file_signature(GARDEN_FILE))
+    except (IOError, OSError) as e:
+        print(f"[ERROR] Failed to write recovered data to {path}: {e}")
+
+
+def try_restore_from_backup(source: str = GARDEN_FILE) -> Dict[str, Any]:
     """
     Try to restore garden data from the most recent backup.
+
+    Backups the manifest records as valid are tried first, newest first, so
+    recovery normally reads a single backup. Backups the manifest does not
+    know about (e.g. written by older versions) are tried after those.
     
+    Args:
+        source: Store file to restore (the garden file or a segment)
+
     Returns:
         dict: Restored data or default structure if no valid backup
     """
@@ -236,39 +1233,71 @@ def try_restore_from_backup() -> Dict[str, Any]:
         return {"current_streak": 0, "sessions": []}
     
     try:
-        # Get all backup files
-        backup_files = []
-        for filename in os.listdir(BACKUP_DIR):
-            if filename.startswith("garden_backup_") and filename.endswith(".json"):
-                filepath = os.path.join(BACKUP_DIR, filename)
-                mtime = os.path.getmtime(filepath)
-                backup_files.append((mtime, filepath, filename))
-        
-        # Sort by modification time (newest first)
-        backup_files.sort(reverse=True)
-        
-        # Try to restore from each backup (newest first)
-        for mtime, filepath, filename in backup_files:
-            try:
-                with open(filepath, "r") as f:
-                    data = json.load(f)
-                
-                if validate_garden_data(data):
-                    print(f"[RECOVERY] Restored from backup: {filename}")
-                    # Write the recovered data back to main file
-                    with open(GARDEN_FILE, "w") as f:
-                        json.dump(data, f, indent=2)
-                    return data
-            except (IOError, json.JSONDecodeError):
-                continue  # Try next backup
-        
-        print("[ERROR] No valid backups found, using default structure")
-        return {"current_streak": 0, "sessions": []}
-        
+        restored = _newest_good_backup(source)
     except OSError as e:
         print(f"[ERROR] Backup recovery failed: {e}")
         return {"current_streak": 0, "sessions": []}
 
+    if restored is None:
+        print("[ERROR] No valid backups found, using default structure")
+        return {"current_streak": 0, "sessions": []}
+
+    data, filename = restored
+    print(f"[RECOVERY] Restored from backup: {filename}")
+    # Write the recovered data back to main file
+    _rewrite_store_file(source, data, backup=False)
+    return data
+
+
+def _newest_good_backup(source: str) -> Optional[tuple]:
+    """
+    Load the newest backup of a source that matches its checksum and validates.
+
+    Returns:
+        tuple: (data, backup file name), or None if no backup is usable
+
+    Raises:
+        OSError: If the backup directory cannot be listed
+    """
+    # Try each backup (newest known-good first)
+    for filepath, filename, checksum in _restore_candidates(backup_prefix(source)):
+        try:
+            content = read_backup_bytes(filepath)
+            if checksum is not None and hashlib.sha256(content).hexdigest() != checksum:
+                print(f"[WARNING] Backup {filename} does not match its checksum, skipping")
+                continue
+            data = json.loads(content)
+            if validate_garden_data(data):
+                _strip_checksums(data["sessions"])
+                return data, filename
+        except (IOError, ValueError):
+            continue  # Try next backup
+    return None
+
+
+def _strip_checksums(sessions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Drop the storage-level "crc" field from records once they have been checked."""
+    for session in sessions:
+        session.pop("crc", None)
+    return sessions
+
+
+def _restore_candidates(prefix: str):
+    """
+    Yield (filepath, filename, expected sha256 or None) of the backups of
+    one source in the order recovery should try them.
+    """
+    manifest = _load_manifest()
+    known_good = sorted(((entry.get("created", ""), filename) for filename, entry in manifest.items()
+                         if entry.get("source") == prefix and entry.get("valid")), reverse=True)
+    for created, filename in known_good:
+        yield os.path.join(BACKUP_DIR, filename), filename, manifest[filename].get("sha256")
+
+    # Only list the directory if no known-good backup could be restored
+    for created, filepath, filename in _backup_entries(prefix):
+        if filename not in manifest:
+            yield filepath, filename, None
+
 
 def append_session_only(new_session: Dict[str, Any]) -> bool:
     """
@@ -286,14 +1315,373 @@ def append_session_only(new_session: Dict[str, Any]) -> bool:
         print("[ERROR] Invalid session data, append aborted!")
         return False
     
-    # Read current data safely
-    garden_data = safe_read_garden()
-    
-    # Append the new session (never removes existing data)
-    garden_data["sessions"].append(new_session)
-    
-    # Write back safely
-    return safe_write_garden(garden_data)
+    try:
+        # Another process must not write between our read and our write,
+        # or one of the two sessions would be lost
+        with garden_lock():
+            # Read current data safely
+            garden_data = safe_read_garden()
+
+            # Append the new session (never removes existing data)
+            garden_data["sessions"].append(new_session)
+
+            # Write back safely
+            return safe_write_garden(garden_data)
+    except TimeoutError as e:
+        print(f"[ERROR] {e}")
+        return False
+
+
+def append_session_to_log(new_session: Dict[str, Any]) -> bool:
+    """
+    Append a new session as a single line of the session log.
+
+    The line is fsynced unless the durability setting is "none".
+
+    Existing records are never read or rewritten, so the cost of adding a
+    session does not grow with the size of the garden. safe_read_garden
+    merges the log back into the garden view.
+
+    Args:
+        new_session: Session dictionary to append
+
+    Returns:
+        bool: True if append was successful, False otherwise
+    """
+    if not validate_session(new_session):
+        print("[ERROR] Invalid session data, append aborted!")
+        return False
+
+    try:
+        with garden_lock():
+            lines = []
+            size_before = os.path.getsize(SESSION_LOG_FILE) if os.path.exists(SESSION_LOG_FILE) else 0
+            log_watermark = _load_watermark().get("log") or {}
+            if size_before == 0:
+                # Every log starts with a header so a later fold can identify it
+                log_watermark = {"id": uuid.uuid4().hex, "offset": 0}
+                lines.append(json.dumps({"log_id": log_watermark["id"]}))
+            elif not _ends_with_newline(SESSION_LOG_FILE):
+                # A previous append was torn by a crash; start on a fresh line
+                lines.append("")
+            lines.append(record_line(new_session))
+
+            durability = get_durability()
+            with open(SESSION_LOG_FILE, "a") as f:
+                f.write("\n".join(lines) + "\n")
+                _sync_file(f, durability)
+            invalidate_results()
+            if size_before == 0:
+                _sync_directory(SESSION_LOG_FILE, durability)
+
+            # The new record was validated above, so if everything before it
+            # was already validated the watermark can move past it as well
+            if log_watermark.get("offset") == size_before:
+                log_watermark["offset"] = os.path.getsize(SESSION_LOG_FILE)
+                _update_watermark(log=log_watermark)
+            return True
+    except TimeoutError as e:
+        print(f"[ERROR] {e}")
+        return False
+    except (IOError, OSError, TypeError, ValueError) as e:
+        print(f"[ERROR] Failed to append session to log: {e}")
+        return False
+
+
+def _ends_with_newline(path: str) -> bool:
+    """Check whether a non-empty file ends with a newline character."""
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def _iter_log_records():
+    """
+    Yield (log_id, line_number, line, end_offset) for each record line of the
+    session log, where end_offset is the byte offset just past the line.
+
+    The header line is consumed here; blank lines are skipped.
+    """
+    log_id = None
+    offset = 0
+    with open(SESSION_LOG_FILE, "rb") as f:
+        for line_number, raw_line in enumerate(f, 1):
+            offset += len(raw_line)
+            line = raw_line.strip()
+            if not line:
+                continue
+            if line_number == 1 and line.startswith(b'{"log_id"'):
+                try:
+                    log_id = json.loads(line)["log_id"]
+                    continue
+                except (ValueError, KeyError):
+                    pass
+            yield log_id, line_number, line, offset
+
+
+def session_log_state() -> Optional[Dict[str, Any]]:
+    """
+    Describe the current session log for folding into the garden file.
+
+    Returns:
+        dict: {"id": log id, "records": number of record lines}, or None
+              when there is no session log
+    """
+    if not os.path.exists(SESSION_LOG_FILE):
+        return None
+
+    with open(SESSION_LOG_FILE, "r") as f:
+        try:
+            log_id = json.loads(f.readline()).get("log_id")
+        except (json.JSONDecodeError, AttributeError):
+            log_id = None
+    records = sum(1 for _ in _iter_log_records())
+    return {"id": log_id, "records": records}
+
+
+def read_session_log(folded_log: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Read the valid sessions recorded in the session log.
+
+    Args:
+        folded_log: The "folded_log" marker from the garden file. If it names
+                    this log, its first N records are already in the garden
+                    file (a fold was interrupted before the log was removed)
+                    and are skipped.
+
+    Returns:
+        list: Session dictionaries in append order
+    """
+    return list(iter_session_log(folded_log))
+
+
+def iter_session_log(folded_log: Optional[Dict[str, Any]] = None):
+    """
+    Stream the valid sessions recorded in the session log, one line at a time.
+
+    Lines below the validation watermark are not validated again; after a
+    complete read the watermark moves to the end of the clean prefix.
+    See read_session_log for the meaning of `folded_log`.
+    """
+    if not os.path.exists(SESSION_LOG_FILE):
+        return
+
+    log_watermark = _load_watermark().get("log") or {}
+    current_id = None
+    clean = True  # No invalid session seen so far
+    clean_offset = 0  # End of the prefix that needs no validation next time
+    to_skip = 0
+    try:
+        for log_id, line_number, line, end_offset in _iter_log_records():
+            current_id = log_id
+            if folded_log and log_id is not None and log_id == folded_log.get("id"):
+                to_skip = folded_log.get("records", 0)
+                folded_log = None
+            if to_skip > 0:
+                to_skip -= 1
+                if clean:
+                    clean_offset = end_offset
+                continue
+
+            trusted = (log_id is not None and log_id == log_watermark.get("id")
+                       and end_offset <= log_watermark.get("offset", 0))
+            try:
+                session = json.loads(line)
+            except ValueError:
+                # Unreadable lines are skipped on every read anyway
+                print(f"[WARNING] Skipping unreadable session log line {line_number}")
+                if clean:
+                    clean_offset = end_offset
+                continue
+
+            if trusted or validate_session(session):
+                if clean:
+                    clean_offset = end_offset
+                session.pop("crc", None)
+                yield session
+            else:
+                clean = False
+                print(f"[WARNING] Skipping invalid session: {session}")
+    except IOError as e:
+        print(f"[ERROR] Failed to read session log: {e}")
+        return
+
+    if current_id is not None and (current_id != log_watermark.get("id")
+                                   or clean_offset > log_watermark.get("offset", 0)):
+        _update_watermark(log={"id": current_id, "offset": clean_offset})
+
+
+def _stream_garden_file(path: str):
+    """
+    Incrementally parse a garden file without loading it all into memory.
+
+    Yields ("session", None, record) for each element of the top-level
+    "sessions" array and ("field", key, value) for every other top-level
+    field, in file order. Only one record is buffered at a time.
+
+    Raises:
+        ValueError: If the file is not a well-formed garden object
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r") as f:
+        buf = ""
+        pos = 0
+        eof = False
+
+        def fill():
+            nonlocal buf, pos, eof
+            chunk = f.read(STREAM_READ_SIZE)
+            if not chunk:
+                eof = True
+            # Drop everything already consumed before growing the buffer
+            buf = buf[pos:] + chunk
+            pos = 0
+
+        def peek():
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in " \t\r\n":
+                    pos += 1
+                if pos < len(buf) or eof:
+                    return buf[pos:pos + 1]
+                fill()
+
+        def expect(char):
+            nonlocal pos
+            if peek() != char:
+                raise ValueError(f"expected '{char}' in {path}")
+            pos += 1
+
+        def value():
+            nonlocal pos
+            peek()
+            while True:
+                try:
+                    result, end = decoder.raw_decode(buf, pos)
+                    # A number at the end of the buffer may continue past it
+                    if end < len(buf) or eof:
+                        pos = end
+                        return result
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                fill()
+
+        expect("{")
+        while peek() != "}":
+            key = value()
+            if not isinstance(key, str):
+                raise ValueError(f"expected a field name in {path}")
+            expect(":")
+            if key == "sessions":
+                expect("[")
+                while peek() != "]":
+                    yield "session", None, value()
+                    if peek() == ",":
+                        pos += 1
+                    elif peek() != "]":
+                        raise ValueError(f"malformed sessions array in {path}")
+                expect("]")
+            else:
+                yield "field", key, value()
+            if peek() == ",":
+                pos += 1
+        expect("}")
+
+
+def read_garden_header() -> Dict[str, Any]:
+    """
+    Read the top-level garden fields stored ahead of the sessions array.
+
+    Writers keep small fields such as schema_version first, so this only
+    reads the start of the file however large the garden is.
+    """
+    fields = {}
+    if not os.path.exists(GARDEN_FILE):
+        return fields
+    try:
+        for kind, key, value in _stream_garden_file(GARDEN_FILE):
+            if kind == "session":
+                break
+            fields[key] = value
+    except (IOError, ValueError):
+        pass
+    return fields
+
+
+def iter_garden_sessions(fields: Optional[Dict[str, Any]] = None):
+    """
+    Stream valid sessions from the garden file followed by the session log.
+
+    This yields the same sessions, in the same order, as
+    safe_read_garden()["sessions"]. When the binary snapshot is current the
+    sessions come from it; otherwise the garden file is parsed keeping
+    only one record in memory. If the garden file turns out to be corrupt
+    part-way through, it is recovered (see recover_store_file) and the
+    stream continues from the recovered copy.
+
+    Args:
+        fields: Optional dict that receives the other top-level garden
+                fields (such as current_streak) as they are read
+    """
+    if fields is None:
+        fields = {}
+    fields.setdefault("current_streak", 0)
+
+    if os.path.exists(GARDEN_FILE):
+        signature = _file_signature(GARDEN_FILE)
+        data = _load_snapshot(signature)
+        if data is not None:
+            # Validated when the snapshot was taken, so no parsing at all
+            for key, value in data.items():
+                if key != "sessions":
+                    fields[key] = value
+            yield from data["sessions"]
+        else:
+            yield from _stream_garden_sessions(signature, fields)
+
+    for session in iter_session_log(fields.pop("folded_log", None)):
+        yield session
+
+
+def _stream_garden_sessions(signature: Optional[List[int]], fields: Dict[str, Any]):
+    """Stream and validate the sessions of the garden file, recovering it if it is corrupt."""
+    # Keys of the sessions already yielded, so a recovery part-way through
+    # resumes by identity (the recovered copy may hold fewer or other records)
+    yielded = Counter()
+    trusted = _load_watermark().get("garden") == signature
+    clean = True
+    try:
+        for kind, key, value in _stream_garden_file(GARDEN_FILE):
+            if kind == "field":
+                fields[key] = value
+            elif trusted or validate_session(value):
+                yielded[session_key(value)] += 1
+                value.pop("crc", None)
+                yield value
+            elif _is_damaged(value):
+                # Yield an intact copy from the backups if there is one
+                clean = False
+                for session in _fill_damaged_records(GARDEN_FILE, [(session_key(value), value["crc"])]):
+                    yielded[session_key(session)] += 1
+                    yield session
+            else:
+                clean = False
+                print(f"[WARNING] Skipping invalid session: {value}")
+        if clean and not trusted:
+            _update_watermark(garden=signature)
+    except (IOError, ValueError) as e:
+        print(f"[ERROR] Failed to read garden data: {e}")
+        data = recover_store_file(GARDEN_FILE)
+        for key, value in data.items():
+            if key != "sessions":
+                fields[key] = value
+        for session in data["sessions"]:
+            key = session_key(session)
+            if yielded[key]:
+                yielded[key] -= 1  # Streamed before the error
+            else:
+                yield session
 
 
 def list_backups():
@@ -303,57 +1691,199 @@ def list_backups():
         return
     
     try:
-        backup_files = []
-        for filename in os.listdir(BACKUP_DIR):
-            if filename.startswith("garden_backup_") and filename.endswith(".json"):
-                filepath = os.path.join(BACKUP_DIR, filename)
-                mtime = os.path.getmtime(filepath)
-                size = os.path.getsize(filepath)
-                backup_files.append((mtime, filepath, filename, size))
+        backup_files = _backup_entries(None)
         
         if not backup_files:
             print("No backup files found.")
             return
         
-        # Sort by modification time (newest first)
-        backup_files.sort(reverse=True)
-        
+        # Work out which generations keep each backup, per source
+        retention = get_backup_retention()
+        by_prefix = {}
+        for entry in backup_files:
+            by_prefix.setdefault(entry[2].split("_backup_")[0], []).append(entry)
+        kept = {}
+        for entries in by_prefix.values():
+            kept.update(_retention_plan(entries, retention))
+
+        manifest = _load_manifest()
         print("Available backups:")
-        for mtime, filepath, filename, size in backup_files:
-            timestamp = datetime.datetime.fromtimestamp(mtime)
-            print(f"  {filename} - {timestamp.strftime('%Y-%m-%d %H:%M:%S')} ({size} bytes)")
+        for created, filepath, filename in backup_files:
+            generations = ", ".join(kept.get(filepath, ["expiring"]))
+            print(f"  {filename} - {created.strftime('%Y-%m-%d %H:%M:%S')} "
+                  f"({_describe_backup_size(filepath, manifest.get(filename))}) [{generations}]")
             
     except OSError as e:
         print(f"Error listing backups: {e}")
 
 
+def _describe_backup_size(filepath: str, entry: Optional[Dict[str, Any]] = None) -> str:
+    """Describe how much data a backup holds and how much it added on disk."""
+    if entry is not None:
+        # Recorded in the manifest when the backup was written
+        description = f"{entry.get('sessions', 0)} sessions, {entry.get('size', 0)} bytes, " \
+                      f"{entry.get('stored_bytes', 0)} new"
+        if entry.get("linked"):
+            description += ", hard link"
+        if not entry.get("valid"):
+            description += ", INVALID"
+        return description
+    if not filepath.endswith(".chunks"):
+        return f"{os.path.getsize(filepath)} bytes"
+    try:
+        with open(filepath, "r") as f:
+            recipe = json.load(f)
+        return f"{recipe['size']} bytes, {recipe['stored_bytes']} new"
+    except (IOError, ValueError, KeyError):
+        return "unreadable recipe"
+
+
+def verify_backups():
+    """
+    Check that every backup can be read back (decompressing and reassembling
+    as needed) and still matches the checksum recorded in the manifest.
+
+    Backups are checked in parallel in a process pool. Backups missing from
+    the manifest are validated as garden data and added to it, and the
+    manifest's validation status is updated with the results, so recovery
+    skips backups found broken here.
+
+    Returns:
+        tuple: (number of readable backups, number of broken backups)
+    """
+    if not os.path.exists(BACKUP_DIR):
+        return 0, 0
+    report = _check_backups()
+    _print_backup_report(report)
+    return report["readable"], len(report["broken"])
+
+
+def _check_backups() -> Dict[str, Any]:
+    """
+    Check every backup and record the results in the manifest (see verify_backups).
+
+    Returns:
+        dict: {"readable": int, "broken": [backup file names]}
+    """
+    backup_files = _backup_entries(None)
+    manifest = _load_manifest()
+    paths = [filepath for created, filepath, filename in backup_files]
+    checksums = [manifest.get(filename, {}).get("sha256") for created, filepath, filename in backup_files]
+    results = _map_in_processes(check_backup, paths, checksums)
+
+    readable, broken = 0, []
+    checked = {}
+    for (created, filepath, filename), result in zip(backup_files, results):
+        entry = manifest.get(filename) or {"source": filename.split("_backup_")[0] + "_backup_",
+                                           "created": created.strftime("%Y%m%d_%H%M%S_%f"),
+                                           "stored_bytes": os.path.getsize(filepath)}
+        checked[filename] = dict(entry, **result)
+        if result["valid"]:
+            readable += 1
+        else:
+            broken.append(filename)
+
+    try:
+        # Reload under the lock so backups written meanwhile stay recorded
+        with garden_lock():
+            manifest = _load_manifest()
+            manifest.update(checked)
+            _save_manifest({name: entry for name, entry in manifest.items()
+                            if os.path.exists(os.path.join(BACKUP_DIR, name))})
+    except TimeoutError as e:
+        print(f"[WARNING] Backup manifest not updated: {e}")
+
+    return {"readable": readable, "broken": broken}
+
+
+def _print_backup_report(report: Dict[str, Any]):
+    """Print the outcome of _check_backups."""
+    for filename in report["broken"]:
+        print(f"  Warning: backup {filename} is unreadable or invalid")
+    print(f"  Backups: {report['readable']} readable, {len(report['broken'])} broken")
+
+
+def check_backup(filepath: str, checksum: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Read back one backup and describe it for the manifest.
+
+    Args:
+        filepath: Backup file
+        checksum: Expected SHA-256 of the original contents, if known
+
+    Returns:
+        dict: Manifest fields; "valid" is False if the backup is unreadable,
+              does not match `checksum` or does not hold garden data
+    """
+    try:
+        content = read_backup_bytes(filepath)
+    except IOError:
+        return {"valid": False}
+    if checksum is not None and hashlib.sha256(content).hexdigest() != checksum:
+        return {"valid": False}
+    return _describe_backup_content(content)
+
+
+def _map_in_processes(function, *iterables) -> List[Any]:
+    """Map a function over arguments in a process pool, serially if no pool can start."""
+    jobs = list(zip(*iterables))
+    workers = min(len(jobs), os.cpu_count() or 1)
+    if workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(function, *zip(*jobs), chunksize=max(1, len(jobs) // (workers * 4))))
+        except (OSError, BrokenProcessPool, NotImplementedError):
+            pass  # e.g. no semaphores in this sandbox; check serially instead
+    return [function(*job) for job in jobs]
+
+
 def verify_data_integrity():
-    """Verify the integrity of the current garden data."""
+    """
+    Verify the integrity of the garden in the active storage backend.
+
+    Unlike normal reads this always re-validates every record, ignoring the
+    validation watermark and the snapshot. It is never cached: damage that
+    leaves a file's size and modification time unchanged must still show.
+    """
+    from . import garden  # garden imports this module
     try:
-        data = safe_read_garden()
-        session_count = len(data.get("sessions", []))
-        streak = data.get("current_streak", 0)
-        
+        report = _integrity_report()
+        streaks = garden.get_streaks()
+
         print("Data Integrity Report:")
-        print(f"  Sessions: {session_count}")
-        print(f"  Streak: {streak}")
+        print(f"  Sessions: {report['sessions']}")
+        print(f"  Streak: {streaks['current']} day(s) (longest {streaks['longest']})")
         print(f"  Status: ✅ Valid")
         
-        # Check for duplicates
-        dates_and_times = []
-        duplicates = 0
-        for session in data["sessions"]:
-            key = (session.get("date", ""), session.get("start_time", ""))
-            if key in dates_and_times:
-                duplicates += 1
-            else:
-                dates_and_times.append(key)
-        
-        if duplicates > 0:
-            print(f"  Warning: {duplicates} potential duplicate sessions found")
+        if report["duplicates"] > 0:
+            print(f"  Warning: {report['duplicates']} potential duplicate sessions found "
+                  f"(run 'dedupe' to merge them)")
+
+        if report["backups"] is not None:
+            _print_backup_report(report["backups"])
         
         return True
         
     except Exception as e:
         print(f"Data integrity check failed: {e}")
-        return False
\ No newline at end of file
+        return False
+
+
+def _integrity_report() -> Dict[str, Any]:
+    """Re-validate the active store and every backup for verify_data_integrity."""
+    from . import garden  # garden imports this module
+    reset_validation_watermark()
+    # Stream the sessions so memory stays flat however long the history
+    session_count = 0
+    seen = set()
+    duplicates = 0
+    for session in garden.iter_sessions():
+        session_count += 1
+        # Check for duplicates
+        key = session_key(session)
+        if key in seen:
+            duplicates += 1
+        else:
+            seen.add(key)
+    return {"sessions": session_count, "duplicates": duplicates,
+            "backups": _check_backups() if os.path.exists(BACKUP_DIR) else None}
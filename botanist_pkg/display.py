@@ -2,6 +2,8 @@
 Display utilities for Botanist ASCII art and formatting.
 """
 
+from .flowers import get_flower_art
+
 SESSION_STARTED = """
  ____  _____ ____  ____  _  ___  _   _
 / ___|| ____/ ___|| ___|| |/ _ \| \ | |
@@ -45,7 +47,8 @@ def print_session_finished(duration_minutes):
 
 
 def print_box(flower):
-    """Print a flower surrounded by a decorative box"""
+    """Print a flower (registry key or ASCII art) surrounded by a decorative box"""
+    flower = get_flower_art(flower)
     # split the flower into strings
     split_flower = flower.split("\n")
     # create empty array
@@ -256,7 +256,68 @@ QUEEN_OF_THE_NIGHT = """     .***.
  ═══════════════"""
 
 
-def assign_flower(duration, streak=0):
+# Registry of every flower by a stable key. Session records store the key
+# rather than the art itself; keys must never be renamed once released.
+FLOWERS = {
+    "seedling": SEEDLING,
+    "bud": BUD,
+    "bloom": BLOOM,
+    "full_bloom": FULL_BLOOM,
+    "lotus_small": LOTUS_SMALL,
+    "lotus_medium": LOTUS_MEDIUM,
+    "lotus_large": LOTUS_LARGE,
+    "chrysanthemum": CHRYSANTHEMUM,
+    "plum_blossom": PLUM_BLOSSOM,
+    "cherry_blossom": CHERRY_BLOSSOM,
+    "orchid": ORCHID,
+    "peony": PEONY,
+    "bamboo_flower": BAMBOO_FLOWER,
+    "mandala_flower": MANDALA_FLOWER,
+    "crystal_bloom": CRYSTAL_BLOOM,
+    "geometric_rose": GEOMETRIC_ROSE,
+    "starburst": STARBURST,
+    "phoenix_feather": PHOENIX_FEATHER,
+    "dragon_scale": DRAGON_SCALE,
+    "celestial_lotus": CELESTIAL_LOTUS,
+    "infinity_bloom": INFINITY_BLOOM,
+    "world_tree": WORLD_TREE,
+    "cosmic_flower": COSMIC_FLOWER,
+    "eternal_flame": ETERNAL_FLAME,
+    "universe_garden": UNIVERSE_GARDEN,
+    "queen_of_the_night": QUEEN_OF_THE_NIGHT,
+}
+
+# Reverse lookup used to migrate records that embed the full art
+_FLOWER_KEYS_BY_ART = {art: key for key, art in FLOWERS.items()}
+
+
+def get_flower_art(flower):
+    """
+    Resolve a stored flower to its ASCII art.
+
+    Args:
+        flower (str): Registry key, or the full art from older garden files
+
+    Returns:
+        str: ASCII art for the flower
+    """
+    return FLOWERS.get(flower, flower)
+
+
+def intern_flower(flower):
+    """
+    Convert embedded flower art to its registry key.
+
+    Args:
+        flower (str): Registry key or ASCII art
+
+    Returns:
+        str: Registry key if the art is known, otherwise the value unchanged
+    """
+    return _FLOWER_KEYS_BY_ART.get(flower, flower)
+
+
+def assign_flower_key(duration, streak=0):
     """
     Assign flower based on session duration with artistic progression.
     Longer sessions earn more elaborate and rare flowers.
@@ -266,68 +327,82 @@ def assign_flower(duration, streak=0):
         streak (int): Current streak (for future use)
         
     Returns:
-        str: ASCII art flower appropriate for the session duration
+        str: Registry key of the flower appropriate for the session duration
     """
     thresholds = get_time_thresholds()
     minutes = duration / 60
     
     # Basic flowers (short sessions)
     if duration < thresholds["seedling"]:  # < 25 min
-        return SEEDLING
+        return "seedling"
     elif duration < thresholds["bud"]:     # 25-45 min
-        return BUD
+        return "bud"
     elif duration < thresholds["bloom"]:   # 45-60 min
-        return BLOOM
+        return "bloom"
     
     # Medium sessions (60-90 min) - Traditional Eastern flowers
     elif minutes < 90:
         eastern_flowers = [
-            LOTUS_SMALL,
-            LOTUS_MEDIUM, 
-            CHRYSANTHEMUM,
-            PLUM_BLOSSOM,
-            CHERRY_BLOSSOM,
-            ORCHID,
-            PEONY,
-            BAMBOO_FLOWER
+            "lotus_small",
+            "lotus_medium",
+            "chrysanthemum",
+            "plum_blossom",
+            "cherry_blossom",
+            "orchid",
+            "peony",
+            "bamboo_flower"
         ]
         return random.choice(eastern_flowers)
     
     # Advanced sessions (90-120 min) - Artistic and geometric flowers  
     elif duration < thresholds["queen"]:   # 90-120 min
         advanced_flowers = [
-            LOTUS_LARGE,
-            MANDALA_FLOWER,
-            CRYSTAL_BLOOM, 
-            GEOMETRIC_ROSE,
-            STARBURST,
-            FULL_BLOOM
+            "lotus_large",
+            "mandala_flower",
+            "crystal_bloom",
+            "geometric_rose",
+            "starburst",
+            "full_bloom"
         ]
         return random.choice(advanced_flowers)
     
     # Long sessions (120-150 min) - Rare mystical flowers
     elif minutes < 150:
         rare_flowers = [
-            PHOENIX_FEATHER,
-            DRAGON_SCALE,
-            CELESTIAL_LOTUS,
-            INFINITY_BLOOM,
-            QUEEN_OF_THE_NIGHT
+            "phoenix_feather",
+            "dragon_scale",
+            "celestial_lotus",
+            "infinity_bloom",
+            "queen_of_the_night"
         ]
         return random.choice(rare_flowers)
     
     # Very long sessions (150-180 min) - Legendary flowers
     elif minutes < 180:
         legendary_flowers = [
-            WORLD_TREE,
-            COSMIC_FLOWER,
-            ETERNAL_FLAME
+            "world_tree",
+            "cosmic_flower",
+            "eternal_flame"
         ]
         return random.choice(legendary_flowers)
     
     # Ultimate sessions (180+ min / 3+ hours) - Universe Garden
     else:
-        return UNIVERSE_GARDEN
+        return "universe_garden"
+
+
+def assign_flower(duration, streak=0):
+    """
+    Assign flower art based on session duration.
+
+    Args:
+        duration (float): Session duration in seconds
+        streak (int): Current streak (for future use)
+
+    Returns:
+        str: ASCII art flower appropriate for the session duration
+    """
+    return FLOWERS[assign_flower_key(duration, streak)]
 
 
 def assign_flower_weighted(duration, session_number=0):
@@ -3,47 +3,555 @@ Garden data management for Botanist.
 """
 
 import os
-import json
 import csv
-from .data_protection import safe_read_garden, safe_write_garden, append_session_only
+import datetime
+import sqlite3
+from collections import defaultdict
+from . import search_index, sqlite_store, sharded_store, time_index
+from .rollups import (load_rollups, save_rollups, build_rollups, add_to_rollups,
+                      advance_streak, streak_as_of)
+from .config import get_storage_backend
+from .flowers import intern_flower
+from .locking import garden_lock
+from .result_cache import file_key
+from .schema import SCHEMA_VERSION, garden_version, convert_session, format_time, session_key
+from .data_protection import (safe_read_garden, safe_write_garden, append_session_only,
+                              append_session_to_log, iter_garden_sessions, read_garden_header,
+                              compact_session_log, compaction_due,
+                              GARDEN_FILE, SESSION_LOG_FILE)
 
 
 def open_or_create_garden():
     """Load existing garden data or create a new garden file using safe operations"""
+    backend = get_storage_backend()
+    if backend == "sqlite":
+        return sqlite_store.read_garden()
+    if backend == "sharded":
+        return sharded_store.read_garden()
     return safe_read_garden()
 
 
 def save_garden_safely(garden_data):
     """Save garden data using safe write operations with backup"""
+    backend = get_storage_backend()
+    if backend == "sqlite":
+        return sqlite_store.write_garden(garden_data)
+    if backend == "sharded":
+        return sharded_store.write_garden(garden_data)
     return safe_write_garden(garden_data)
 
 
 def add_session_safely(new_session):
     """Add a new session using append-only operation (safest method)"""
-    return append_session_only(new_session)
-
-
-def export_garden_to_csv():
-    """Export garden data to CSV format"""
-    if os.path.exists(".hiddenGarden.json"):
-        with open(".hiddenGarden.json", "r") as file:
-            gardenInfo = json.load(file)
-            # create output file
-            with open("exportedGarden.csv", "w") as output:
-                # create writer object
-                writer = csv.writer(output)
-                # create headers
-                writer.writerow(["date", "start_time", "end_time", "duration_minutes", "description"])
-                for session in gardenInfo["sessions"]:
-                    start_time = session.get("start_time", "N/A")
-                    end_time = session.get("end_time", "N/A")
-                    writer.writerow([
-                        session["date"], 
-                        start_time,
-                        end_time,
-                        round(session["duration"] / 60), 
-                        session["description"]
-                    ])
-        print(f"Exported {len(gardenInfo['sessions'])} sessions to exportedGarden.csv")
+    try:
+        # One lock covers the store and the rollup index, so concurrent
+        # finishes from other terminals are applied one after the other
+        with garden_lock():
+            # Write the record in the schema version the garden declares
+            new_session = convert_session(new_session, get_schema_version())
+            stamp_before = store_stamp()
+            backend = get_storage_backend()
+            if backend == "sqlite":
+                saved = sqlite_store.append_session(new_session)
+            elif backend == "sharded":
+                # Only the session's month segment is rewritten and backed up
+                saved = sharded_store.append_session(new_session)
+            elif backend == "jsonl":
+                # O(1): one appended line, existing records are left untouched
+                saved = append_session_to_log(new_session)
+            else:
+                saved = append_session_only(new_session)
+
+            if saved:
+                _update_rollups(new_session, stamp_before)
+                _update_time_index(new_session, stamp_before)
+                _update_search_index(new_session, stamp_before)
+                if backend == "jsonl" and compaction_due():
+                    compact_garden()
+            return saved
+    except TimeoutError as e:
+        print(f"[ERROR] {e}")
+        return False
+
+
+def get_schema_version():
+    """Get the schema version declared by the garden (1 if it declares none)."""
+    return garden_version(read_garden_fields())
+
+
+def read_garden_fields():
+    """
+    Get the top-level garden fields (current_streak, schema_version, ...)
+    without loading any sessions.
+    """
+    backend = get_storage_backend()
+    if backend == "sqlite":
+        return sqlite_store.read_meta()
+    if backend == "sharded":
+        return sharded_store.read_meta()
+    return read_garden_header()
+
+
+def compact_garden():
+    """
+    Fold the session log into the garden file and its binary snapshot.
+
+    Runs automatically once the log passes the configured thresholds; the
+    `compact` command runs it on demand.
+
+    Returns:
+        int: Number of log records folded in, or -1 on failure
+    """
+    try:
+        with garden_lock():
+            stamp_before = store_stamp()
+            folded = compact_session_log()
+            if folded > 0:
+                _restamp_rollups(stamp_before)
+            return folded
+    except TimeoutError as e:
+        print(f"[ERROR] {e}")
+        return -1
+
+
+def store_stamp():
+    """
+    Describe the current state of the session store by its files' size,
+    modification time and inode.
+
+    Derived indexes record the stamp they were built from; any write that
+    does not go through add_session_safely changes the stamp and so forces
+    those indexes to be rebuilt.
+    """
+    backend = get_storage_backend()
+    if backend == "sqlite":
+        paths = [sqlite_store.DB_FILE]
+    elif backend == "sharded":
+        paths = sharded_store.store_files()
+    else:
+        paths = [GARDEN_FILE, SESSION_LOG_FILE]
+    return [backend] + file_key(paths)
+
+
+def _update_rollups(new_session, stamp_before):
+    """Fold a just-saved session into the rollup index."""
+    rollups = load_rollups()
+    if rollups is None or rollups["stamp"] != stamp_before:
+        # The index was already out of date; rebuild it including the new session
+        rebuild_rollups()
+        return
+    new_day = new_session["date"] not in rollups["days"]
+    add_to_rollups(rollups, new_session["date"], new_session["duration"])
+    if new_day:
+        advance_streak(rollups, new_session["date"])
+    rollups["stamp"] = store_stamp()
+    save_rollups(rollups)
+
+
+def _restamp_rollups(stamp_before):
+    """Keep the derived indexes after a write that moved sessions without changing them."""
+    stamp = store_stamp()
+    rollups = load_rollups()
+    if rollups is not None and rollups["stamp"] == stamp_before:
+        rollups["stamp"] = stamp
+        save_rollups(rollups)
+    for index, name in ((time_index, "time index"), (search_index, "search index")):
+        if os.path.exists(index.INDEX_FILE):
+            try:
+                conn = index.connect()
+                try:
+                    index.restamp(conn, stamp_before, stamp)
+                finally:
+                    conn.close()
+            except sqlite3.Error as e:
+                print(f"[WARNING] Failed to update {name}: {e}")
+
+
+def rebuild_rollups():
+    """
+    Rebuild the per-day and per-week rollup index from the garden.
+
+    Returns:
+        dict: The new rollup index
+    """
+    stamp = store_stamp()
+    if get_storage_backend() == "sqlite":
+        totals = sqlite_store.daily_totals()
+    else:
+        totals = summarize_by_day(iter_sessions())
+    rollups = build_rollups(totals, stamp)
+    try:
+        with garden_lock():
+            save_rollups(rollups)
+    except TimeoutError:
+        pass  # The index is only a cache; the next read rebuilds it
+    return rollups
+
+
+def get_rollups():
+    """Load the rollup index, rebuilding it if the store changed behind its back."""
+    rollups = load_rollups()
+    if rollups is None or rollups["stamp"] != store_stamp():
+        rollups = rebuild_rollups()
+    return rollups
+
+
+def _update_time_index(new_session, stamp_before):
+    """Insert a just-saved session into the time index (one row, not a rewrite)."""
+    if get_storage_backend() == "sqlite" or not os.path.exists(time_index.INDEX_FILE):
+        # SQLite answers date windows from its own index; otherwise the
+        # first query builds the index, which then includes the new session
+        return
+    try:
+        conn = time_index.connect()
+        try:
+            # A stale index is left for the next query to rebuild
+            time_index.add_to_index(conn, new_session, stamp_before, store_stamp())
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"[WARNING] Failed to update time index: {e}")
+
+
+def rebuild_time_index():
+    """
+    Rebuild the sorted time index from the garden.
+
+    Returns:
+        int: Number of sessions indexed
+    """
+    # Taken before reading, so a write during the rebuild leaves the index stale
+    stamp = store_stamp()
+    conn = time_index.connect()
+    try:
+        return time_index.build_index(conn, iter_sessions(), stamp)
+    finally:
+        conn.close()
+
+
+def _update_search_index(new_session, stamp_before):
+    """Add a just-saved session to the description search index."""
+    if not os.path.exists(search_index.INDEX_FILE):
+        return  # Built by the first search, which then includes the new session
+    try:
+        conn = search_index.connect()
+        try:
+            # A stale index is left for the next search to rebuild
+            search_index.add_to_index(conn, new_session, stamp_before, store_stamp())
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"[WARNING] Failed to update search index: {e}")
+
+
+def rebuild_search_index():
+    """
+    Rebuild the description search index from the garden.
+
+    Returns:
+        int: Number of sessions indexed
+    """
+    # Taken before reading, so a write during the rebuild leaves the index stale
+    stamp = store_stamp()
+    conn = search_index.connect()
+    try:
+        return search_index.build_index(conn, iter_sessions(), stamp)
+    finally:
+        conn.close()
+
+
+def search_sessions(terms, since=None, until=None):
+    """
+    Find sessions whose description matches a query.
+
+    Adjacent terms must all appear in the description (as whole words,
+    ignoring case); an upper-case OR separates alternatives. Only the
+    posting lists of the query's words are read from the search index.
+
+    Args:
+        terms (list): Query words, e.g. ["python", "OR", "rust"]
+        since (str|date): First date (YYYY-MM-DD) to include, None for no lower bound
+        until (str|date): Last date (YYYY-MM-DD) to include, None for no upper bound
+
+    Returns:
+        list: Matching sessions ({"date", "start_time", "duration",
+              "description"}) ordered by date and start time
+    """
+    groups = search_index.parse_query(terms)
+    conn = search_index.connect()
+    try:
+        stamp = store_stamp()
+        if search_index.load_stamp(conn) != stamp:
+            search_index.build_index(conn, iter_sessions(), stamp)
+        return search_index.lookup(conn, groups, _date_key(since), _date_key(until))
+    finally:
+        conn.close()
+
+
+def get_streaks(today=None):
+    """
+    Get the current and longest streak of consecutive active days.
+
+    Read from the streak state kept in the rollup index, so no sessions
+    are scanned.
+
+    Args:
+        today (date): Day to judge the current streak on, today if None
+
+    Returns:
+        dict: {"current": int, "longest": int, "last_date": str or None}
+    """
+    return streak_as_of(get_rollups()["streak"], today or datetime.date.today())
+
+
+def iter_sessions(since=None, until=None):
+    """
+    Stream sessions from disk without building the whole garden in memory.
+
+    Args:
+        since (str|date): First date (YYYY-MM-DD) to include, None for no lower bound
+        until (str|date): Last date (YYYY-MM-DD) to include, None for no upper bound
+
+    Yields:
+        dict: Valid session dictionaries in recorded order
+    """
+    since = _date_key(since)
+    until = _date_key(until)
+    backend = get_storage_backend()
+    if backend == "sqlite":
+        yield from sqlite_store.iter_sessions(since, until)
+        return
+    if backend == "sharded":
+        yield from sharded_store.iter_sessions(since, until)
+        return
+    for s in iter_garden_sessions():
+        if (since is None or s["date"] >= since) and (until is None or s["date"] <= until):
+            yield s
+
+
+def _date_key(value):
+    """Normalise a date bound to the YYYY-MM-DD form stored in sessions."""
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.strftime("%Y-%m-%d")
+    return value
+
+
+def sessions_between(start_date=None, end_date=None):
+    """
+    Get the sessions whose date falls within [start_date, end_date].
+
+    Answered with a range scan of the time index (or of the date index of
+    the SQLite backend), so the cost is O(log N + k) for k matches.
+
+    Args:
+        start_date (str|date): First date (YYYY-MM-DD) to include, None for no lower bound
+        end_date (str|date): Last date (YYYY-MM-DD) to include, None for no upper bound
+
+    Returns:
+        list: Matching session dictionaries ordered by date and start time
+    """
+    start_date = _date_key(start_date)
+    end_date = _date_key(end_date)
+    if get_storage_backend() == "sqlite":
+        return sqlite_store.sessions_between(start_date, end_date)
+    conn = time_index.connect()
+    try:
+        stamp = store_stamp()
+        if time_index.load_stamp(conn) != stamp:
+            time_index.build_index(conn, iter_sessions(), stamp)
+        return time_index.window(conn, start_date, end_date)
+    finally:
+        conn.close()
+
+
+def daily_totals(start_date=None, end_date=None):
+    """
+    Sum focus time and count sessions per day within [start_date, end_date].
+
+    Answered from the rollup index. When both bounds are given only the days
+    in between are looked up, so the cost does not depend on history length.
+
+    Returns:
+        dict: {"YYYY-MM-DD": {"seconds": float, "sessions": int}} for days with sessions
+    """
+    start_date = _date_key(start_date)
+    end_date = _date_key(end_date)
+    days = get_rollups()["days"]
+
+    if start_date is not None and end_date is not None:
+        keys = []
+        current = datetime.datetime.strptime(start_date, "%Y-%m-%d").date()
+        last = datetime.datetime.strptime(end_date, "%Y-%m-%d").date()
+        while current <= last:
+            keys.append(current.strftime("%Y-%m-%d"))
+            current += datetime.timedelta(days=1)
+    else:
+        keys = [key for key in sorted(days)
+                if (start_date is None or key >= start_date)
+                and (end_date is None or key <= end_date)]
+
+    return {key: {"seconds": days[key][0], "sessions": days[key][1]}
+            for key in keys if key in days}
+
+
+def summarize_by_day(sessions):
+    """Sum focus seconds and count sessions per date for any iterable of sessions."""
+    totals = defaultdict(lambda: {"seconds": 0.0, "sessions": 0})
+    for s in sessions:
+        day = totals[s.get("date", "")]
+        day["seconds"] += s.get("duration", 0)
+        day["sessions"] += 1
+    return dict(totals)
+
+
+def migrate_garden():
+    """
+    Upgrade an existing garden to the current record format.
+
+    Sessions written by older versions embed the full flower art; these are
+    replaced with flower registry keys. Version 1 time strings are converted
+    to schema version 2 epoch seconds. The garden is only rewritten (with a
+    backup) if something changed.
+
+    Returns:
+        int: Number of sessions converted, or -1 if the garden could not be locked or written
+    """
+    try:
+        with garden_lock():
+            return _migrate_garden_locked()
+    except TimeoutError as e:
+        print(f"[ERROR] {e}")
+        return -1
+
+
+def _migrate_garden_locked():
+    """Convert and rewrite the garden; the caller holds the garden lock."""
+    garden_data = open_or_create_garden()
+    converted = 0
+    for index, session in enumerate(garden_data["sessions"]):
+        upgraded = convert_session(session, SCHEMA_VERSION)
+        upgraded["flower"] = intern_flower(session.get("flower"))
+        if upgraded != session:
+            garden_data["sessions"][index] = upgraded
+            converted += 1
+
+    if converted or garden_version(garden_data) != SCHEMA_VERSION:
+        # schema_version goes first so read_garden_header finds it cheaply
+        garden_data = dict({"schema_version": SCHEMA_VERSION},
+                           **{key: value for key, value in garden_data.items()
+                              if key != "schema_version"})
+        if not save_garden_safely(garden_data):
+            return -1
+    return converted
+
+
+def merge_duplicate_sessions(sessions):
+    """
+    Collapse sessions that share a date and start time into one record each.
+
+    Duplicates are found in one pass with a hash index on session_key. The
+    merged record takes the times, duration and flower of the longest copy
+    and the distinct descriptions of all copies, and stays at the position
+    of the first copy.
+
+    Args:
+        sessions (list): Session dictionaries in stored order
+
+    Returns:
+        tuple: (deduplicated sessions, list of (merged record, copies) for
+               each key that had more than one copy)
+    """
+    groups = {}
+    for session in sessions:
+        groups.setdefault(session_key(session), []).append(session)
+
+    kept = []
+    merges = []
+    for copies in groups.values():
+        if len(copies) == 1:
+            kept.append(copies[0])
+            continue
+        merged = dict(max(copies, key=lambda s: s.get("duration", 0)))
+        descriptions = []
+        for copy in copies:
+            description = copy.get("description", "")
+            if description and description not in descriptions:
+                descriptions.append(description)
+        merged["description"] = "; ".join(descriptions)
+        kept.append(merged)
+        merges.append((merged, copies))
+    return kept, merges
+
+
+def dedupe_garden():
+    """
+    Merge duplicate sessions and rewrite the garden once if any were found.
+
+    The rewrite goes through save_garden_safely, so the JSON and sharded
+    stores are backed up first.
+
+    Returns:
+        list: (merged record, copies) for each merged group, or None if the
+              garden could not be locked or written
+    """
+    try:
+        with garden_lock():
+            garden_data = open_or_create_garden()
+            sessions, merges = merge_duplicate_sessions(garden_data["sessions"])
+            if merges:
+                garden_data["sessions"] = sessions
+                if not save_garden_safely(garden_data):
+                    return None
+            return merges
+    except TimeoutError as e:
+        print(f"[ERROR] {e}")
+        return None
+
+
+def store_exists():
+    """Check whether the active storage backend holds a garden yet."""
+    backend = get_storage_backend()
+    if backend == "sqlite":
+        # connect() creates the database, importing any JSON garden
+        return True
+    if backend == "sharded" and os.path.isdir(sharded_store.SEGMENT_DIR):
+        return True
+    # A new sharded store is seeded from the JSON garden too
+    return os.path.exists(GARDEN_FILE) or os.path.exists(SESSION_LOG_FILE)
+
+
+def export_garden_to_csv(since=None, until=None):
+    """
+    Export garden data to CSV format
+
+    Args:
+        since (str): First date (YYYY-MM-DD) to export, None for no lower bound
+        until (str): Last date (YYYY-MM-DD) to export, None for no upper bound
+    """
+    if store_exists():
+        exported = 0
+        # create output file
+        with open("exportedGarden.csv", "w") as output:
+            # create writer object
+            writer = csv.writer(output)
+            # create headers
+            writer.writerow(["date", "start_time", "end_time", "duration_minutes", "description"])
+            if since is None and until is None:
+                # Rows are streamed straight from the store to the CSV
+                sessions = iter_sessions()
+            else:
+                sessions = sessions_between(since, until)
+            for session in sessions:
+                start_time = format_time(session.get("start_time", "N/A"))
+                end_time = format_time(session.get("end_time", "N/A"))
+                writer.writerow([
+                    session["date"], 
+                    start_time,
+                    end_time,
+                    round(session["duration"] / 60), 
+                    session["description"]
+                ])
+                exported += 1
+        print(f"Exported {exported} sessions to exportedGarden.csv")
     else:
         print("Data file does not exist. Start and finish a new session to create it.")
\ No newline at end of file
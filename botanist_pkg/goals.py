@@ -5,7 +5,10 @@ Goals and target management for Botanist.
 import json
 import os
 import datetime
-from collections import defaultdict
+from . import columnar
+from .config import get_week_start
+from .garden import daily_totals, get_streaks, store_stamp
+from .result_cache import cached
 
 
 GOALS_FILE = ".botanist_goals.json"
@@ -71,8 +74,14 @@ def set_weekly_goal(minutes=None, sessions=None):
     return save_goals(goals)
 
 
-def calculate_daily_progress(sessions, target_date=None):
-    """Calculate progress toward daily goals for a specific date."""
+def calculate_daily_progress(sessions=None, target_date=None):
+    """
+    Calculate progress toward daily goals for a specific date.
+
+    When `sessions` is None the totals come from the rollup index, so the
+    cost does not depend on how many sessions the garden holds, and are
+    cached until the store changes.
+    """
     if target_date is None:
         target_date = datetime.date.today()
     elif isinstance(target_date, str):
@@ -80,63 +89,81 @@ def calculate_daily_progress(sessions, target_date=None):
     
     target_date_str = target_date.strftime("%Y-%m-%d")
     
+    if sessions is None:
+        progress, _ = cached("daily_progress", [store_stamp(), target_date_str],
+                             lambda: _daily_progress(target_date_str, columnar.from_daily_totals(
+                                 daily_totals(target_date_str, target_date_str))[0]))
+        return progress
     # Filter sessions for target date
-    daily_sessions = [s for s in sessions if s.get("date") == target_date_str]
-    
-    total_minutes = sum(s.get("duration", 0) / 60 for s in daily_sessions)
-    total_sessions = len(daily_sessions)
+    ordinal = target_date.toordinal()
+    return _daily_progress(target_date_str,
+                           columnar.between(columnar.from_sessions(sessions), ordinal, ordinal))
+
+
+def _daily_progress(target_date_str, columns):
+    """Build the daily progress of calculate_daily_progress from one day's columns."""
+    day = columnar.totals(columns)
     
     return {
         "date": target_date_str,
-        "minutes": round(total_minutes),
-        "sessions": total_sessions,
-        "session_list": daily_sessions
+        "minutes": round(day["seconds"] / 60),
+        "sessions": day["sessions"]
     }
 
 
-def calculate_weekly_progress(sessions, target_week=None):
-    """Calculate progress toward weekly goals for a specific week."""
-    if target_week is None:
-        today = datetime.date.today()
-        # Calculate start of current week (Monday)
-        days_since_monday = today.weekday()
-        week_start = today - datetime.timedelta(days=days_since_monday)
-    else:
-        week_start = target_week
+def calculate_weekly_progress(sessions=None, target_week=None):
+    """
+    Calculate progress toward weekly goals for a specific week.
+
+    Weeks start on the configured `week_start`; `target_week` may be any
+    date in the week (this week by default). When `sessions` is None the
+    totals come from the rollup index: seven day lookups, regardless of
+    history length, cached until the store changes.
+    """
+    first_weekday = get_week_start()
+    week_start = columnar.week_start_date(target_week or datetime.date.today(), first_weekday)
     
     week_end = week_start + datetime.timedelta(days=6)
+    week_start_str = week_start.strftime("%Y-%m-%d")
+    week_end_str = week_end.strftime("%Y-%m-%d")
     
+    if sessions is None:
+        progress, _ = cached("weekly_progress", [store_stamp(), week_start_str],
+                             lambda: _weekly_progress(week_start_str, week_end_str, first_weekday,
+                                                      columnar.from_daily_totals(
+                                                          daily_totals(week_start_str, week_end_str))[0]))
+        return progress
     # Filter sessions for target week
-    weekly_sessions = []
-    for s in sessions:
-        try:
-            session_date = datetime.datetime.strptime(s.get("date", ""), "%Y-%m-%d").date()
-            if week_start <= session_date <= week_end:
-                weekly_sessions.append(s)
-        except ValueError:
-            continue
+    return _weekly_progress(week_start_str, week_end_str, first_weekday,
+                            columnar.between(columnar.from_sessions(sessions),
+                                             week_start.toordinal(), week_end.toordinal()))
+
+
+def _weekly_progress(week_start_str, week_end_str, first_weekday, columns):
+    """Build the weekly progress of calculate_weekly_progress from one week's columns."""
+    buckets = columnar.bucket_totals(columns, ("day", "week"), first_weekday)
+    totals = buckets["day"]
+    week = buckets["week"].get(week_start_str, {"seconds": 0.0, "sessions": 0})
     
-    total_minutes = sum(s.get("duration", 0) / 60 for s in weekly_sessions)
-    total_sessions = len(weekly_sessions)
+    total_minutes = week["seconds"] / 60
+    total_sessions = week["sessions"]
     
     # Group by day for detailed view
-    daily_breakdown = defaultdict(lambda: {"minutes": 0, "sessions": 0})
-    for s in weekly_sessions:
-        date = s.get("date", "")
-        daily_breakdown[date]["minutes"] += s.get("duration", 0) / 60
-        daily_breakdown[date]["sessions"] += 1
+    daily_breakdown = {
+        date: {"minutes": day["seconds"] / 60, "sessions": day["sessions"]}
+        for date, day in totals.items()
+    }
     
     return {
-        "week_start": week_start.strftime("%Y-%m-%d"),
-        "week_end": week_end.strftime("%Y-%m-%d"), 
+        "week_start": week_start_str,
+        "week_end": week_end_str,
         "minutes": round(total_minutes),
         "sessions": total_sessions,
-        "daily_breakdown": dict(daily_breakdown),
-        "session_list": weekly_sessions
+        "daily_breakdown": daily_breakdown
     }
 
 
-def display_daily_progress(sessions, target_date=None):
+def display_daily_progress(sessions=None, target_date=None):
     """Display today's progress summary."""
     progress = calculate_daily_progress(sessions, target_date)
     
@@ -147,10 +174,13 @@ def display_daily_progress(sessions, target_date=None):
     print(f"📅 {progress['date']}")
     print(f"⏱️  Focus Time: {progress['minutes']} minutes ({progress['minutes']/60:.1f} hours)")
     print(f"🎯 Sessions: {progress['sessions']} completed")
+    if sessions is None:
+        streaks = get_streaks(datetime.date.fromisoformat(progress["date"]))
+        print(f"🔥 Streak: {streaks['current']} day(s) (longest {streaks['longest']})")
     print()
 
 
-def display_weekly_progress(sessions, target_week=None):
+def display_weekly_progress(sessions=None, target_week=None):
     """Display weekly goal progress with detailed breakdown."""
     goals = load_goals()
     if not goals["weekly"]["enabled"]:
@@ -244,7 +274,7 @@ def display_goals_settings():
     print()
 
 
-def check_goal_achievements(sessions, show_celebrations=True):
+def check_goal_achievements(sessions=None, show_celebrations=True):
     """Check if weekly goals were achieved and show celebrations."""
     goals = load_goals()
     achievements = []
@@ -0,0 +1,101 @@
+"""
+Cross-process file locking for Botanist.
+
+Botanist is often run from several terminals at once. Every read-modify-write
+of the garden or the active session file happens under an advisory fcntl
+lock on a separate lock file, so two commands finishing at the same moment
+are serialized instead of one silently overwriting the other's session.
+On platforms without fcntl the locks are no-ops.
+"""
+
+import contextlib
+import os
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+GARDEN_LOCK_FILE = ".hiddenGarden.lock"  # Guards the garden, log, indexes and watermark
+STATE_LOCK_FILE = ".hiddenBotanist.lock"  # Guards the active session file
+LOCK_TIMEOUT = 10.0  # Seconds to wait for another process before giving up
+LOCK_POLL_INTERVAL = 0.01  # Initial wait between attempts, doubled up to LOCK_MAX_POLL
+LOCK_MAX_POLL = 0.2
+
+# Locks held by this process: absolute path -> [fd, depth, pid]
+_held_locks = {}
+
+
+@contextlib.contextmanager
+def file_lock(path, timeout=None):
+    """
+    Hold an exclusive advisory lock on `path` for the duration of a with block.
+
+    The lock is reentrant within a process, so a locked function may call
+    another one that takes the same lock. Lock files are never deleted;
+    removing them would let two processes lock different inodes.
+
+    Args:
+        path (str): Lock file to create (if needed) and lock
+        timeout (float): Seconds to wait, LOCK_TIMEOUT if None
+
+    Raises:
+        TimeoutError: If another process held the lock for the whole wait
+    """
+    if fcntl is None:
+        yield
+        return
+
+    key = os.path.abspath(path)
+    held = _held_locks.get(key)
+    if held is not None and held[2] == os.getpid():
+        held[1] += 1
+        try:
+            yield
+        finally:
+            held[1] -= 1
+        return
+
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    deadline = time.monotonic() + (LOCK_TIMEOUT if timeout is None else timeout)
+    delay = LOCK_POLL_INTERVAL
+    try:
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"Timed out waiting for lock on {path}")
+                time.sleep(min(delay, remaining))
+                delay = min(delay * 2, LOCK_MAX_POLL)
+    except BaseException:
+        os.close(fd)
+        raise
+
+    _held_locks[key] = [fd, 1, os.getpid()]
+    try:
+        yield
+    finally:
+        del _held_locks[key]
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+
+def holds_lock(path):
+    """Check whether this process holds the lock on `path` (never true without fcntl)."""
+    held = _held_locks.get(os.path.abspath(path))
+    return held is not None and held[2] == os.getpid()
+
+
+def garden_lock(timeout=None):
+    """Lock the garden store (file, log, derived indexes) against other processes."""
+    return file_lock(GARDEN_LOCK_FILE, timeout)
+
+
+def state_lock(timeout=None):
+    """Lock the active session file (.hiddenBotanist) against other processes."""
+    return file_lock(STATE_LOCK_FILE, timeout)
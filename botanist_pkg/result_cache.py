@@ -0,0 +1,90 @@
+"""
+On-disk cache of computed reports for Botanist.
+
+`weekly`, `goals` and the other reports are often run from shell prompts
+and status bars, many times between two sessions. Their aggregates are
+cached in .botanist_cache.json, each under a key built from the (size,
+mtime, inode) of the files it was computed from plus any other inputs
+(such as the date). A repeated call with an unchanged key returns the
+cached value without opening the garden. Every store write path also
+calls invalidate_results(), so a write can never be hidden by a stat
+that happens to match. `verify` is never cached, as it exists to catch
+damage that a stat cannot see.
+"""
+
+import json
+import os
+
+
+CACHE_FILE = ".botanist_cache.json"
+CACHE_VERSION = 1
+
+
+def file_key(paths):
+    """
+    Describe files by their size, modification time and inode.
+
+    Returns:
+        list: [path, size, mtime_ns, inode] per path (None values if missing)
+    """
+    key = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            key.append([path, stat.st_size, stat.st_mtime_ns, stat.st_ino])
+        except OSError:
+            key.append([path, None, None, None])
+    return key
+
+
+def _load_cache():
+    """Load the cache, or an empty one if it is missing, unreadable or outdated."""
+    try:
+        with open(CACHE_FILE, "r") as f:
+            cache = json.load(f)
+        if isinstance(cache, dict) and cache.get("version") == CACHE_VERSION:
+            return cache
+    except (IOError, ValueError):
+        pass
+    return {"version": CACHE_VERSION, "entries": {}}
+
+
+def cached(name, key, compute):
+    """
+    Return the cached result for `name` if it was stored under `key`, else compute it.
+
+    Args:
+        name (str): Name of the cached report
+        key: JSON-serializable description of every input of the report
+        compute (callable): Builds the JSON-serializable result on a miss
+
+    Returns:
+        tuple: (result, True if it came from the cache)
+    """
+    # Compare through JSON so tuples in the key match the lists read back
+    key = json.loads(json.dumps(key))
+    cache = _load_cache()
+    entry = cache["entries"].get(name)
+    if entry is not None and entry.get("key") == key:
+        return entry["value"], True
+
+    value = compute()
+    cache["entries"][name] = {"key": key, "value": value}
+    temp_file = CACHE_FILE + ".tmp"
+    try:
+        with open(temp_file, "w") as f:
+            json.dump(cache, f, separators=(",", ":"))
+        os.replace(temp_file, CACHE_FILE)
+    except (IOError, OSError, TypeError, ValueError) as e:
+        print(f"[WARNING] Failed to save result cache: {e}")
+    return value, False
+
+
+def invalidate_results():
+    """Drop every cached result; called by each write to the session store."""
+    try:
+        os.remove(CACHE_FILE)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"[WARNING] Failed to clear result cache: {e}")
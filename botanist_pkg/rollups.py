@@ -0,0 +1,145 @@
+"""
+Per-day rollups of focus time for Botanist.
+
+The rollup index is a small JSON file holding total seconds and session
+counts for every active day, plus the streak engine state
+(last active date, current and longest run of consecutive active days).
+It is updated as sessions are added and rebuilt from the garden whenever
+it no longer matches the store, so goal, weekly and streak views never
+have to rescan the whole history. Weeks are summed from the days by
+columnar.bucket_totals, so they follow the configured week start.
+"""
+
+import datetime
+import json
+import os
+
+
+ROLLUP_FILE = ".botanist_rollups.json"
+ROLLUP_VERSION = 3  # 2 added the streak state, 3 dropped the ISO week buckets
+
+
+def empty_rollups(stamp=None):
+    """Create an empty rollup index tied to a store stamp."""
+    return {"version": ROLLUP_VERSION, "stamp": stamp, "days": {},
+            "streak": {"last_date": None, "current": 0, "longest": 0}}
+
+
+def add_to_rollups(rollups, date_str, seconds, sessions=1):
+    """Add focus time for one date to its day bucket."""
+    totals = rollups["days"].setdefault(date_str, [0.0, 0])
+    totals[0] += seconds
+    totals[1] += sessions
+
+
+def advance_streak(rollups, date_str):
+    """
+    Update the streak state for a newly active day in O(1).
+
+    A day after the last active date extends or restarts the current run.
+    A day before it (a backdated session) changes runs in the middle of
+    the history, so the state is rebuilt from the active days instead.
+
+    Args:
+        rollups (dict): Rollup index whose "days" already include date_str
+        date_str (str): YYYY-MM-DD date that just got its first session
+    """
+    streak = rollups["streak"]
+    last = streak["last_date"]
+    if last is not None and date_str <= last:
+        rollups["streak"] = build_streak(rollups["days"])
+        return
+    day = datetime.date.fromisoformat(date_str)
+    if last is not None and (day - datetime.date.fromisoformat(last)).days == 1:
+        streak["current"] += 1
+    else:
+        streak["current"] = 1
+    streak["last_date"] = date_str
+    streak["longest"] = max(streak["longest"], streak["current"])
+
+
+def build_streak(days):
+    """
+    Compute the streak state in one pass over the active days.
+
+    Args:
+        days (iterable): YYYY-MM-DD dates with at least one session
+
+    Returns:
+        dict: {"last_date": str or None, "current": int, "longest": int}
+    """
+    streak = {"last_date": None, "current": 0, "longest": 0}
+    previous = None
+    for date_str in sorted(days):
+        day = datetime.date.fromisoformat(date_str)
+        if previous is not None and (day - previous).days == 1:
+            streak["current"] += 1
+        else:
+            streak["current"] = 1
+        streak["longest"] = max(streak["longest"], streak["current"])
+        streak["last_date"] = date_str
+        previous = day
+    return streak
+
+
+def streak_as_of(streak, today):
+    """
+    Get the streaks as they stand on a given day.
+
+    The current run only counts while it reaches today or yesterday;
+    after a missed day it is shown as 0.
+
+    Returns:
+        dict: {"current": int, "longest": int, "last_date": str or None}
+    """
+    current = 0
+    if streak["last_date"] is not None:
+        gap = (today - datetime.date.fromisoformat(streak["last_date"])).days
+        if gap <= 1:
+            current = streak["current"]
+    return {"current": current, "longest": streak["longest"], "last_date": streak["last_date"]}
+
+
+def build_rollups(daily_totals, stamp=None):
+    """
+    Build a rollup index from per-day totals.
+
+    Args:
+        daily_totals (dict): {"YYYY-MM-DD": {"seconds": float, "sessions": int}}
+        stamp (list): Store stamp the totals were computed from
+
+    Returns:
+        dict: Rollup index
+    """
+    rollups = empty_rollups(stamp)
+    for date_str, totals in daily_totals.items():
+        add_to_rollups(rollups, date_str, totals["seconds"], totals["sessions"])
+    rollups["streak"] = build_streak(rollups["days"])
+    return rollups
+
+
+def load_rollups():
+    """Load the rollup index, or None if it is missing or unreadable."""
+    if not os.path.exists(ROLLUP_FILE):
+        return None
+    try:
+        with open(ROLLUP_FILE, "r") as f:
+            rollups = json.load(f)
+    except (IOError, json.JSONDecodeError):
+        return None
+    if not isinstance(rollups, dict) or rollups.get("version") != ROLLUP_VERSION:
+        return None
+    return rollups
+
+
+def save_rollups(rollups):
+    """Atomically write the rollup index. Returns True on success."""
+    temp_file = ROLLUP_FILE + ".tmp"
+    try:
+        with open(temp_file, "w") as f:
+            json.dump(rollups, f, separators=(",", ":"))
+        os.replace(temp_file, ROLLUP_FILE)
+        return True
+    except (IOError, OSError) as e:
+        print(f"[WARNING] Failed to save rollup index: {e}")
+        return False
@@ -0,0 +1,76 @@
+"""
+Garden schema versions for Botanist.
+
+Version 1 stores a session's start_time and end_time as formatted local
+time strings. Version 2 stores them as integer epoch seconds, so reading
+them back needs no strptime. Both versions keep "date" as the local
+calendar day string, which is what every per-day grouping keys on.
+A garden declares its version in a top-level "schema_version" field;
+gardens without one are version 1. Readers accept records of either version.
+"""
+
+import datetime
+
+
+SCHEMA_VERSION = 2
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+TIME_FIELDS = ("start_time", "end_time")
+
+
+def garden_version(fields):
+    """Return the schema version declared by a garden's top-level fields."""
+    return fields.get("schema_version", 1)
+
+
+def is_epoch(value):
+    """Check whether a time field holds version 2 epoch seconds."""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def to_epoch(value):
+    """Convert a time field of either version to integer epoch seconds (local time)."""
+    if is_epoch(value):
+        return value
+    return int(datetime.datetime.strptime(value, TIME_FORMAT).timestamp())
+
+
+def to_datetime(value):
+    """Convert a time field of either version to a local datetime."""
+    if is_epoch(value):
+        return datetime.datetime.fromtimestamp(value)
+    return datetime.datetime.strptime(value, TIME_FORMAT)
+
+
+def format_time(value):
+    """Render a time field of either version in the version 1 string format."""
+    if is_epoch(value):
+        return datetime.datetime.fromtimestamp(value).strftime(TIME_FORMAT)
+    return value
+
+
+def session_key(session):
+    """
+    Identify a session for duplicate detection by its date and start time.
+
+    The start time is compared in the version 1 string form, so the same
+    session recorded under either schema version gets the same key.
+    """
+    return (session.get("date", ""), format_time(session.get("start_time", "")))
+
+
+def convert_session(session, version):
+    """
+    Return a copy of a session with its time fields in the given schema version.
+
+    Args:
+        session (dict): Session record of either version
+        version (int): Target schema version (1 or 2)
+
+    Returns:
+        dict: Converted session; key order is preserved
+    """
+    converted = dict(session)
+    for field in TIME_FIELDS:
+        if field in converted:
+            converted[field] = to_epoch(converted[field]) if version >= 2 else format_time(converted[field])
+    return converted
@@ -0,0 +1,189 @@
+"""
+Inverted index of session descriptions for Botanist.
+
+`search` looks terms up in .botanist_search.db, a small stdlib sqlite3
+database holding, for every lowercase word of a description, the list of
+sessions that contain it (its posting list). The postings table is keyed
+on (token, session), so a query reads only the posting lists of its own
+terms and its cost depends on how many sessions match, not on how many
+the garden holds. Like the other derived indexes it is updated as
+sessions are added and rebuilt from the garden whenever its stamp no
+longer matches the store.
+"""
+
+import json
+import re
+import sqlite3
+
+from .schema import format_time
+
+
+INDEX_FILE = ".botanist_search.db"
+INDEX_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    start_time TEXT NOT NULL,
+    duration REAL NOT NULL,
+    description TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_docs_date ON docs(date);
+CREATE TABLE IF NOT EXISTS postings (
+    token TEXT NOT NULL,
+    doc INTEGER NOT NULL,
+    PRIMARY KEY (token, doc)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS index_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """
+    Split text into the distinct lowercase words it is indexed under.
+
+    Returns:
+        list: Sorted distinct tokens
+    """
+    return sorted(set(TOKEN_PATTERN.findall((text or "").lower())))
+
+
+def parse_query(terms):
+    """
+    Parse search terms into OR-ed groups of AND-ed tokens.
+
+    Terms next to each other must all match; an upper-case OR between
+    terms starts an alternative. `python drill OR rust` becomes
+    [["drill", "python"], ["rust"]].
+
+    Args:
+        terms (list): Query words as typed on the command line
+
+    Returns:
+        list: Groups of tokens, empty if the query has no words
+    """
+    groups, group = [], set()
+    for term in terms:
+        if term == "OR":
+            if group:
+                groups.append(sorted(group))
+            group = set()
+        elif term != "AND":
+            group.update(tokenize(term))
+    if group:
+        groups.append(sorted(group))
+    return groups
+
+
+def connect():
+    """Open the search index, creating the schema on first use."""
+    conn = sqlite3.connect(INDEX_FILE)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def load_stamp(conn):
+    """Get the store stamp the index was built from, or None if it is unusable."""
+    rows = dict(conn.execute("SELECT key, value FROM index_meta"))
+    if rows.get("version") != str(INDEX_VERSION) or "stamp" not in rows:
+        return None
+    return json.loads(rows["stamp"])
+
+
+def _save_stamp(conn, stamp):
+    """Record the store stamp the index now matches."""
+    conn.executemany("INSERT OR REPLACE INTO index_meta (key, value) VALUES (?, ?)",
+                     [("version", str(INDEX_VERSION)), ("stamp", json.dumps(stamp))])
+
+
+def _insert(conn, session):
+    """Add one session and its postings."""
+    description = session.get("description") or ""
+    doc = conn.execute(
+        "INSERT INTO docs (date, start_time, duration, description) VALUES (?, ?, ?, ?)",
+        (session["date"], format_time(session["start_time"]), session.get("duration", 0), description)
+    ).lastrowid
+    conn.executemany("INSERT OR IGNORE INTO postings (token, doc) VALUES (?, ?)",
+                     [(token, doc) for token in tokenize(description)])
+
+
+def build_index(conn, sessions, stamp):
+    """
+    Replace the whole index with `sessions` in one transaction.
+
+    Returns:
+        int: Number of sessions indexed
+    """
+    count = 0
+    with conn:
+        conn.execute("DELETE FROM postings")
+        conn.execute("DELETE FROM docs")
+        for session in sessions:
+            _insert(conn, session)
+            count += 1
+        _save_stamp(conn, stamp)
+    return count
+
+
+def add_to_index(conn, session, stamp_before, stamp):
+    """
+    Index a just-saved session if the index was up to date before it.
+
+    Returns:
+        bool: True if added, False if the index is stale and left for a rebuild
+    """
+    with conn:
+        if load_stamp(conn) != stamp_before:
+            return False
+        _insert(conn, session)
+        _save_stamp(conn, stamp)
+    return True
+
+
+def restamp(conn, stamp_before, stamp):
+    """Move an up-to-date index to a new stamp after a write that kept the same sessions."""
+    with conn:
+        if load_stamp(conn) == stamp_before:
+            _save_stamp(conn, stamp)
+
+
+def lookup(conn, groups, start_date=None, end_date=None):
+    """
+    Find the sessions matching a parsed query within [start_date, end_date].
+
+    Args:
+        conn: Open search index
+        groups (list): Token groups from parse_query
+        start_date (str): First date (YYYY-MM-DD) to include, None for no lower bound
+        end_date (str): Last date (YYYY-MM-DD) to include, None for no upper bound
+
+    Returns:
+        list: {"date", "start_time", "duration", "description"} dicts ordered
+              by date and start time
+    """
+    if not groups:
+        return []
+    # Each group intersects its tokens' posting lists and the groups are
+    # unioned; SQLite applies compound operators left to right, so each
+    # intersection is wrapped in its own subquery
+    matches = " UNION ".join(
+        "SELECT doc FROM (" + " INTERSECT ".join(["SELECT doc FROM postings WHERE token = ?"] * len(group)) + ")"
+        for group in groups
+    )
+    sql = f"SELECT date, start_time, duration, description FROM docs WHERE id IN ({matches})"
+    params = [token for group in groups for token in group]
+    if start_date is not None:
+        sql += " AND date >= ?"
+        params.append(start_date)
+    if end_date is not None:
+        sql += " AND date <= ?"
+        params.append(end_date)
+    sql += " ORDER BY date, start_time, id"
+    return [{"date": date, "start_time": start_time, "duration": duration, "description": description}
+            for date, start_time, duration, description in conn.execute(sql, params)]
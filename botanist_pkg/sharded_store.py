@@ -0,0 +1,221 @@
+"""
+Month-sharded storage backend for Botanist.
+
+Sessions are split into one JSON segment per calendar month under
+.hiddenGarden.d/ (2025-09.json, 2025-10.json, ...) next to a small
+meta.json holding the top-level garden fields. Adding a session rewrites
+and backs up only its own month's segment, current-week queries open at
+most two segments, and full-history readers stream segments oldest first.
+"""
+
+import json
+import os
+import re
+from typing import Dict, List, Any, Optional
+
+from .data_protection import (validate_session, validate_garden_data, safe_read_garden,
+                              safe_write_garden, safe_write_store_file, recover_store_file,
+                              write_json_atomically, GARDEN_FILE, SESSION_LOG_FILE)
+
+
+SEGMENT_DIR = ".hiddenGarden.d"
+META_FILE = os.path.join(SEGMENT_DIR, "meta.json")
+SEGMENT_NAME = re.compile(r"^(\d{4}-\d{2})\.json$")
+
+
+def open_store():
+    """
+    Create the segment directory on first use.
+
+    A brand new store is seeded from the existing JSON garden so that
+    switching backends never hides sessions recorded before the switch.
+    """
+    if os.path.isdir(SEGMENT_DIR):
+        return
+    os.makedirs(SEGMENT_DIR)
+    if os.path.exists(GARDEN_FILE) or os.path.exists(SESSION_LOG_FILE):
+        count = _replace_garden(safe_read_garden())
+        print(f"[DATA] Imported {count} sessions from {GARDEN_FILE} into {SEGMENT_DIR}")
+
+
+def segment_path(month: str) -> str:
+    """Path of the segment holding one month ("YYYY-MM")."""
+    return os.path.join(SEGMENT_DIR, f"{month}.json")
+
+
+def list_months() -> List[str]:
+    """List the months that have a segment, oldest first."""
+    open_store()
+    months = []
+    for filename in os.listdir(SEGMENT_DIR):
+        match = SEGMENT_NAME.match(filename)
+        if match:
+            months.append(match.group(1))
+    return sorted(months)
+
+
+def store_files() -> List[str]:
+    """List every file of the store, for change detection by derived indexes."""
+    return [META_FILE] + [segment_path(month) for month in list_months()]
+
+
+def read_segment(month: str) -> List[Dict[str, Any]]:
+    """
+    Load the valid sessions of one month, restoring its segment from backup if needed.
+
+    Returns:
+        list: Session dictionaries in insertion order ([] for an empty month)
+    """
+    path = segment_path(month)
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+        if isinstance(data, dict) and isinstance(data.get("sessions"), list):
+            return _valid_sessions(data["sessions"])
+        print(f"[WARNING] Segment {path} is malformed!")
+    except (IOError, json.JSONDecodeError) as e:
+        print(f"[ERROR] Failed to read segment {path}: {e}")
+    return recover_store_file(path)["sessions"]
+
+
+def _valid_sessions(sessions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Drop (and report) records that fail validation."""
+    valid = []
+    for session in sessions:
+        if validate_session(session):
+            session.pop("crc", None)
+            valid.append(session)
+        else:
+            print(f"[WARNING] Skipping invalid session: {session}")
+    return valid
+
+
+def _write_segment(month: str, sessions: List[Dict[str, Any]]) -> bool:
+    """Back up and replace one month's segment."""
+    return safe_write_store_file(segment_path(month), {"month": month, "sessions": sessions})
+
+
+def read_meta() -> Dict[str, Any]:
+    """Load the top-level garden fields without opening any segment."""
+    open_store()
+    try:
+        with open(META_FILE, "r") as f:
+            meta = json.load(f)
+        if isinstance(meta, dict):
+            return meta
+    except (IOError, json.JSONDecodeError):
+        pass
+    return {"current_streak": 0}
+
+
+def _replace_garden(data: Dict[str, Any]) -> int:
+    """
+    Make the store hold exactly `data`, rewriting only the segments that change.
+
+    Returns:
+        int: Number of sessions stored, or -1 if a write failed
+    """
+    by_month = {}
+    for session in data["sessions"]:
+        by_month.setdefault(session["date"][:7], []).append(session)
+
+    for month in set(list_months()) | set(by_month):
+        sessions = by_month.get(month, [])
+        if sessions != read_segment(month) and not _write_segment(month, sessions):
+            return -1
+
+    meta = {key: value for key, value in data.items() if key != "sessions"}
+    try:
+        write_json_atomically(META_FILE, meta)
+    except (IOError, OSError) as e:
+        print(f"[ERROR] Failed to write {META_FILE}: {e}")
+        return -1
+    return len(data["sessions"])
+
+
+def read_garden() -> Dict[str, Any]:
+    """
+    Load the whole garden in the same dict shape as .hiddenGarden.json.
+
+    Returns:
+        dict: Garden data with "sessions" ordered by month, then insertion
+    """
+    data = read_meta()
+    data.setdefault("current_streak", 0)
+    data["sessions"] = list(iter_sessions())
+    return data
+
+
+def write_garden(data: Dict[str, Any]) -> bool:
+    """
+    Replace the stored garden with `data` after validating it.
+
+    Returns:
+        bool: True if write was successful, False otherwise
+    """
+    if not validate_garden_data(data):
+        print("[ERROR] Invalid garden data, write aborted!")
+        return False
+    open_store()
+    return _replace_garden(data) >= 0
+
+
+def append_session(new_session: Dict[str, Any]) -> bool:
+    """
+    Append a session to its month's segment; other segments are not touched.
+
+    Returns:
+        bool: True if the segment was written, False otherwise
+    """
+    if not validate_session(new_session):
+        print("[ERROR] Invalid session data, append aborted!")
+        return False
+
+    open_store()
+    month = new_session["date"][:7]
+    return _write_segment(month, read_segment(month) + [new_session])
+
+
+def iter_sessions(start_date: Optional[str] = None, end_date: Optional[str] = None):
+    """
+    Stream sessions whose date falls in [start_date, end_date], one segment at a time.
+
+    Only the segments of months overlapping the range are opened.
+
+    Yields:
+        dict: Session dictionaries, oldest month first
+    """
+    for month in list_months():
+        if (start_date is not None and month < start_date[:7]) or \
+                (end_date is not None and month > end_date[:7]):
+            continue
+        for session in read_segment(month):
+            if (start_date is None or session["date"] >= start_date) and \
+                    (end_date is None or session["date"] <= end_date):
+                yield session
+
+
+def import_from_json() -> int:
+    """
+    Replace the segments with the current JSON garden.
+
+    Returns:
+        int: Number of sessions imported, or -1 if a write failed
+    """
+    open_store()
+    return _replace_garden(safe_read_garden())
+
+
+def export_to_json() -> int:
+    """
+    Write the segments back to .hiddenGarden.json (with the usual backup).
+
+    Returns:
+        int: Number of sessions exported, or -1 if the write failed
+    """
+    data = read_garden()
+    if not safe_write_garden(data):
+        return -1
+    return len(data["sessions"])
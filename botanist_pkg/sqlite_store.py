@@ -0,0 +1,239 @@
+"""
+SQLite storage backend for Botanist.
+
+Sessions live in a stdlib sqlite3 database indexed on date and start_time,
+so date windows and per-day totals are answered in SQL instead of scanning
+every session in Python. Each row keeps the full session record as JSON,
+which makes import from and export to .hiddenGarden.json lossless.
+"""
+
+import json
+import os
+import sqlite3
+from typing import Dict, List, Any, Optional
+
+from .data_protection import (validate_session, validate_garden_data, safe_read_garden,
+                              safe_write_garden, create_database_backup, GARDEN_FILE, SESSION_LOG_FILE)
+from .result_cache import invalidate_results
+from .schema import format_time
+
+
+DB_FILE = ".hiddenGarden.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date TEXT NOT NULL,
+    start_time TEXT NOT NULL,
+    duration REAL NOT NULL,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_date ON sessions(date);
+CREATE INDEX IF NOT EXISTS idx_sessions_start_time ON sessions(start_time);
+CREATE TABLE IF NOT EXISTS garden_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def connect() -> sqlite3.Connection:
+    """
+    Open the garden database, creating the schema on first use.
+
+    A brand new database is seeded from the existing JSON garden so that
+    switching backends never hides sessions recorded before the switch.
+    """
+    created = not os.path.exists(DB_FILE)
+    conn = sqlite3.connect(DB_FILE)
+    conn.executescript(SCHEMA)
+    if created and (os.path.exists(GARDEN_FILE) or os.path.exists(SESSION_LOG_FILE)):
+        count = _replace_garden(conn, safe_read_garden())
+        print(f"[DATA] Imported {count} sessions from {GARDEN_FILE} into {DB_FILE}")
+    return conn
+
+
+def _replace_garden(conn: sqlite3.Connection, data: Dict[str, Any]) -> int:
+    """Replace every session and top-level field in one transaction, after a backup."""
+    if conn.execute("SELECT EXISTS (SELECT 1 FROM sessions)").fetchone()[0]:
+        create_database_backup(conn)
+    with conn:
+        conn.execute("DELETE FROM sessions")
+        conn.execute("DELETE FROM garden_meta")
+        conn.executemany(
+            "INSERT INTO garden_meta (key, value) VALUES (?, ?)",
+            [(key, json.dumps(value)) for key, value in data.items() if key != "sessions"]
+        )
+        conn.executemany(
+            "INSERT INTO sessions (date, start_time, duration, record) VALUES (?, ?, ?, ?)",
+            [_session_row(session) for session in data["sessions"]]
+        )
+    invalidate_results()
+    return len(data["sessions"])
+
+
+def _session_row(session: Dict[str, Any]) -> tuple:
+    """Build the indexed columns plus the lossless JSON record for a session."""
+    # The start_time column is always text so rows of both schema versions sort together
+    return (session["date"], format_time(session["start_time"]), session["duration"],
+            json.dumps(session))
+
+
+def read_garden() -> Dict[str, Any]:
+    """
+    Load the whole garden in the same dict shape as .hiddenGarden.json.
+
+    Returns:
+        dict: Garden data with "sessions" in insertion order
+    """
+    conn = connect()
+    try:
+        data = {"current_streak": 0}
+        for key, value in conn.execute("SELECT key, value FROM garden_meta"):
+            data[key] = json.loads(value)
+        data["sessions"] = [json.loads(record) for (record,) in
+                            conn.execute("SELECT record FROM sessions ORDER BY id")]
+        return data
+    finally:
+        conn.close()
+
+
+def read_meta() -> Dict[str, Any]:
+    """Load the top-level garden fields without touching the sessions table."""
+    conn = connect()
+    try:
+        return {key: json.loads(value) for key, value in
+                conn.execute("SELECT key, value FROM garden_meta")}
+    finally:
+        conn.close()
+
+
+def write_garden(data: Dict[str, Any]) -> bool:
+    """
+    Replace the stored garden with `data` after validating it.
+
+    Returns:
+        bool: True if write was successful, False otherwise
+    """
+    if not validate_garden_data(data):
+        print("[ERROR] Invalid garden data, write aborted!")
+        return False
+
+    conn = connect()
+    try:
+        _replace_garden(conn, data)
+        return True
+    except sqlite3.Error as e:
+        print(f"[ERROR] Failed to write garden database: {e}")
+        return False
+    finally:
+        conn.close()
+
+
+def append_session(new_session: Dict[str, Any]) -> bool:
+    """
+    Insert a single session; existing rows are never touched.
+
+    Returns:
+        bool: True if the insert was committed, False otherwise
+    """
+    if not validate_session(new_session):
+        print("[ERROR] Invalid session data, append aborted!")
+        return False
+
+    conn = connect()
+    try:
+        with conn:
+            conn.execute(
+                "INSERT INTO sessions (date, start_time, duration, record) VALUES (?, ?, ?, ?)",
+                _session_row(new_session)
+            )
+        invalidate_results()
+        return True
+    except sqlite3.Error as e:
+        print(f"[ERROR] Failed to save session to database: {e}")
+        return False
+    finally:
+        conn.close()
+
+
+def iter_sessions(start_date: Optional[str] = None, end_date: Optional[str] = None):
+    """
+    Stream sessions whose date falls in [start_date, end_date] using the date index.
+
+    Args:
+        start_date: First date (YYYY-MM-DD) to include, or None for no lower bound
+        end_date: Last date (YYYY-MM-DD) to include, or None for no upper bound
+
+    Yields:
+        dict: Session dictionaries in insertion order, fetched row by row
+    """
+    conn = connect()
+    try:
+        rows = conn.execute(
+            "SELECT record FROM sessions WHERE date >= ? AND date <= ? ORDER BY id",
+            (start_date or "", end_date or "9999-12-31")
+        )
+        for (record,) in rows:
+            yield json.loads(record)
+    finally:
+        conn.close()
+
+
+def sessions_between(start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Fetch sessions whose date falls in [start_date, end_date], ordered by date and start time."""
+    conn = connect()
+    try:
+        rows = conn.execute(
+            "SELECT record FROM sessions WHERE date >= ? AND date <= ? ORDER BY date, start_time, id",
+            (start_date or "", end_date or "9999-12-31")
+        )
+        return [json.loads(record) for (record,) in rows]
+    finally:
+        conn.close()
+
+
+def daily_totals(start_date: Optional[str] = None, end_date: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+    """
+    Aggregate focus seconds and session counts per day in SQL.
+
+    Returns:
+        dict: {"YYYY-MM-DD": {"seconds": float, "sessions": int}} for days with sessions
+    """
+    conn = connect()
+    try:
+        rows = conn.execute(
+            "SELECT date, SUM(duration), COUNT(*) FROM sessions "
+            "WHERE date >= ? AND date <= ? GROUP BY date ORDER BY date",
+            (start_date or "", end_date or "9999-12-31")
+        )
+        return {date: {"seconds": seconds, "sessions": count} for date, seconds, count in rows}
+    finally:
+        conn.close()
+
+
+def import_from_json() -> int:
+    """
+    Replace the database contents with the current JSON garden.
+
+    Returns:
+        int: Number of sessions imported
+    """
+    conn = connect()
+    try:
+        return _replace_garden(conn, safe_read_garden())
+    finally:
+        conn.close()
+
+
+def export_to_json() -> int:
+    """
+    Write the database contents to .hiddenGarden.json (with the usual backup).
+
+    Returns:
+        int: Number of sessions exported, or -1 if the write failed
+    """
+    data = read_garden()
+    if not safe_write_garden(data):
+        return -1
+    return len(data["sessions"])
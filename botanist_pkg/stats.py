@@ -0,0 +1,153 @@
+"""
+Session length statistics for Botanist.
+
+`stats` summarizes the whole garden in one streaming pass: only running
+totals, the longest session and a quantile sketch are kept in memory, so
+the cost is flat however many sessions the garden holds. Median and
+p90/p99 come from a DDSketch-style log-bucketed histogram, which answers
+any quantile within a fixed relative error and can be merged with other
+sketches (for example one per storage segment).
+"""
+
+import math
+
+from .schema import to_datetime
+
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+SKETCH_ACCURACY = 0.01  # Quantiles are within 1% of the true value
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with bounded relative error.
+
+    Positive values are counted in logarithmic buckets: bucket i holds
+    values in (gamma^(i-1), gamma^i], with gamma = (1 + a) / (1 - a) for
+    relative accuracy a. Memory grows with the log of the value range,
+    not with the number of values added.
+    """
+
+    def __init__(self, relative_accuracy=SKETCH_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zero_count = 0  # Values <= 0 are not bucketed
+        self.count = 0
+
+    def add(self, value):
+        """Count one value."""
+        self.count += 1
+        if value <= 0:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def merge(self, other):
+        """Fold another sketch with the same accuracy into this one."""
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different accuracies")
+        self.count += other.count
+        self.zero_count += other.zero_count
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+
+    def quantile(self, q):
+        """
+        Estimate the q-quantile (0 <= q <= 1).
+
+        Returns:
+            float: Estimated value, or None if the sketch is empty
+        """
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                # The bucket's midpoint (in relative terms) is within the accuracy of every value in it
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+
+def collect_stats(sessions):
+    """
+    Summarize sessions in a single pass.
+
+    Args:
+        sessions (iterable): Session dictionaries, typically streamed from the store
+
+    Returns:
+        dict: count, total_seconds, longest (session or None), sketch,
+              weekdays and hours ([seconds, sessions] per weekday / start hour)
+    """
+    stats = {
+        "count": 0,
+        "total_seconds": 0.0,
+        "longest": None,
+        "sketch": QuantileSketch(),
+        "weekdays": [[0.0, 0] for _ in range(7)],
+        "hours": [[0.0, 0] for _ in range(24)],
+    }
+    for session in sessions:
+        duration = session.get("duration", 0)
+        stats["count"] += 1
+        stats["total_seconds"] += duration
+        stats["sketch"].add(duration)
+        if stats["longest"] is None or duration > stats["longest"]["duration"]:
+            stats["longest"] = session
+
+        try:
+            start = to_datetime(session["start_time"])
+        except (KeyError, TypeError, ValueError):
+            continue  # Still counted above, just not placed on the calendar
+        for bucket in (stats["weekdays"][start.weekday()], stats["hours"][start.hour]):
+            bucket[0] += duration
+            bucket[1] += 1
+    return stats
+
+
+def _minutes(seconds):
+    """Format a number of seconds as minutes for the report."""
+    return f"{seconds / 60:.1f} min"
+
+
+def display_stats(stats):
+    """Print the report for stats computed by collect_stats."""
+    print("╔════════════════════════════════════════╗")
+    print("║            SESSION STATISTICS          ║")
+    print("╚════════════════════════════════════════╝")
+    print()
+    if stats["count"] == 0:
+        print("No sessions in your garden yet.")
+        return
+
+    sketch = stats["sketch"]
+    longest = stats["longest"]
+    print(f"Sessions:  {stats['count']}")
+    print(f"Total:     {stats['total_seconds'] / 3600:.2f} h")
+    print(f"Mean:      {_minutes(stats['total_seconds'] / stats['count'])}")
+    print(f"Median:    ~{_minutes(sketch.quantile(0.5))}")
+    print(f"p90:       ~{_minutes(sketch.quantile(0.9))}")
+    print(f"p99:       ~{_minutes(sketch.quantile(0.99))}")
+    print(f"Longest:   {_minutes(longest['duration'])} on {longest.get('date', '?')}"
+          f" ({longest.get('description') or 'no description'})")
+
+    print("\nBy weekday:")
+    most = max(seconds for seconds, _ in stats["weekdays"]) or 1
+    for name, (seconds, count) in zip(WEEKDAYS, stats["weekdays"]):
+        bar = "█" * round(20 * seconds / most)
+        print(f"  {name:<9} {seconds / 3600:>6.2f} h  {count:>4}x  {bar}")
+
+    print("\nBy start hour:")
+    most = max(seconds for seconds, _ in stats["hours"]) or 1
+    for hour, (seconds, count) in enumerate(stats["hours"]):
+        if count:
+            bar = "█" * round(20 * seconds / most)
+            print(f"  {hour:02d}:00  {seconds / 3600:>6.2f} h  {count:>4}x  {bar}")
+    print()
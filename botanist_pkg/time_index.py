@@ -0,0 +1,129 @@
+"""
+Sorted time index of sessions for Botanist.
+
+The time index is a small stdlib sqlite3 database, .botanist_timeindex.db,
+with one row per session keyed on (date, start time). A date window is a
+range scan of that key, so answering it costs O(log N + k) however long
+the history is, and a new session is one row insert rather than a
+rewrite of the index. Like the rollup index it is updated as sessions
+are added and rebuilt from the garden whenever its stamp no longer
+matches the store.
+"""
+
+import json
+import os
+import sqlite3
+
+from .schema import to_epoch
+
+
+INDEX_FILE = ".botanist_timeindex.db"
+LEGACY_INDEX_FILE = ".botanist_timeindex"  # Marshal copy written by older versions
+INDEX_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    start REAL NOT NULL,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_date_start ON sessions(date, start, id);
+CREATE TABLE IF NOT EXISTS index_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def connect():
+    """Open the time index, creating the schema on first use."""
+    conn = sqlite3.connect(INDEX_FILE)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def load_stamp(conn):
+    """Get the store stamp the index was built from, or None if it is unusable."""
+    rows = dict(conn.execute("SELECT key, value FROM index_meta"))
+    if rows.get("version") != str(INDEX_VERSION) or "stamp" not in rows:
+        return None
+    return json.loads(rows["stamp"])
+
+
+def _save_stamp(conn, stamp):
+    """Record the store stamp the index now matches."""
+    conn.executemany("INSERT OR REPLACE INTO index_meta (key, value) VALUES (?, ?)",
+                     [("version", str(INDEX_VERSION)), ("stamp", json.dumps(stamp))])
+
+
+def _row(session):
+    """Build the sort key columns plus the JSON record for a session."""
+    return (session["date"], to_epoch(session["start_time"]), json.dumps(session))
+
+
+def build_index(conn, sessions, stamp):
+    """
+    Replace the whole index with `sessions` (in any order) in one transaction.
+
+    Returns:
+        int: Number of sessions indexed
+    """
+    count = 0
+    with conn:
+        conn.execute("DELETE FROM sessions")
+        for session in sessions:
+            conn.execute("INSERT INTO sessions (date, start, record) VALUES (?, ?, ?)", _row(session))
+            count += 1
+        _save_stamp(conn, stamp)
+    if os.path.exists(LEGACY_INDEX_FILE):
+        os.remove(LEGACY_INDEX_FILE)
+    return count
+
+
+def add_to_index(conn, session, stamp_before, stamp):
+    """
+    Index a just-saved session if the index was up to date before it.
+
+    Returns:
+        bool: True if added, False if the index is stale and left for a rebuild
+    """
+    with conn:
+        if load_stamp(conn) != stamp_before:
+            return False
+        conn.execute("INSERT INTO sessions (date, start, record) VALUES (?, ?, ?)", _row(session))
+        _save_stamp(conn, stamp)
+    return True
+
+
+def restamp(conn, stamp_before, stamp):
+    """Move an up-to-date index to a new stamp after a write that kept the same sessions."""
+    with conn:
+        if load_stamp(conn) == stamp_before:
+            _save_stamp(conn, stamp)
+
+
+def window(conn, start_date=None, end_date=None):
+    """
+    Get the sessions whose date falls in [start_date, end_date].
+
+    Args:
+        conn: Open time index
+        start_date (str): First date (YYYY-MM-DD) to include, None for no lower bound
+        end_date (str): Last date (YYYY-MM-DD) to include, None for no upper bound
+
+    Returns:
+        list: Matching sessions ordered by date and start time (ties in recorded order)
+    """
+    sql = "SELECT record FROM sessions"
+    clauses, params = [], []
+    if start_date is not None:
+        clauses.append("date >= ?")
+        params.append(start_date)
+    if end_date is not None:
+        clauses.append("date <= ?")
+        params.append(end_date)
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY date, start, id"
+    return [json.loads(record) for (record,) in conn.execute(sql, params)]
@@ -12,6 +12,10 @@ setup(
             "botanist=botanist_pkg.cli:main",
         ],
     },
+    extras_require={
+        "fast": ["numpy"],  # Vectorized analytics, see botanist_pkg/columnar.py
+        "test": ["pytest", "numpy"],  # Run both analytics paths
+    },
     license="MIT",
     python_requires=">=3.7",
     project_urls = {
@@ -0,0 +1,35 @@
+import datetime
+import json
+
+import pytest
+
+
+def make_session(day=1, hour=10, minutes=30, description="Work", minute=0, flower="seedling"):
+    """Build a valid session of `minutes` starting at hour:minute on 2025-09-<day>."""
+    start = datetime.datetime(2025, 9, day, hour, minute)
+    end = start + datetime.timedelta(minutes=minutes)
+    return {
+        "date": start.strftime("%Y-%m-%d"),
+        "start_time": start.strftime("%Y-%m-%d %H:%M:%S"),
+        "end_time": end.strftime("%Y-%m-%d %H:%M:%S"),
+        "duration": minutes * 60.0,
+        "description": description,
+        "flower": flower,
+    }
+
+
+def numbered_session(index):
+    """Build the index-th of a series of distinct hour-long sessions."""
+    return make_session(index % 28 + 1, minute=index % 60, minutes=60,
+                        description=f"Session number {index}", flower="orchid")
+
+
+def use_backend(backend):
+    with open(".botanist_config.json", "w") as f:
+        json.dump({"storage_backend": backend}, f)
+
+
+@pytest.fixture
+def garden_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
@@ -0,0 +1,97 @@
+import datetime
+
+import pytest
+
+from botanist_pkg import columnar
+from botanist_pkg.garden import summarize_by_day
+
+
+def make_sessions(count):
+    first = datetime.date(2025, 6, 20)
+    return [{"date": (first + datetime.timedelta(days=i * 7 % 200)).strftime("%Y-%m-%d"),
+             "duration": 600.0 + i % 50} for i in range(count)]
+
+
+@pytest.fixture(params=["numpy", "stdlib"])
+def engine(request, monkeypatch):
+    if request.param == "numpy":
+        if columnar.numpy is None:
+            pytest.skip("NumPy is not installed")
+    else:
+        monkeypatch.setattr(columnar, "numpy", None)
+    return request.param
+
+
+def test_columnar_totals_match_a_per_session_loop(engine):
+    sessions = make_sessions(500) + [{"date": "not a date", "duration": 60.0}]
+    columns = columnar.from_sessions(sessions)
+    expected = summarize_by_day(sessions[:-1])
+
+    assert columnar.day_totals(columns) == dict(sorted(expected.items()))
+    assert columnar.totals(columns) == {"seconds": sum(d["seconds"] for d in expected.values()),
+                                        "sessions": 500}
+
+    buckets = columnar.bucket_totals(columns)
+    assert buckets["day"] == columnar.day_totals(columns)
+    for unit, prefix in (("month", lambda date: date[:7]), ("year", lambda date: date[:4]),
+                         ("quarter", lambda date: f"{date[:4]}-Q{(int(date[5:7]) - 1) // 3 + 1}")):
+        assert list(buckets[unit]) == sorted(buckets[unit])
+        for label, total in buckets[unit].items():
+            inside = [d for date, d in expected.items() if prefix(date) == label]
+            assert total == {"seconds": sum(d["seconds"] for d in inside),
+                             "sessions": sum(d["sessions"] for d in inside)}
+
+
+def test_numpy_and_stdlib_paths_give_the_same_buckets(monkeypatch):
+    if columnar.numpy is None:
+        pytest.skip("NumPy is not installed (pip install -e .[test])")
+    sessions = make_sessions(1000)
+    vectorized = columnar.bucket_totals(columnar.from_sessions(sessions), week_start=2)
+    monkeypatch.setattr(columnar, "numpy", None)
+    plain = columnar.bucket_totals(columnar.from_sessions(sessions), week_start=2)
+
+    assert vectorized == plain
+    for unit in plain:
+        assert list(vectorized[unit]) == list(plain[unit])
+        for total in vectorized[unit].values():
+            assert type(total["seconds"]) is float and type(total["sessions"]) is int
+
+
+def test_columnar_weeks_start_on_the_configured_weekday(engine):
+    columns, skipped = columnar.from_daily_totals({
+        "2025-09-01": {"seconds": 60.0, "sessions": 1},
+        "2025-09-07": {"seconds": 120.0, "sessions": 2},
+        "2025-09-08": {"seconds": 30.0, "sessions": 1},
+        "2025-13-01": {"seconds": 1.0, "sessions": 1},
+    })
+    assert skipped == ["2025-13-01"]
+
+    assert columnar.bucket_totals(columns, ["week"])["week"] == {
+        "2025-09-01": {"seconds": 180.0, "sessions": 3},
+        "2025-09-08": {"seconds": 30.0, "sessions": 1}}
+    # Sunday-start weeks move Sep 7 into the next week
+    assert columnar.bucket_totals(columns, ["week"], week_start=6)["week"] == {
+        "2025-08-31": {"seconds": 60.0, "sessions": 1},
+        "2025-09-07": {"seconds": 150.0, "sessions": 3}}
+    assert columnar.week_start_date(datetime.date(2025, 9, 7), 4) == datetime.date(2025, 9, 5)
+    monday = datetime.date(2025, 9, 1).toordinal()
+    assert columnar.totals(columnar.between(columns, monday + 6)) == {"seconds": 150.0, "sessions": 3}
+    with pytest.raises(ValueError):
+        columnar.bucket_totals(columns, ["fortnight"])
+
+
+def test_heatmap_grid_places_days_by_week_and_weekday():
+    from botanist_pkg.analytics import heatmap_grid
+
+    rows, labels = heatmap_grid({
+        "2025-01-01": {"seconds": 600.0, "sessions": 1},
+        "2025-09-03": {"seconds": 4800.0, "sessions": 2},
+        "2024-12-31": {"seconds": 9999.0, "sessions": 1},
+    }, 2025)
+
+    assert len(rows) == 7 and all(len(row) == 53 for row in rows)
+    assert rows[0][0] is None and rows[1][0] is None  # Dec 30-31, 2024
+    assert rows[2][0] == 1  # Wed Jan 1: a small share of the busiest day
+    assert rows[2][35] == 4  # Wed Sep 3 is the busiest day
+    assert rows[3][35] == 0
+    assert labels[0] == (0, "Jan") and labels[8] == (35, "Sep")
@@ -0,0 +1,217 @@
+import datetime
+import json
+import os
+
+import pytest
+
+from botanist_pkg import data_protection
+from botanist_pkg.garden import add_session_safely, open_or_create_garden
+
+from conftest import numbered_session
+
+
+def backup_recipes():
+    return sorted(
+        os.path.join(data_protection.BACKUP_DIR, name)
+        for name in os.listdir(data_protection.BACKUP_DIR) if name.endswith(".chunks")
+    )
+
+
+def test_dedup_backup_only_stores_changed_bytes(garden_dir):
+    for i in range(120):
+        add_session_safely(numbered_session(i))
+
+    with open(backup_recipes()[-1]) as f:
+        recipe = json.load(f)
+    assert recipe["size"] > 20000
+    assert recipe["stored_bytes"] < recipe["size"] // 5
+
+
+def test_corrupt_garden_restores_from_chunked_backup(garden_dir):
+    for i in range(3):
+        add_session_safely(numbered_session(i))
+    with open(data_protection.GARDEN_FILE, "w") as f:
+        f.write("{ not json")
+
+    assert len(open_or_create_garden()["sessions"]) == 2
+
+
+def test_legacy_full_copy_backups_are_still_restorable(garden_dir):
+    add_session_safely(numbered_session(0))
+    os.makedirs(data_protection.BACKUP_DIR, exist_ok=True)
+    legacy = os.path.join(data_protection.BACKUP_DIR, "garden_backup_20250101_120000.json")
+    with open(data_protection.GARDEN_FILE) as src, open(legacy, "w") as dst:
+        dst.write(src.read())
+    with open(data_protection.GARDEN_FILE, "w") as f:
+        f.write("")
+
+    assert len(open_or_create_garden()["sessions"]) == 1
+
+
+def keep_backups(recent, hourly=0, daily=0, weekly=0, monthly=0):
+    with open(".botanist_config.json", "w") as f:
+        json.dump({"backup_retention": {"recent": recent, "hourly": hourly, "daily": daily,
+                                        "weekly": weekly, "monthly": monthly}}, f)
+
+
+def test_cleanup_removes_chunks_no_backup_refers_to(garden_dir):
+    keep_backups(recent=2)
+    for i in range(6):
+        add_session_safely(numbered_session(i))
+
+    referenced = set()
+    for path in backup_recipes():
+        with open(path) as f:
+            referenced.update(json.load(f)["chunks"])
+    assert len(backup_recipes()) == 2
+    assert set(os.listdir(data_protection.CHUNK_DIR)) == referenced
+
+
+@pytest.mark.parametrize("engine", ["dedup", "full"])
+@pytest.mark.parametrize("codec", ["gzip", "bz2", "lzma"])
+def test_compressed_backups_restore_transparently(garden_dir, engine, codec):
+    with open(".botanist_config.json", "w") as f:
+        json.dump({"backup_engine": engine, "backup_compression": codec}, f)
+    for i in range(3):
+        add_session_safely(numbered_session(i))
+
+    assert data_protection.verify_backups() == (2, 0)
+    with open(data_protection.GARDEN_FILE, "w") as f:
+        f.write("{ not json")
+    assert len(open_or_create_garden()["sessions"]) == 2
+
+
+def test_retention_keeps_one_backup_per_generation_period():
+    start = datetime.datetime(2025, 9, 1, 8, 0)
+    # Four backups an hour from 08:00 to 19:45 on each of ten days, newest first
+    entries = sorted(((start + datetime.timedelta(days=day, minutes=15 * i), f"b{day}_{i}", f"b{day}_{i}")
+                      for day in range(10) for i in range(48)), reverse=True)
+    kept = data_protection._retention_plan(entries, {"recent": 3, "hourly": 5, "daily": 3,
+                                                     "weekly": 2, "monthly": 1})
+
+    generations = [gen for gens in kept.values() for gen in gens]
+    assert {gen: generations.count(gen) for gen in set(generations)} == \
+        {"recent": 3, "hourly": 5, "daily": 3, "weekly": 2, "monthly": 1}
+    assert kept[entries[0][1]] == ["recent", "hourly", "daily", "weekly", "monthly"]
+    # The last backup of 2025-09-07 (a Sunday) closes ISO week 36
+    assert kept["b6_47"] == ["weekly"]
+    assert len(kept) == 3 + 4 + 2 + 1
+
+
+@pytest.mark.parametrize("engine", ["dedup", "full"])
+def test_unchanged_backups_are_hard_links(garden_dir, capsys, engine):
+    with open(".botanist_config.json", "w") as f:
+        json.dump({"backup_engine": engine, "backup_compression": "gzip"}, f)
+    add_session_safely(numbered_session(0))
+    data_protection.create_backup()
+    data_protection.create_backup()
+
+    backups = sorted(name for name in os.listdir(data_protection.BACKUP_DIR) if "_backup_" in name)
+    first, second = (os.stat(os.path.join(data_protection.BACKUP_DIR, name)) for name in backups)
+    assert (first.st_ino, first.st_nlink) == (second.st_ino, 2)
+
+    data_protection.list_backups()
+    out = capsys.readouterr().out
+    assert "hard link" in out and "[recent, hourly, daily, weekly, monthly]" in out
+
+
+def test_recovery_goes_straight_to_the_newest_good_backup(garden_dir, monkeypatch):
+    for i in range(4):
+        add_session_safely(numbered_session(i))
+    with open(data_protection.GARDEN_FILE, "w") as f:
+        f.write("{ not json")
+
+    read = []
+    original = data_protection.read_backup_bytes
+    monkeypatch.setattr(data_protection, "read_backup_bytes", lambda path: read.append(path) or original(path))
+    monkeypatch.setattr(data_protection, "_backup_entries", lambda prefix=None: pytest.fail("listed backups"))
+    assert len(open_or_create_garden()["sessions"]) == 3
+    assert len(read) == 1
+
+
+def test_verify_flags_tampered_backups_and_recovery_skips_them(garden_dir):
+    with open(".botanist_config.json", "w") as f:
+        json.dump({"backup_engine": "full"}, f)
+    for i in range(3):
+        add_session_safely(numbered_session(i))
+    newest = sorted(name for name in os.listdir(data_protection.BACKUP_DIR) if "_backup_" in name)[-1]
+    with open(os.path.join(data_protection.BACKUP_DIR, newest), "r+") as f:
+        garden = json.load(f)
+        garden["sessions"].pop()
+        f.seek(0)
+        json.dump(garden, f)
+        f.truncate()
+    assert data_protection.verify_backups() == (1, 1)
+
+    with open(data_protection.GARDEN_FILE, "w") as f:
+        f.write("{ not json")
+    assert len(open_or_create_garden()["sessions"]) == 1
+
+
+def test_verify_adds_backups_missing_from_the_manifest(garden_dir):
+    for i in range(3):
+        add_session_safely(numbered_session(i))
+    os.remove(data_protection.MANIFEST_FILE)
+
+    assert data_protection.verify_backups() == (2, 0)
+    entries = data_protection._load_manifest()
+    assert sorted(entry["sessions"] for entry in entries.values()) == [1, 2]
+    assert all(entry["valid"] and entry["source"] == "garden_backup_" for entry in entries.values())
+
+
+def damage_record(index, edit):
+    with open(data_protection.GARDEN_FILE) as f:
+        lines = f.read().split("\n")
+    records = [i for i, line in enumerate(lines) if '"crc":' in line]
+    lines[records[index]] = edit(lines[records[index]])
+    with open(data_protection.GARDEN_FILE, "w") as f:
+        f.write("\n".join(lines))
+
+
+def test_flipped_byte_only_costs_the_damaged_record_a_backup_lookup(garden_dir):
+    for i in range(3):
+        add_session_safely(numbered_session(i))
+    damage_record(0, lambda line: line.replace('"flower"', '"flo\x00er"', 1).replace("{", "[", 1))
+
+    sessions = open_or_create_garden()["sessions"]
+    assert [s["description"] for s in sessions] == [f"Session number {i}" for i in range(3)]
+    assert all("crc" not in s for s in sessions)
+    # The repaired records were written back, so the next read is clean
+    with open(data_protection.GARDEN_FILE) as f:
+        assert len(json.load(f)["sessions"]) == 3
+
+
+def test_record_failing_its_checksum_is_replaced_from_backup(garden_dir):
+    for i in range(3):
+        add_session_safely(numbered_session(i))
+    damage_record(1, lambda line: line.replace("Session number 1", "Session number 9"))
+
+    sessions = open_or_create_garden()["sessions"]
+    assert [s["description"] for s in sessions] == [f"Session number {i}" for i in range(3)]
+
+
+def test_damaged_record_missing_from_every_backup_is_skipped(garden_dir):
+    for i in range(3):
+        add_session_safely(numbered_session(i))
+    damage_record(2, lambda line: line.replace("3600.0", "3601.0"))
+
+    sessions = open_or_create_garden()["sessions"]
+    assert [s["description"] for s in sessions] == ["Session number 0", "Session number 1"]
+
+
+def test_checksum_collisions_never_stand_in_for_another_record(garden_dir, monkeypatch):
+    # Every record gets the same checksum, as if they all collided
+    monkeypatch.setattr(data_protection, "record_checksum", lambda session: 7)
+    for i in range(4):
+        add_session_safely(numbered_session(i))
+    damage_record(1, lambda line: line.replace('"flower"', '"flo\x00er"', 1).replace("{", "[", 1))
+    sessions = open_or_create_garden()["sessions"]
+    assert [s["description"] for s in sessions] == [f"Session number {i}" for i in range(4)]
+
+    # Cut the file after the last record: the backup lacks session 3, which must survive the merge
+    with open(data_protection.GARDEN_FILE) as f:
+        content = f.read()
+    with open(data_protection.GARDEN_FILE, "w") as f:
+        f.write(content[:content.rindex('"crc":7}') + len('"crc":7}') + 1])
+    sessions = open_or_create_garden()["sessions"]
+    assert [s["description"] for s in sessions] == [f"Session number {i}" for i in range(4)]
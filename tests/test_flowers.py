@@ -0,0 +1,31 @@
+import json
+
+from botanist_pkg.flowers import (FLOWERS, UNIVERSE_GARDEN, assign_flower, assign_flower_key,
+                                  get_flower_art, intern_flower)
+from botanist_pkg.garden import migrate_garden, open_or_create_garden
+
+from conftest import make_session
+
+
+def test_assigned_keys_resolve_to_art():
+    for duration in (60, 2000, 3000, 4000, 6000, 8000, 10000, 12000):
+        key = assign_flower_key(duration)
+        assert key in FLOWERS
+        assert get_flower_art(key) == FLOWERS[key]
+    assert assign_flower(12000) == UNIVERSE_GARDEN
+
+
+def test_legacy_art_is_interned_and_still_displayable():
+    assert intern_flower(UNIVERSE_GARDEN) == "universe_garden"
+    assert intern_flower("hand drawn") == "hand drawn"
+    assert get_flower_art("hand drawn") == "hand drawn"
+
+
+def test_migrate_garden_replaces_embedded_art(garden_dir):
+    session = make_session(1, minutes=210, description="Long haul", flower=UNIVERSE_GARDEN)
+    with open(".hiddenGarden.json", "w") as f:
+        json.dump({"current_streak": 0, "sessions": [session]}, f)
+
+    assert migrate_garden() == 1
+    assert open_or_create_garden()["sessions"][0]["flower"] == "universe_garden"
+    assert migrate_garden() == 0
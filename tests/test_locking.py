@@ -0,0 +1,101 @@
+import datetime
+import json
+import multiprocessing
+import os
+
+import pytest
+
+import botanist
+from botanist_pkg import locking
+from botanist_pkg.garden import add_session_safely, open_or_create_garden, get_rollups
+
+from conftest import make_session, use_backend
+
+pytestmark = pytest.mark.skipif(locking.fcntl is None, reason="fcntl locking is POSIX only")
+
+WRITERS = 8
+SESSIONS_PER_WRITER = 5
+
+
+def write_sessions(directory, writer, start):
+    os.chdir(directory)
+    start.wait()
+    for index in range(SESSIONS_PER_WRITER):
+        session = make_session(writer + 1, minute=index, minutes=1,
+                               description=f"writer {writer} session {index}")
+        if not add_session_safely(session):
+            raise SystemExit(1)
+
+
+def hold_lock(directory, locked, release):
+    os.chdir(directory)
+    with locking.garden_lock():
+        locked.set()
+        release.wait(10)
+
+
+@pytest.fixture
+def context():
+    return multiprocessing.get_context("fork")
+
+
+@pytest.mark.parametrize("backend", ["json", "jsonl"])
+def test_concurrent_writers_do_not_lose_sessions(garden_dir, context, backend):
+    use_backend(backend)
+
+    start = context.Event()
+    writers = [context.Process(target=write_sessions, args=(str(garden_dir), writer, start))
+               for writer in range(WRITERS)]
+    for process in writers:
+        process.start()
+    start.set()
+    for process in writers:
+        process.join(60)
+        assert process.exitcode == 0
+
+    descriptions = {s["description"] for s in open_or_create_garden()["sessions"]}
+    assert len(descriptions) == WRITERS * SESSIONS_PER_WRITER
+    assert sum(count for _, count in get_rollups()["days"].values()) == WRITERS * SESSIONS_PER_WRITER
+
+
+def test_lock_wait_is_bounded_and_reentrant(garden_dir, monkeypatch, context):
+    monkeypatch.setattr(locking, "LOCK_TIMEOUT", 0.2)
+    locked, release = context.Event(), context.Event()
+    holder = context.Process(target=hold_lock, args=(str(garden_dir), locked, release))
+    holder.start()
+    try:
+        assert locked.wait(10)
+        with pytest.raises(TimeoutError):
+            with locking.garden_lock(timeout=0.1):
+                pass
+        assert not add_session_safely(make_session(1, minutes=1))
+    finally:
+        release.set()
+        holder.join(10)
+
+    with locking.garden_lock(timeout=1):
+        with locking.garden_lock(timeout=0):
+            assert add_session_safely(make_session(1, minutes=1))
+
+
+def test_finish_keeps_the_active_session_until_it_is_saved(garden_dir, monkeypatch, context):
+    monkeypatch.setattr(locking, "LOCK_TIMEOUT", 0.2)
+    monkeypatch.setattr("sys.argv", ["botanist.py", "finish", "retried"])
+    started = datetime.datetime.now() - datetime.timedelta(hours=1)
+    with open(".hiddenBotanist", "w") as f:
+        json.dump({"session_start": started.strftime("%Y-%m-%d %H:%M:%S.%f"), "pauses": []}, f)
+
+    locked, release = context.Event(), context.Event()
+    holder = context.Process(target=hold_lock, args=(str(garden_dir), locked, release))
+    holder.start()
+    try:
+        assert locked.wait(10)
+        botanist.main(["botanist.py", "finish", "retried"])
+        assert os.path.exists(".hiddenBotanist")
+    finally:
+        release.set()
+        holder.join(10)
+
+    botanist.main(["botanist.py", "finish", "retried"])
+    assert not os.path.exists(".hiddenBotanist")
+    assert [s["description"] for s in open_or_create_garden()["sessions"]] == ["retried"]
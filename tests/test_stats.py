@@ -0,0 +1,41 @@
+import random
+
+from botanist_pkg.schema import to_epoch
+from botanist_pkg.stats import QuantileSketch, collect_stats
+
+
+def exact_quantile(values, q):
+    return sorted(values)[int(q * (len(values) - 1))]
+
+
+def test_sketch_quantiles_are_within_relative_accuracy_and_merge():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(7.5, 0.8) for _ in range(20000)]
+    whole, first, second = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for i, value in enumerate(values):
+        whole.add(value)
+        (first if i % 2 else second).add(value)
+    first.merge(second)
+
+    for q in (0.5, 0.9, 0.99):
+        exact = exact_quantile(values, q)
+        assert abs(whole.quantile(q) - exact) <= 0.01 * exact
+        assert first.quantile(q) == whole.quantile(q)
+    assert len(whole.buckets) < 500
+    assert QuantileSketch().quantile(0.5) is None
+
+
+def test_collect_stats_in_one_pass_over_a_stream():
+    sessions = [
+        {"date": "2025-09-01", "start_time": "2025-09-01 09:15:00", "duration": 1800.0, "description": "a"},
+        {"date": "2025-09-02", "start_time": to_epoch("2025-09-02 09:45:00"), "duration": 5400.0, "description": "b"},
+        {"date": "2025-09-06", "start_time": "2025-09-06 21:00:00", "duration": 600.0, "description": "c"},
+    ]
+    stats = collect_stats(iter(sessions))
+
+    assert stats["count"] == 3
+    assert stats["total_seconds"] == 7800.0
+    assert stats["longest"]["description"] == "b"
+    assert abs(stats["sketch"].quantile(0.5) - 1800.0) <= 18.0
+    assert stats["weekdays"][0] == [1800.0, 1] and stats["weekdays"][5] == [600.0, 1]
+    assert stats["hours"][9] == [7200.0, 2] and stats["hours"][21] == [600.0, 1]
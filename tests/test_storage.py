@@ -0,0 +1,602 @@
+import datetime
+import json
+import os
+import sqlite3
+
+import pytest
+
+from botanist_pkg import (analytics, data_protection, garden, goals, rollups, search_index, sharded_store,
+                          sqlite_store, time_index)
+from botanist_pkg.garden import (add_session_safely, compact_garden, daily_totals, get_schema_version,
+                                 dedupe_garden, export_garden_to_csv, iter_sessions, migrate_garden,
+                                 open_or_create_garden, get_streaks, rebuild_rollups, search_sessions,
+                                 sessions_between)
+from botanist_pkg.goals import calculate_daily_progress, calculate_weekly_progress
+from botanist_pkg.schema import format_time, to_epoch
+
+from conftest import make_session, use_backend
+
+
+def test_jsonl_backend_appends_without_touching_garden_file(garden_dir):
+    use_backend("json")
+    assert add_session_safely(make_session(1))
+    before = os.path.getmtime(data_protection.GARDEN_FILE)
+
+    use_backend("jsonl")
+    assert add_session_safely(make_session(2))
+    assert add_session_safely(make_session(3))
+
+    assert os.path.getmtime(data_protection.GARDEN_FILE) == before
+    with open(data_protection.SESSION_LOG_FILE) as f:
+        assert len(f.read().splitlines()) == 3  # header + 2 records
+    dates = [s["date"] for s in open_or_create_garden()["sessions"]]
+    assert dates == ["2025-09-01", "2025-09-02", "2025-09-03"]
+
+
+def test_full_write_folds_log_into_garden_file(garden_dir):
+    use_backend("jsonl")
+    add_session_safely(make_session(1))
+    use_backend("json")
+    add_session_safely(make_session(2))
+
+    assert not os.path.exists(data_protection.SESSION_LOG_FILE)
+    assert len(open_or_create_garden()["sessions"]) == 2
+
+
+def test_interrupted_fold_does_not_duplicate_sessions(garden_dir):
+    use_backend("jsonl")
+    add_session_safely(make_session(1))
+    add_session_safely(make_session(2))
+    log = open(data_protection.SESSION_LOG_FILE).read()
+
+    # Fold, then put the log back as if the process died before removing it
+    data_protection.safe_write_garden(open_or_create_garden())
+    with open(data_protection.SESSION_LOG_FILE, "w") as f:
+        f.write(log)
+    add_session_safely(make_session(3))
+
+    dates = [s["date"] for s in open_or_create_garden()["sessions"]]
+    assert dates == ["2025-09-01", "2025-09-02", "2025-09-03"]
+
+
+def test_torn_log_line_is_skipped(garden_dir):
+    use_backend("jsonl")
+    add_session_safely(make_session(1))
+    with open(data_protection.SESSION_LOG_FILE, "a") as f:
+        f.write('{"date": "2025-09-0')
+    add_session_safely(make_session(3))
+
+    dates = [s["date"] for s in open_or_create_garden()["sessions"]]
+    assert dates == ["2025-09-01", "2025-09-03"]
+
+
+def test_sqlite_backend_imports_existing_garden_and_round_trips(garden_dir):
+    use_backend("json")
+    first = make_session(1)
+    first["note"] = "extra fields survive"
+    add_session_safely(first)
+    with open(data_protection.GARDEN_FILE) as f:
+        original = json.load(f)
+
+    use_backend("sqlite")
+    add_session_safely(make_session(2))
+    assert [s["date"] for s in open_or_create_garden()["sessions"]] == ["2025-09-01", "2025-09-02"]
+
+    assert sqlite_store.export_to_json() == 2
+    with open(data_protection.GARDEN_FILE) as f:
+        exported = json.load(f)
+    assert exported["sessions"][0] == original["sessions"][0]
+
+
+def test_sqlite_daily_totals_match_json_backend(garden_dir):
+    use_backend("json")
+    for day, minutes in ((1, 30), (1, 45), (3, 20), (9, 50)):
+        add_session_safely(make_session(day, minutes=minutes))
+    expected = daily_totals("2025-09-01", "2025-09-07")
+
+    use_backend("sqlite")
+    assert daily_totals("2025-09-01", "2025-09-07") == expected
+    assert expected == {"2025-09-01": {"seconds": 4500.0, "sessions": 2},
+                        "2025-09-03": {"seconds": 1200.0, "sessions": 1}}
+    progress = calculate_weekly_progress(target_week=datetime.date(2025, 9, 1))
+    assert (progress["minutes"], progress["sessions"]) == (95, 3)
+
+
+def test_iter_sessions_streams_same_sessions_as_full_read(garden_dir, monkeypatch):
+    monkeypatch.setattr(data_protection, "STREAM_READ_SIZE", 7)
+    use_backend("json")
+    for day in range(1, 6):
+        add_session_safely(make_session(day, description=f'Quote " and ] bracket {day}'))
+    use_backend("jsonl")
+    add_session_safely(make_session(6))
+
+    assert list(iter_sessions()) == open_or_create_garden()["sessions"]
+    assert [s["date"] for s in iter_sessions(since="2025-09-03", until=datetime.date(2025, 9, 5))] == \
+        ["2025-09-03", "2025-09-04", "2025-09-05"]
+
+
+def test_iter_sessions_recovers_from_truncated_garden(garden_dir):
+    use_backend("json")
+    for day in range(1, 4):
+        add_session_safely(make_session(day))
+    with open(data_protection.GARDEN_FILE) as f:
+        content = f.read()
+    with open(data_protection.GARDEN_FILE, "w") as f:
+        f.write(content[:len(content) // 2])
+
+    # The newest backup holds the first two sessions
+    assert [s["date"] for s in iter_sessions()] == ["2025-09-01", "2025-09-02"]
+
+
+def test_iter_sessions_resumes_after_recovery_by_session_key(garden_dir, monkeypatch):
+    use_backend("json")
+    for day in range(1, 5):
+        add_session_safely(make_session(day))
+    with open(data_protection.GARDEN_FILE) as f:
+        lines = f.readlines()
+    first = next(i for i, line in enumerate(lines) if line.lstrip().startswith("{\"date\""))
+    with open(data_protection.GARDEN_FILE, "w") as f:
+        f.writelines(lines[:first + 3])
+        f.write("    {\"date\": \"2025-09-0")
+
+    # Recovery falls back to an older backup: fewer records than were
+    # already streamed, one of which the stream had not reached
+    older = {"current_streak": 0, "sessions": [make_session(2), make_session(4)]}
+    monkeypatch.setattr(data_protection, "recover_store_file", lambda path: older)
+    assert [s["date"][-2:] for s in iter_sessions()] == ["01", "02", "03", "04"]
+
+
+@pytest.mark.parametrize("backend", ["json", "jsonl", "sqlite", "sharded"])
+def test_rollups_are_updated_on_append_and_match_a_rebuild(garden_dir, backend):
+    use_backend(backend)
+    for day, minutes in ((1, 30), (1, 45), (8, 20)):
+        add_session_safely(make_session(day, minutes=minutes))
+
+    incremental = rollups.load_rollups()
+    assert incremental["days"]["2025-09-01"] == [4500.0, 2]
+    assert incremental["days"]["2025-09-08"] == [1200.0, 1]
+    assert "weeks" not in incremental
+    assert rebuild_rollups() == incremental
+
+
+@pytest.mark.parametrize("backend", ["json", "jsonl", "sqlite", "sharded"])
+def test_streaks_are_updated_on_append_and_match_a_rebuild(garden_dir, monkeypatch, capsys, backend):
+    use_backend(backend)
+    add_session_safely(make_session(1))
+    with monkeypatch.context() as patch:
+        patch.setattr(rollups, "build_streak", lambda days: pytest.fail("rescanned the active days"))
+        for day in (2, 3, 3, 6, 7):
+            add_session_safely(make_session(day))
+
+    assert get_streaks(datetime.date(2025, 9, 8)) == {"current": 2, "longest": 3, "last_date": "2025-09-07"}
+    # verify reports the same streaks (none current, as the sessions are in the past)
+    data_protection.verify_data_integrity()
+    assert "Streak: 0 day(s) (longest 3)" in capsys.readouterr().out
+    assert get_streaks(datetime.date(2025, 9, 9))["current"] == 0
+
+    # A backdated session joins two runs, which needs the one-pass rebuild
+    add_session_safely(make_session(5))
+    add_session_safely(make_session(4))
+    incremental = rollups.load_rollups()["streak"]
+    assert incremental == {"last_date": "2025-09-07", "current": 7, "longest": 7}
+    assert rebuild_rollups()["streak"] == incremental
+
+
+def test_rollups_rebuild_after_out_of_band_write(garden_dir):
+    use_backend("json")
+    add_session_safely(make_session(1, minutes=30))
+    garden = open_or_create_garden()
+    garden["sessions"].append(make_session(2, minutes=40))
+    data_protection.safe_write_garden(garden)
+
+    assert daily_totals("2025-09-01", "2025-09-07") == {
+        "2025-09-01": {"seconds": 1800.0, "sessions": 1},
+        "2025-09-02": {"seconds": 2400.0, "sessions": 1},
+    }
+
+
+@pytest.mark.parametrize("backend", ["json", "jsonl", "sqlite", "sharded"])
+def test_sessions_between_answers_date_windows_in_time_order(garden_dir, monkeypatch, backend):
+    use_backend(backend)
+    for day, hour in ((9, 10), (2, 14), (2, 9), (5, 10)):
+        add_session_safely(make_session(day, hour=hour))
+    assert [(s["date"], format_time(s["start_time"])[11:13]) for s in sessions_between("2025-09-02", "2025-09-05")] == \
+        [("2025-09-02", "09"), ("2025-09-02", "14"), ("2025-09-05", "10")]
+
+    # Later appends are inserted into the index instead of rebuilding it
+    monkeypatch.setattr(time_index, "build_index", lambda *args: pytest.fail("rebuilt the time index"))
+    add_session_safely(make_session(3))
+    assert [s["date"] for s in sessions_between("2025-09-03")] == ["2025-09-03", "2025-09-05", "2025-09-09"]
+    assert [s["date"] for s in sessions_between(None, datetime.date(2025, 9, 2))] == ["2025-09-02"] * 2
+    assert sessions_between("2025-09-10") == []
+
+
+def test_time_index_rebuilds_after_out_of_band_write(garden_dir):
+    use_backend("json")
+    add_session_safely(make_session(3))
+    assert len(sessions_between("2025-09-01", "2025-09-30")) == 1
+    garden = open_or_create_garden()
+    garden["sessions"].append(make_session(1))
+    data_protection.safe_write_garden(garden)
+
+    assert [s["date"] for s in sessions_between("2025-09-01", "2025-09-30")] == ["2025-09-01", "2025-09-03"]
+
+
+@pytest.mark.parametrize("backend", ["json", "jsonl", "sqlite"])
+def test_reports_are_cached_until_the_store_changes(garden_dir, monkeypatch, capsys, backend):
+    use_backend(backend)
+    add_session_safely(make_session(1, minutes=30))
+    add_session_safely(make_session(2, minutes=40))
+    week = datetime.date(2025, 9, 1)
+
+    def reports():
+        analytics.analyze_weekly_totals()
+        return (capsys.readouterr().out, calculate_weekly_progress(target_week=week),
+                calculate_daily_progress(target_date="2025-09-02"))
+
+    capsys.readouterr()
+    first = reports()
+    with monkeypatch.context() as patch:
+        for module in (analytics, goals):
+            patch.setattr(module, "daily_totals", lambda *args: pytest.fail("recomputed a cached report"))
+        out, weekly, daily = reports()
+    assert (out, weekly, daily) == first
+
+    add_session_safely(make_session(2, minutes=20))
+    out, weekly, daily = reports()
+    assert weekly["minutes"] == 90 and daily == {"date": "2025-09-02", "minutes": 60, "sessions": 2}
+
+
+def test_reports_bucket_all_sessions_by_the_configured_week(garden_dir, capsys):
+    with open(".botanist_config.json", "w") as f:
+        json.dump({"week_start": "sunday", "week_epoch": "2025-09-01"}, f)
+    early = make_session(1, minutes=30)
+    early.update(date="2024-03-05", start_time="2024-03-05 10:00:00", end_time="2024-03-05 10:30:00")
+    for session in (early, make_session(6, minutes=20), make_session(7, minutes=40)):
+        add_session_safely(session)
+    capsys.readouterr()
+
+    analytics.analyze_weekly_totals()
+    out = capsys.readouterr().out
+    # Sessions from before the epoch are still reported, in weeks numbered back from it
+    assert "Week -77 (Sun-Sat):  0.50 h  across 1 session(s)" in out
+    assert "Week 1 (Sun-Sat):  0.33 h  across 1 session(s)" in out
+    assert "Week 2 (Sun-Sat):  0.67 h  across 1 session(s)" in out
+    assert "Total hours across all weeks: 1.50 h" in out
+    assert calculate_weekly_progress(target_week=datetime.date(2025, 9, 10))["week_start"] == "2025-09-07"
+
+    analytics.analyze_period_totals("month")
+    out = capsys.readouterr().out
+    assert "\n2024\n  Mar         0.50 h     1x" in out and "\n2025\n  Sep         1.00 h     2x" in out
+    analytics.analyze_period_totals("year")
+    out = capsys.readouterr().out
+    assert "2024:  0.50 h  across 1 session(s)" in out and "  Q3          1.00 h     2x" in out
+    assert "Total hours: 1.50 h" in out
+
+
+@pytest.mark.parametrize("backend", ["json", "jsonl", "sqlite", "sharded"])
+def test_search_matches_description_words_with_and_or_and_dates(garden_dir, monkeypatch, backend):
+    use_backend(backend)
+    for day, minutes, description in ((1, 30, "Python drill: closures"), (2, 20, "Rust borrow checker"),
+                                      (3, 40, "python drill, decorators"), (9, 10, "Reading")):
+        add_session_safely(make_session(day, minutes=minutes, description=description))
+
+    def dates(*terms, since=None, until=None):
+        return [s["date"][-2:] for s in search_sessions(list(terms), since, until)]
+
+    assert dates("PYTHON", "drill") == ["01", "03"]
+    assert dates("rust", "OR", "python", "decorators") == ["02", "03"]
+    assert dates("python", "OR", "rust", since="2025-09-02", until="2025-09-02") == ["02"]
+    assert dates("drill", "rust") == [] and dates("OR") == []
+    assert sum(s["duration"] for s in search_sessions(["python"])) == 70 * 60
+
+    # Later appends are added to the index instead of rebuilding it
+    with monkeypatch.context() as patch:
+        patch.setattr(search_index, "build_index", lambda *args: pytest.fail("rebuilt the search index"))
+        add_session_safely(make_session(10, description="More rust"))
+        assert dates("rust") == ["02", "10"]
+
+
+def test_search_index_rebuilds_after_out_of_band_write(garden_dir):
+    use_backend("json")
+    add_session_safely(make_session(1, description="Python drill"))
+    assert len(search_sessions(["python"])) == 1
+    garden = open_or_create_garden()
+    garden["sessions"][0]["description"] = "Rust drill"
+    data_protection.safe_write_garden(garden)
+
+    assert search_sessions(["python"]) == []
+    assert [s["description"] for s in search_sessions(["rust"])] == ["Rust drill"]
+
+
+@pytest.mark.parametrize("backend", ["json", "jsonl", "sqlite", "sharded"])
+def test_export_writes_sessions_of_every_backend(garden_dir, backend):
+    use_backend(backend)
+    for day in (1, 2, 9):
+        add_session_safely(make_session(day))
+
+    export_garden_to_csv()
+    with open("exportedGarden.csv") as f:
+        assert len(f.read().splitlines()) == 4  # header + 3 sessions
+    export_garden_to_csv(since="2025-09-02")
+    with open("exportedGarden.csv") as f:
+        assert [line[:10] for line in f.read().splitlines()[1:]] == ["2025-09-02", "2025-09-09"]
+
+
+def count_validations(monkeypatch):
+    calls = []
+    original = data_protection.validate_session
+
+    def counting(session):
+        calls.append(session)
+        return original(session)
+
+    monkeypatch.setattr(data_protection, "validate_session", counting)
+    return calls
+
+
+def test_validation_watermark_skips_already_validated_records(garden_dir, monkeypatch):
+    use_backend("json")
+    for day in range(1, 4):
+        add_session_safely(make_session(day))
+    use_backend("jsonl")
+    add_session_safely(make_session(4))
+
+    calls = count_validations(monkeypatch)
+    assert len(open_or_create_garden()["sessions"]) == 4
+    assert len(list(iter_sessions())) == 4
+    assert calls == []
+
+    # Touching the garden file outside botanist forces a full validation
+    garden = json.load(open(data_protection.GARDEN_FILE))
+    garden["sessions"][0]["duration"] = -5
+    del garden["sessions"][0]["crc"]  # an invalid legacy record, not a damaged one
+    with open(data_protection.GARDEN_FILE, "w") as f:
+        json.dump(garden, f)
+    assert len(open_or_create_garden()["sessions"]) == 3
+    assert len(calls) == 3  # the log record is still below the watermark
+
+
+def test_verify_revalidates_everything(garden_dir, monkeypatch):
+    use_backend("jsonl")
+    for day in range(1, 4):
+        add_session_safely(make_session(day))
+
+    calls = count_validations(monkeypatch)
+    data_protection.verify_data_integrity()
+    assert len(calls) == 3
+    data_protection.verify_data_integrity()
+    assert len(calls) == 6
+
+
+def test_verify_sees_damage_that_keeps_size_and_mtime(garden_dir, capsys):
+    use_backend("json")
+    for day in range(1, 4):
+        add_session_safely(make_session(day))
+    data_protection.verify_data_integrity()
+    assert "Sessions: 3" in capsys.readouterr().out
+
+    # Bit rot in the newest record, which no backup holds yet
+    stat = os.stat(data_protection.GARDEN_FILE)
+    with open(data_protection.GARDEN_FILE, "r+b") as f:
+        content = f.read()
+        f.seek(content.rindex(b"seedling"))
+        f.write(b"Seedling")
+    os.utime(data_protection.GARDEN_FILE, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    data_protection.verify_data_integrity()
+    assert "Sessions: 2" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("backend", ["json", "jsonl", "sqlite", "sharded"])
+def test_migrate_converts_to_schema_v2_and_new_sessions_follow(garden_dir, backend):
+    use_backend(backend)
+    add_session_safely(make_session(1))
+    add_session_safely(make_session(2))
+
+    assert migrate_garden() == 2
+    assert get_schema_version() == 2
+    add_session_safely(make_session(3))
+
+    sessions = open_or_create_garden()["sessions"]
+    assert all(isinstance(s["start_time"], int) for s in sessions)
+    assert format_time(sessions[2]["end_time"]) == "2025-09-03 10:30:00"
+    assert migrate_garden() == 0
+    assert daily_totals("2025-09-01", "2025-09-07")["2025-09-03"] == {"seconds": 1800.0, "sessions": 1}
+
+
+def test_mixed_schema_versions_read_together(garden_dir):
+    use_backend("jsonl")
+    add_session_safely(make_session(1))
+    newer = make_session(2)
+    newer["start_time"] = to_epoch(newer["start_time"])
+    newer["end_time"] = to_epoch(newer["end_time"])
+    add_session_safely(newer)
+
+    assert data_protection.verify_data_integrity()
+    assert [format_time(s["start_time"]) for s in iter_sessions()] == \
+        ["2025-09-01 10:00:00", "2025-09-02 10:00:00"]
+
+
+@pytest.mark.parametrize("backend", ["json", "jsonl", "sqlite", "sharded"])
+def test_dedupe_merges_sessions_recorded_twice(garden_dir, capsys, backend):
+    use_backend(backend)
+    add_session_safely(make_session(1, description="Reading"))
+    add_session_safely(make_session(2))
+    retry = make_session(1, minutes=45, description="Reading notes")
+    retry["start_time"] = to_epoch(retry["start_time"])  # same start, other schema version
+    add_session_safely(retry)
+    add_session_safely(make_session(1, description="Reading"))
+
+    data_protection.verify_data_integrity()
+    out = capsys.readouterr().out
+    assert "Sessions: 4" in out and "2 potential duplicate sessions" in out
+
+    merges = dedupe_garden()
+    assert [len(copies) for _, copies in merges] == [3]
+    sessions = open_or_create_garden()["sessions"]
+    assert [(s["date"], s["duration"], s["description"]) for s in sessions] == [
+        ("2025-09-01", 2700.0, "Reading; Reading notes"),
+        ("2025-09-02", 1800.0, "Work"),
+    ]
+    assert daily_totals()["2025-09-01"]["sessions"] == 1
+    assert dedupe_garden() == []
+
+
+def test_sqlite_rewrites_back_up_the_database_first(garden_dir):
+    use_backend("sqlite")
+    add_session_safely(make_session(1))
+    add_session_safely(make_session(1))
+    assert not os.path.exists(data_protection.BACKUP_DIR) or not os.listdir(data_protection.BACKUP_DIR)
+
+    assert len(dedupe_garden()) == 1
+    backups = [name for name in os.listdir(data_protection.BACKUP_DIR)
+               if name.startswith(data_protection.DATABASE_BACKUP_PREFIX)]
+    assert len(backups) == 1 and backups[0].endswith(".db")
+    conn = sqlite3.connect(os.path.join(data_protection.BACKUP_DIR, backups[0]))
+    assert conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0] == 2  # As before the merge
+    conn.close()
+    # Database copies are not mistaken for garden backups
+    assert data_protection.verify_backups() == (0, 0)
+
+
+def count_fsyncs(monkeypatch):
+    synced = []
+    original = os.fsync
+
+    def counting(fd):
+        synced.append(os.path.isdir(f"/proc/self/fd/{fd}") if os.path.exists("/proc/self/fd") else False)
+        return original(fd)
+
+    monkeypatch.setattr(os, "fsync", counting)
+    return synced
+
+
+@pytest.mark.parametrize("mode, files, dirs", [("none", False, False), ("file", True, False),
+                                               ("file+dir", True, True)])
+def test_durability_mode_controls_fsyncs(garden_dir, monkeypatch, mode, files, dirs):
+    with open(".botanist_config.json", "w") as f:
+        json.dump({"storage_backend": "json", "durability": mode}, f)
+    add_session_safely(make_session(1))
+
+    synced = count_fsyncs(monkeypatch)
+    add_session_safely(make_session(2))
+    data_protection.write_json_atomically(".hiddenBotanist", {"session_start": "x", "pauses": []})
+
+    assert (False in synced) == files
+    if os.path.exists("/proc/self/fd"):
+        assert (True in synced) == dirs
+    assert len(open_or_create_garden()["sessions"]) == 2
+
+
+def test_compaction_folds_log_into_snapshot_that_later_reads_use(garden_dir, monkeypatch):
+    use_backend("jsonl")
+    for day in range(1, 4):
+        add_session_safely(make_session(day))
+    stamped = rollups.load_rollups()
+
+    assert compact_garden() == 3
+    assert not os.path.exists(data_protection.SESSION_LOG_FILE)
+    assert compact_garden() == 0
+    assert rollups.load_rollups()["days"] == stamped["days"]
+    assert rollups.load_rollups()["stamp"] != stamped["stamp"]
+
+    def no_parsing(*args):
+        raise AssertionError("garden file parsed despite a current snapshot")
+
+    monkeypatch.setattr(data_protection, "_read_garden_file", no_parsing)
+    monkeypatch.setattr(data_protection, "_stream_garden_sessions", no_parsing)
+    add_session_safely(make_session(4))
+    assert [s["date"][-2:] for s in open_or_create_garden()["sessions"]] == ["01", "02", "03", "04"]
+    assert [s["date"][-2:] for s in garden.iter_sessions()] == ["01", "02", "03", "04"]
+    assert [s["date"][-2:] for s in garden.iter_sessions(since="2025-09-03")] == ["03", "04"]
+
+
+def test_compaction_runs_automatically_past_the_record_threshold(garden_dir):
+    with open(".botanist_config.json", "w") as f:
+        json.dump({"storage_backend": "jsonl", "compaction_tail_records": 3}, f)
+    add_session_safely(make_session(1))
+    add_session_safely(make_session(2))
+    assert os.path.exists(data_protection.SESSION_LOG_FILE)
+
+    add_session_safely(make_session(3))
+    assert not os.path.exists(data_protection.SESSION_LOG_FILE)
+    assert len(open_or_create_garden()["sessions"]) == 3
+
+
+def test_snapshot_is_saved_on_a_read_miss_not_on_every_write(garden_dir, monkeypatch):
+    use_backend("json")
+    snapshots = []
+    write_snapshot = data_protection._write_snapshot
+    monkeypatch.setattr(data_protection, "_write_snapshot",
+                        lambda data, signature: snapshots.append(signature) or write_snapshot(data, signature))
+
+    for day in range(1, 4):
+        add_session_safely(make_session(day))
+    assert snapshots == []
+
+    assert len(open_or_create_garden()["sessions"]) == 3
+    assert len(open_or_create_garden()["sessions"]) == 3
+    assert len(snapshots) == 1
+
+
+def test_stale_or_corrupt_snapshot_is_ignored(garden_dir):
+    use_backend("json")
+    add_session_safely(make_session(1))
+    add_session_safely(make_session(2))
+
+    garden = json.load(open(data_protection.GARDEN_FILE))
+    garden["sessions"].pop()
+    with open(data_protection.GARDEN_FILE, "w") as f:
+        json.dump(garden, f)
+    assert len(open_or_create_garden()["sessions"]) == 1
+
+    with open(data_protection.SNAPSHOT_FILE, "r+b") as f:
+        f.seek(-2, os.SEEK_END)
+        f.write(b"\x00\x00")
+    assert len(open_or_create_garden()["sessions"]) == 1
+
+
+def make_month_session(month, day=1):
+    session = make_session(day)
+    for field in ("date", "start_time", "end_time"):
+        session[field] = session[field].replace("2025-09", f"2025-{month:02d}")
+    return session
+
+
+def test_sharded_backend_touches_only_the_changed_month(garden_dir, monkeypatch):
+    use_backend("json")
+    add_session_safely(make_month_session(8))
+    use_backend("sharded")
+    add_session_safely(make_month_session(9))
+    add_session_safely(make_month_session(10))
+    assert sharded_store.list_months() == ["2025-08", "2025-09", "2025-10"]
+
+    august = sharded_store.segment_path("2025-08")
+    before = os.stat(august).st_mtime_ns
+    add_session_safely(make_month_session(10, day=2))
+    assert os.stat(august).st_mtime_ns == before
+    backups = os.listdir(data_protection.BACKUP_DIR)
+    assert sum(name.startswith(data_protection.backup_prefix(sharded_store.segment_path("2025-10")))
+               for name in backups) == 1
+    assert not any(name.startswith("segment_2025-08") for name in backups)
+
+    opened = []
+    original = sharded_store.read_segment
+    monkeypatch.setattr(sharded_store, "read_segment", lambda month: opened.append(month) or original(month))
+    assert [s["date"] for s in iter_sessions(since="2025-10-01")] == ["2025-10-01", "2025-10-02"]
+    assert opened == ["2025-10"]
+
+    assert [s["date"] for s in open_or_create_garden()["sessions"]] == \
+        ["2025-08-01", "2025-09-01", "2025-10-01", "2025-10-02"]
+    assert sharded_store.export_to_json() == 4
+
+
+def test_damaged_segment_is_restored_from_its_own_backup(garden_dir):
+    use_backend("sharded")
+    add_session_safely(make_month_session(9))
+    add_session_safely(make_month_session(9, day=2))
+    with open(sharded_store.segment_path("2025-09"), "w") as f:
+        f.write('{"month": "2025-09", "sess')
+
+    assert [s["date"] for s in iter_sessions()] == ["2025-09-01"]